@@ -0,0 +1,46 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+from authentication.models import User
+from projects.models import Project
+from tasks.models import Task
+
+
+class ProjectApiForm(forms.ModelForm):
+    """The `members` are the list of user ids, only the given ids are loaded by the validation."""
+
+    class Meta:
+        model = Project
+        fields = (
+            'title',
+            'members',
+        )
+
+
+class TaskApiForm(forms.ModelForm):
+    """The deadline is accepted in ISO 8601 format, the time zone of the client is taken from the value itself."""
+
+    def __init__(self, *args, members: dict[int, str], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.members = members
+        # The omitted status of the new task is the default of the model, but the blank status is invalid.
+        if 'status' in self.fields and 'status' not in self.data:
+            self.fields['status'].required = False
+
+    def clean_executor(self) -> User | None:
+        executor = self.cleaned_data['executor']
+        # Only the owner and the members of the project can be the executor, the same as by the `TaskCreateForm`.
+        if executor is not None and executor.pk not in self.members:
+            raise ValidationError(f'The user {executor.pk} is not a member of the project.', code='invalid_choice')
+        return executor
+
+    class Meta:
+        model = Task
+        fields = (
+            'title',
+            'description',
+            'priority',
+            'status',
+            'executor',
+            'deadline',
+        )
@@ -0,0 +1,142 @@
+from typing import Any
+
+from django.db.models import Model
+from django.db.models import Prefetch
+from django.db.models import QuerySet
+
+from authentication.models import User
+from projects.models import Project
+from sections.models import Section
+from tasks.counters import COUNTER_FIELDS
+from tasks.models import Task
+from tasks.models import TaskEvent
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400, details: Any = None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.details = details
+
+
+class Relation:
+    """The related object(s) which can be requested by the `include` parameter."""
+
+    def __init__(self, model: type[Model], fields: tuple[str, ...], many: bool = False):
+        self.model = model
+        self.fields = fields
+        self.many = many
+
+
+class Resource:
+    """
+    Describes the fields of the model exposed by the API. The requested sparse fieldset and the included relations
+    are translated into `only()`, `select_related()` and `prefetch_related()`, so every request costs a fixed number
+    of queries and loads only the requested columns.
+    """
+    model: type[Model]
+    fields: tuple[str, ...]
+    default_fields: tuple[str, ...]
+    relations: dict[str, Relation] = dict()
+
+    def parse_fields(self, value: str | None) -> tuple[str, ...]:
+        if not value:
+            return self.default_fields
+        fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+        unknown = [field for field in fields if field not in self.fields]
+        if unknown:
+            raise ApiError(f'Unknown fields: {", ".join(unknown)}. Allowed fields: {", ".join(self.fields)}.')
+        return fields
+
+    def parse_include(self, value: str | None) -> tuple[str, ...]:
+        if not value:
+            return ()
+        includes = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in includes if name not in self.relations]
+        if unknown:
+            raise ApiError(f'Unknown relations: {", ".join(unknown)}. Allowed relations: {", ".join(self.relations)}.')
+        return includes
+
+    def get_queryset(self, queryset: QuerySet, fields: tuple[str, ...], includes: tuple[str, ...], extra_fields: tuple[str, ...] = ()) -> QuerySet:  # noqa E501
+        only = {'id', *fields, *extra_fields}
+        for name in includes:
+            relation = self.relations[name]
+            if relation.many:
+                related = relation.model.objects.only(*relation.fields)
+                queryset = queryset.prefetch_related(Prefetch(name, queryset=related))
+            else:
+                only.add(name)
+                only.update(f'{name}__{field}' for field in relation.fields)
+                queryset = queryset.select_related(name)
+        return queryset.only(*only)
+
+    def serialize_related(self, obj: Model | None, relation: Relation) -> dict[str, Any] | None:
+        if obj is None:
+            return None
+        return {field: getattr(obj, field) for field in relation.fields}
+
+    def serialize(self, obj: Model, fields: tuple[str, ...], includes: tuple[str, ...]) -> dict[str, Any]:
+        data = dict()
+        for field in fields:
+            model_field = obj._meta.get_field(field)
+            if field in includes:
+                continue
+            if model_field.many_to_many:
+                data[field] = [related.pk for related in getattr(obj, field).all()]
+            else:
+                data[field] = getattr(obj, getattr(model_field, 'attname', field))
+        for name in includes:
+            relation = self.relations[name]
+            if relation.many:
+                data[name] = [self.serialize_related(related, relation) for related in getattr(obj, name).all()]
+            else:
+                data[name] = self.serialize_related(getattr(obj, name), relation)
+        return data
+
+
+USER_RELATION_FIELDS = ('id', 'username')
+
+
+class ProjectResource(Resource):
+    model = Project
+    fields = ('id', 'title', 'owner', 'members', *COUNTER_FIELDS)
+    default_fields = ('id', 'title', 'owner')
+    relations = {
+        'owner': Relation(model=User, fields=USER_RELATION_FIELDS),
+        'members': Relation(model=User, fields=USER_RELATION_FIELDS, many=True),
+    }
+
+    def get_queryset(self, queryset, fields, includes, extra_fields=()):
+        if 'members' in fields and 'members' not in includes:
+            queryset = queryset.prefetch_related(Prefetch('members', queryset=User.objects.only('id')))
+        return super().get_queryset(queryset, tuple(f for f in fields if f != 'members'), includes, extra_fields)
+
+
+class SectionResource(Resource):
+    model = Section
+    fields = ('id', 'name', 'project', *COUNTER_FIELDS)
+    default_fields = ('id', 'name', 'project')
+    relations = {
+        'project': Relation(model=Project, fields=('id', 'title')),
+    }
+
+
+class TaskResource(Resource):
+    model = Task
+    fields = ('id', 'title', 'description', 'priority', 'status', 'executor', 'creator', 'deadline', 'section')
+    default_fields = ('id', 'title', 'priority', 'status', 'executor', 'deadline')
+    relations = {
+        'executor': Relation(model=User, fields=USER_RELATION_FIELDS),
+        'creator': Relation(model=User, fields=USER_RELATION_FIELDS),
+        'section': Relation(model=Section, fields=('id', 'name')),
+    }
+
+
+class TaskEventResource(Resource):
+    model = TaskEvent
+    fields = ('id', 'task', 'section', 'project', 'actor', 'action', 'changes', 'created_at')
+    default_fields = ('id', 'task', 'actor', 'action', 'changes', 'created_at')
+    relations = {
+        'actor': Relation(model=User, fields=USER_RELATION_FIELDS),
+    }
@@ -0,0 +1,28 @@
+from django.urls import path
+
+from api.views import ProjectActivityApiView
+from api.views import ProjectDetailApiView
+from api.views import ProjectListApiView
+from api.views import SectionActivityApiView
+from api.views import SectionDetailApiView
+from api.views import SectionListApiView
+from api.views import TaskActivityApiView
+from api.views import TaskBulkApiView
+from api.views import TaskDetailApiView
+from api.views import TaskListApiView
+from api.views import TaskSearchApiView
+
+
+urlpatterns = [
+    path(route='projects/', view=ProjectListApiView.as_view(), name='api_project_list'),
+    path(route='projects/<int:project_pk>/', view=ProjectDetailApiView.as_view(), name='api_project_detail'),
+    path(route='projects/<int:project_pk>/activity/', view=ProjectActivityApiView.as_view(), name='api_project_activity'),
+    path(route='projects/<int:project_pk>/sections/', view=SectionListApiView.as_view(), name='api_section_list'),
+    path(route='projects/<int:project_pk>/sections/<int:section_pk>/', view=SectionDetailApiView.as_view(), name='api_section_detail'),  # noqa E501
+    path(route='projects/<int:project_pk>/sections/<int:section_pk>/activity/', view=SectionActivityApiView.as_view(), name='api_section_activity'),  # noqa E501
+    path(route='projects/<int:project_pk>/sections/<int:section_pk>/tasks/', view=TaskListApiView.as_view(), name='api_task_list'),  # noqa E501
+    path(route='tasks/bulk/', view=TaskBulkApiView.as_view(), name='api_task_bulk'),
+    path(route='tasks/search/', view=TaskSearchApiView.as_view(), name='api_task_search'),
+    path(route='projects/<int:project_pk>/sections/<int:section_pk>/tasks/<int:task_pk>/', view=TaskDetailApiView.as_view(), name='api_task_detail'),  # noqa E501
+    path(route='projects/<int:project_pk>/sections/<int:section_pk>/tasks/<int:task_pk>/activity/', view=TaskActivityApiView.as_view(), name='api_task_activity'),  # noqa E501
+]
@@ -0,0 +1,450 @@
+import json
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Model
+from django.db.models import QuerySet
+from django.forms import BaseModelForm
+from django.forms import modelform_factory
+from django.http import Http404
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django.views import View
+
+from api.forms import ProjectApiForm
+from api.forms import TaskApiForm
+from api.resources import ApiError
+from api.resources import ProjectResource
+from api.resources import Resource
+from api.resources import SectionResource
+from api.resources import TaskEventResource
+from api.resources import TaskResource
+from app_config.pagination import InvalidCursor
+from app_config.pagination import KeysetPaginator
+from app_config.pagination import build_cursor_query
+from authentication.models import User
+from projects.access import check_project_access
+from projects.access import forget_project_access
+from projects.access import get_accessible_project_ids
+from projects.access import get_project_members
+from projects.models import Project
+from projects.models import ProjectAccess
+from projects.views import ProjectViewMixin
+from sections.access import get_scoped_section
+from sections.forms import SectionCreateForm
+from sections.models import Section
+from sections.views import SectionViewMixin
+from tasks.bulk import bulk_update_tasks
+from tasks.bulk import is_id
+from tasks.deletion import soft_delete_project
+from tasks.deletion import soft_delete_section
+from tasks.forms import TaskFilterForm
+from tasks.models import Task
+from tasks.models import TaskEvent
+from tasks.models import TaskStatus
+from tasks.search import search_tasks
+from tasks.views import TaskViewMixin
+
+
+class ApiViewMixin(ABC, View):
+    """
+    The base of the JSON API views. The user is authenticated by the session (the unsafe methods require the CSRF token),
+    the errors are returned as `{"error": ..., "details": ...}` with the corresponding status code.
+    """
+    resource: Resource
+    form_class: type[BaseModelForm]
+    http_method_names = ['get', 'post', 'patch', 'delete', 'options']
+    # Only the safe methods are routed to the replicas by the `ReplicaMiddleware`.
+    read_from_replica = True
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if not request.user.is_authenticated:
+            return self.error_response(ApiError('Authentication credentials were not provided.', status=401))
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404 as error:
+            return self.error_response(ApiError(str(error) or 'Not found.', status=404))
+        except ApiError as error:
+            return self.error_response(error)
+
+    def error_response(self, error: ApiError) -> JsonResponse:
+        return JsonResponse({'error': error.message, 'details': error.details}, status=error.status)
+
+    def get_fields(self) -> tuple[str, ...]:
+        return self.resource.parse_fields(self.request.GET.get('fields'))
+
+    def get_includes(self) -> tuple[str, ...]:
+        return self.resource.parse_include(self.request.GET.get('include'))
+
+    @abstractmethod
+    def get_queryset(self) -> QuerySet:
+        """Returns the objects visible for the user, the same rules as in the view mixins."""
+
+    def get_serialized_queryset(self, extra_fields: tuple[str, ...] = ()) -> tuple[QuerySet, tuple, tuple]:
+        fields, includes = self.get_fields(), self.get_includes()
+        queryset = self.resource.get_queryset(self.get_queryset(), fields, includes, extra_fields=extra_fields)
+        return queryset, fields, includes
+
+    def get_payload(self) -> dict[str, Any]:
+        try:
+            payload = json.loads(self.request.body or b'{}')
+        except (ValueError, UnicodeDecodeError) as error:
+            raise ApiError('The request body must be a JSON object.') from error
+        if not isinstance(payload, dict):
+            raise ApiError('The request body must be a JSON object.')
+        return payload
+
+    def get_form(self, payload: dict[str, Any], instance: Model | None = None) -> BaseModelForm:
+        """Builds the form of the fields from the payload only, so the partial update validates only changed fields."""
+        allowed = self.form_class._meta.fields
+        unknown = [field for field in payload if field not in allowed]
+        if unknown:
+            raise ApiError(f'Unknown writable fields: {", ".join(unknown)}. Allowed fields: {", ".join(allowed)}.')
+        fields = allowed if instance is None else tuple(field for field in allowed if field in payload)
+        form_class = modelform_factory(self.resource.model, form=self.form_class, fields=fields)
+        return form_class(data=payload, instance=instance, **self.get_form_kwargs())
+
+    def get_form_kwargs(self) -> dict[str, Any]:
+        return dict()
+
+    def save_form(self, form: BaseModelForm) -> Model:
+        if not form.is_valid():
+            raise ApiError('The data is invalid.', details=form.errors.get_json_data())
+        return form.save()
+
+    def render_object(self, obj: Model, status: int = 200) -> JsonResponse:
+        queryset, fields, includes = self.get_serialized_queryset()
+        obj = queryset.get(pk=obj.pk)
+        return JsonResponse(self.resource.serialize(obj, fields, includes), status=status)
+
+
+class ApiListMixin(ApiViewMixin):
+    paginate_by = 50
+    max_paginate_by = 200
+
+    def get_ordering(self) -> str:
+        return 'pk'
+
+    def get_paginate_by(self) -> int:
+        try:
+            limit = int(self.request.GET.get('limit', self.paginate_by))
+        except ValueError as error:
+            raise ApiError('The limit must be an integer.') from error
+        return max(1, min(limit, self.max_paginate_by))
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        ordering = self.get_ordering()
+        queryset, fields, includes = self.get_serialized_queryset(extra_fields=(ordering.removeprefix('-'),))
+        paginator = KeysetPaginator(queryset=queryset, ordering=ordering, per_page=self.get_paginate_by())
+        try:
+            page = paginator.get_page(request.GET.get('cursor') or None)
+        except InvalidCursor as error:
+            raise ApiError(str(error)) from error
+        next_url = None
+        if page.has_next():
+            next_url = f'{request.path}?{build_cursor_query(request.GET, "cursor", page.next_cursor)}'
+        return JsonResponse({
+            'results': [self.resource.serialize(obj, fields, includes) for obj in page],
+            'next_cursor': page.next_cursor,
+            'next': next_url,
+        })
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        form = self.get_form(self.get_payload())
+        self.prepare_new_object(form.instance)
+        return self.render_object(self.save_form(form), status=201)
+
+    def prepare_new_object(self, obj: Model):
+        pass
+
+
+class ApiDetailMixin(ApiViewMixin):
+    pk_url_kwarg: str
+
+    def get_object(self) -> Model:
+        obj = self.get_queryset().filter(pk=self.kwargs[self.pk_url_kwarg]).first()
+        if obj is None:
+            raise Http404(f'No {self.resource.model._meta.object_name} matches the given query.')
+        return obj
+
+    def check_write_access(self):
+        pass
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        queryset, fields, includes = self.get_serialized_queryset()
+        obj = queryset.filter(pk=self.kwargs[self.pk_url_kwarg]).first()
+        if obj is None:
+            raise Http404(f'No {self.resource.model._meta.object_name} matches the given query.')
+        return JsonResponse(self.resource.serialize(obj, fields, includes))
+
+    def patch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        self.check_write_access()
+        obj = self.get_object()
+        form = self.get_form(self.get_payload(), instance=obj)
+        return self.render_object(self.save_form(form))
+
+    def delete(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        self.check_write_access()
+        self.delete_object(self.get_object())
+        return HttpResponse(status=204)
+
+    def delete_object(self, obj: Model):
+        obj.delete()
+
+
+def require_project_owner(user: Any, project_pk: int):
+    """The write operations on the project, its sections and tasks are allowed for the owner of project only."""
+    if not check_project_access(user=user, project_pk=project_pk, owner_only=True):
+        raise Http404(f'No {Project._meta.object_name} matches the given query.')
+
+
+class ProjectApiMixin:
+    resource = ProjectResource()
+    form_class = ProjectApiForm
+    pk_url_kwarg = ProjectViewMixin.pk_url_kwarg
+
+    def save_form(self, form: BaseModelForm) -> Project:
+        project = super().save_form(form)  # pyright: ignore[reportAttributeAccessIssue]
+        # The access of the owner and the members is changed by the signals, the access memorized by the request is stale.
+        forget_project_access(self.request.user)  # pyright: ignore[reportAttributeAccessIssue]
+        return project
+
+    def delete_object(self, obj: Project):
+        # The same soft delete as the `ProjectDeleteView`, the rows are removed by the `purge_deleted` worker.
+        soft_delete_project(obj)
+
+    def get_queryset(self) -> QuerySet[Project]:
+        user = self.request.user  # pyright: ignore[reportAttributeAccessIssue]
+        queryset = Project.objects.all()
+        if user.is_superuser:
+            return queryset
+        else:
+            return queryset.filter(pk__in=get_accessible_project_ids(user))
+
+
+class ProjectListApiView(ProjectApiMixin, ApiListMixin):
+    """GET: the projects where user is owner or member (all for superuser). POST: create the project owned by user."""
+
+    def prepare_new_object(self, obj: Project):
+        obj.owner = self.request.user  # pyright: ignore[reportAttributeAccessIssue]
+
+
+class ProjectDetailApiView(ProjectApiMixin, ApiDetailMixin):
+    """GET: for owner or member of project. PATCH and DELETE: for owner of project only."""
+
+    def check_write_access(self):
+        require_project_owner(user=self.request.user, project_pk=self.kwargs[self.pk_url_kwarg])
+
+
+class SectionApiMixin:
+    resource = SectionResource()
+    form_class = SectionCreateForm
+    pk_url_kwarg = SectionViewMixin.pk_url_kwarg
+
+    def get_queryset(self) -> QuerySet[Section]:
+        project_pk = self.kwargs[ProjectViewMixin.pk_url_kwarg]  # pyright: ignore[reportAttributeAccessIssue]
+        if not check_project_access(user=self.request.user, project_pk=project_pk):  # pyright: ignore[reportAttributeAccessIssue]
+            raise Http404(f'No {Project._meta.object_name} matches the given query.')
+        return Section.objects.filter(project__pk=project_pk)
+
+    def check_write_access(self):
+        project_pk = self.kwargs[ProjectViewMixin.pk_url_kwarg]  # pyright: ignore[reportAttributeAccessIssue]
+        require_project_owner(user=self.request.user, project_pk=project_pk)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def delete_object(self, obj: Section):
+        soft_delete_section(obj)
+
+
+class SectionListApiView(SectionApiMixin, ApiListMixin):
+    """GET: for owner or member of project. POST: for owner of project only."""
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        self.check_write_access()
+        return super().post(request, *args, **kwargs)
+
+    def prepare_new_object(self, obj: Section):
+        obj.project_id = self.kwargs[ProjectViewMixin.pk_url_kwarg]
+
+
+class SectionDetailApiView(SectionApiMixin, ApiDetailMixin):
+    """GET: for owner or member of project. PATCH and DELETE: for owner of project only."""
+
+
+class TaskApiMixin:
+    resource = TaskResource()
+    form_class = TaskApiForm
+    pk_url_kwarg = TaskViewMixin.pk_url_kwarg
+
+    def get_section(self) -> Section:
+        if not hasattr(self, 'section'):
+            self.section = get_scoped_section(
+                user=self.request.user,  # pyright: ignore[reportAttributeAccessIssue]
+                project_pk=self.kwargs[ProjectViewMixin.pk_url_kwarg],  # pyright: ignore[reportAttributeAccessIssue]
+                section_pk=self.kwargs[SectionViewMixin.pk_url_kwarg],  # pyright: ignore[reportAttributeAccessIssue]
+            )
+        return self.section
+
+    def get_queryset(self) -> QuerySet[Task]:
+        return Task.objects.filter(section=self.get_section())
+
+    def get_form_kwargs(self) -> dict[str, Any]:
+        return {'members': get_project_members(self.get_section().project_id)}
+
+    def check_write_access(self):
+        project_pk = self.kwargs[ProjectViewMixin.pk_url_kwarg]  # pyright: ignore[reportAttributeAccessIssue]
+        require_project_owner(user=self.request.user, project_pk=project_pk)  # pyright: ignore[reportAttributeAccessIssue]
+
+
+class TaskListApiView(TaskApiMixin, ApiListMixin):
+    """GET: for owner or member of project, filtered and ordered by the `TaskFilterForm`. POST: for owner or member."""
+    default_ordering = 'priority'
+
+    def get_filter_form(self) -> TaskFilterForm:
+        if not hasattr(self, 'filter_form'):
+            accesses = ProjectAccess.objects.filter(project=self.get_section().project_id)
+            executors = User.objects.filter(pk__in=accesses.values('user_id'))
+            self.filter_form = TaskFilterForm(data=self.request.GET or None, executors=executors)  # pyright: ignore[reportAttributeAccessIssue]  # noqa E501
+            if self.request.GET and not self.filter_form.is_valid():  # pyright: ignore[reportAttributeAccessIssue]
+                raise ApiError('The filters are invalid.', details=self.filter_form.errors.get_json_data())
+        return self.filter_form
+
+    def get_queryset(self) -> QuerySet[Task]:
+        return super().get_queryset().filter(**self.get_filter_form().get_filters())
+
+    def get_ordering(self) -> str:
+        return self.get_filter_form().get_ordering(default=self.default_ordering)
+
+    def prepare_new_object(self, obj: Task):
+        obj.creator = self.request.user  # pyright: ignore[reportAttributeAccessIssue]
+        obj.section = self.get_section()
+
+
+class TaskDetailApiView(TaskApiMixin, ApiDetailMixin):
+    """GET: for owner or member of project. PATCH and DELETE: for owner of project only."""
+
+
+class TaskBulkApiView(ApiViewMixin):
+    """
+    POST: changes the `status`, `priority`, `executor` or `section` of many tasks with set-based updates.
+    The body is `{"ids": [...], "set": {...}}` or `{"section": id, "status": ..., "set": {...}}` to select
+    all tasks of the section (optionally with the status). Only the tasks of projects owned by user are changed.
+    """
+    http_method_names = ['post', 'options']
+
+    def get_queryset(self) -> QuerySet[Task]:
+        # The tasks without the write access of user are skipped by the `bulk_update_tasks`.
+        return Task.objects.all()
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        payload = self.get_payload()
+        changes = payload.get('set')
+        if not isinstance(changes, dict):
+            raise ApiError('The "set" must be an object with the changed fields.')
+
+        tasks = self.get_queryset()
+        if 'ids' in payload:
+            ids = payload['ids']
+            if not isinstance(ids, list) or not all(is_id(pk) for pk in ids):
+                raise ApiError('The "ids" must be a list of integers.')
+            tasks = tasks.filter(pk__in=ids)
+        elif 'section' in payload:
+            if not is_id(payload['section']):
+                raise ApiError('The "section" must be an integer.')
+            tasks = tasks.filter(section=payload['section'])
+            if 'status' in payload:
+                if payload['status'] not in TaskStatus.values:
+                    raise ApiError(f'The "status" must be one of: {", ".join(TaskStatus.values)}.')
+                tasks = tasks.filter(status=payload['status'])
+        else:
+            raise ApiError('The tasks must be selected by "ids" or "section".')
+
+        try:
+            amount = bulk_update_tasks(user=request.user, tasks=tasks, changes=changes)
+        except ValidationError as error:
+            raise ApiError('The changes are invalid.', details=error.messages) from error
+        return JsonResponse({'updated': amount})
+
+
+class TaskSearchApiView(ApiListMixin):
+    """
+    GET: `?q=...` full-text search over the tasks of projects where user is an owner or member (all for superuser).
+    The results are ranked by the search index of the database and paginated by the cursor.
+    """
+    resource = TaskResource()
+    http_method_names = ['get', 'options']
+
+    def get_queryset(self) -> QuerySet[Task]:
+        # The access is checked by the search backend.
+        return Task.objects.all()
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        text = request.GET.get('q', '')
+        if not text.strip():
+            raise ApiError('The "q" parameter is required.')
+        queryset, fields, includes = self.get_serialized_queryset()
+        try:
+            page = search_tasks(
+                user=request.user,
+                text=text,
+                queryset=queryset,
+                cursor=request.GET.get('cursor') or None,
+                per_page=self.get_paginate_by(),
+            )
+        except InvalidCursor as error:
+            raise ApiError(str(error)) from error
+        next_url = None
+        if page.has_next():
+            next_url = f'{request.path}?{build_cursor_query(request.GET, "cursor", page.next_cursor)}'
+        return JsonResponse({
+            'results': [self.resource.serialize(obj, fields, includes) for obj in page],
+            'next_cursor': page.next_cursor,
+            'next': next_url,
+        })
+
+
+class ActivityApiMixin(ApiListMixin):
+    """GET: the activity log of the tasks for owner or member of project, newest events first."""
+    resource = TaskEventResource()
+    http_method_names = ['get', 'options']
+
+    def get_ordering(self) -> str:
+        return '-pk'
+
+    def get_project_pk(self) -> int:
+        project_pk = self.kwargs[ProjectViewMixin.pk_url_kwarg]
+        if not check_project_access(user=self.request.user, project_pk=project_pk):
+            raise Http404(f'No {Project._meta.object_name} matches the given query.')
+        return project_pk
+
+
+class ProjectActivityApiView(ActivityApiMixin):
+    def get_queryset(self) -> QuerySet[TaskEvent]:
+        return TaskEvent.objects.filter(project=self.get_project_pk())
+
+
+class SectionActivityApiView(ActivityApiMixin):
+    def get_queryset(self) -> QuerySet[TaskEvent]:
+        section_pk = self.kwargs[SectionViewMixin.pk_url_kwarg]
+        project_pk = self.get_project_pk()
+        # The events of the deleted section are kept by the purge, but the section is hidden the same as its tasks.
+        if not Section.objects.filter(pk=section_pk, project=project_pk).exists():
+            raise Http404(f'No {Section._meta.object_name} matches the given query.')
+        return TaskEvent.objects.filter(project=project_pk, section=section_pk)
+
+
+class TaskActivityApiView(ActivityApiMixin):
+    def get_queryset(self) -> QuerySet[TaskEvent]:
+        # The task is checked in its current section, the timeline includes the events before it was moved.
+        task_pk = self.kwargs[TaskViewMixin.pk_url_kwarg]
+        tasks = Task.objects.filter(
+            pk=task_pk,
+            section=self.kwargs[SectionViewMixin.pk_url_kwarg],
+            section__project=self.get_project_pk(),
+            section__deleted_at__isnull=True,
+        )
+        if not tasks.exists():
+            raise Http404(f'No {Task._meta.object_name} matches the given query.')
+        return TaskEvent.objects.filter(task=task_pk)
@@ -4,3 +4,7 @@ from django.apps import AppConfig as Config
 class AppConfig(Config):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        # The system checks of the shared infrastructure of `app_config`, which is not an installed app.
+        from app_config import caches  # noqa F401
@@ -0,0 +1,250 @@
+import datetime as dt
+import gzip
+import json
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import IO
+from typing import Any
+from typing import NamedTuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Model
+from django.db.models import Q
+from django.db.models import QuerySet
+
+from authentication.models import User
+from projects.access import invalidate_project_access
+from projects.access import invalidate_project_members
+from projects.models import Project
+from projects.models import ProjectAccess
+from projects.models import ProjectRole
+from sections.models import Section
+from tasks.counters import rebuild_counters
+from tasks.models import Task
+
+
+# The first line of the archive, the archive of the other format or version is not restored.
+ARCHIVE_FORMAT = 'projects'
+ARCHIVE_VERSION = 1
+# The rows read by one query of the `iterator()` and written by one `bulk_create`.
+CHUNK_SIZE = 2000
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """Keeps the microseconds of the datetimes, which are truncated to milliseconds by the `DjangoJSONEncoder`."""
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, dt.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ArchiveModel(NamedTuple):
+    """The archived fields of the model and the archived models referenced by its foreign keys."""
+    name: str
+    model: type[Model]
+    fields: tuple[str, ...]
+    relations: dict[str, str]
+
+
+# The models in the order of the archive, every model references only the models before it.
+# The users are matched by the username on restore, their passwords and permissions are never archived.
+# The denormalized task counters are not archived, they are recounted after the restore.
+ARCHIVE_MODELS = (
+    ArchiveModel('user', User, ('username', 'email', 'first_name', 'last_name'), {}),
+    ArchiveModel('project', Project, ('title', 'owner'), {'owner': 'user'}),
+    ArchiveModel('member', Project.members.through, ('project', 'user'), {'project': 'project', 'user': 'user'}),
+    ArchiveModel('section', Section, ('name', 'project'), {'project': 'project'}),
+    ArchiveModel(
+        'task',
+        Task,
+        ('title', 'description', 'priority', 'status', 'executor', 'creator', 'deadline', 'section'),
+        {'executor': 'user', 'creator': 'user', 'section': 'section'},
+    ),
+)
+ARCHIVE_MODEL_ORDER = {archive_model.name: index for index, archive_model in enumerate(ARCHIVE_MODELS)}
+
+
+def get_archive_querysets(projects: QuerySet[Project]) -> dict[str, QuerySet]:
+    """The rows of every archived model of the projects, the relations are the subqueries of the projects."""
+    project_ids = projects.values('pk')
+    # The tasks of the deleted sections (not purged yet) are not archived, as their sections.
+    sections = Section.objects.filter(project__in=project_ids)
+    tasks = Task.objects.filter(section__in=sections.values('pk'))
+    members = Project.members.through.objects.filter(project__in=project_ids)
+    users = User.objects.filter(
+        Q(pk__in=projects.values('owner'))
+        | Q(pk__in=members.values('user'))
+        | Q(pk__in=tasks.values('executor'))
+        | Q(pk__in=tasks.values('creator'))
+    )
+    return {
+        'user': users,
+        'project': Project.objects.filter(pk__in=project_ids),
+        'member': members,
+        'section': sections,
+        'task': tasks,
+    }
+
+
+def get_attnames(archive_model: ArchiveModel) -> list[str]:
+    return [archive_model.model._meta.get_field(name).attname for name in archive_model.fields]  # pyright: ignore[reportAttributeAccessIssue]  # noqa E501
+
+
+def iter_archive_records(projects: QuerySet[Project], chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, str]]:
+    """The archived models and the JSON lines of their rows, read by the chunks of the `iterator()` by the primary key."""
+    querysets = get_archive_querysets(projects)
+    encoder = ArchiveEncoder(separators=(',', ':'))
+    for archive_model in ARCHIVE_MODELS:
+        rows = querysets[archive_model.name].order_by('pk').values_list('pk', *get_attnames(archive_model))
+        for pk, *values in rows.iterator(chunk_size=chunk_size):
+            record = {'model': archive_model.name, 'pk': pk, 'fields': dict(zip(archive_model.fields, values))}
+            yield archive_model.name, encoder.encode(record)
+
+
+def backup_projects(projects: QuerySet[Project], path: str, chunk_size: int = CHUNK_SIZE) -> Counter:
+    """Writes the gzipped JSON lines archive of the projects, returns the amount of the rows by the model."""
+    amounts = Counter()
+    with gzip.open(path, 'wt', encoding='utf-8') as file:
+        file.write(json.dumps({'format': ARCHIVE_FORMAT, 'version': ARCHIVE_VERSION}) + '\n')
+        for name, line in iter_archive_records(projects, chunk_size=chunk_size):
+            file.write(line + '\n')
+            amounts[name] += 1
+    return amounts
+
+
+class ArchiveLoader:
+    """
+    Restores the records of the archive by the batches of `bulk_create`. The new primary keys are remapped
+    by the maps of the users, projects and sections, so the memory doesn't depend on the amount of tasks.
+    """
+
+    def __init__(self, batch_size: int = CHUNK_SIZE):
+        self.batch_size = batch_size
+        self.pks = {archive_model.name: dict() for archive_model in ARCHIVE_MODELS}
+        self.archive_model = ARCHIVE_MODELS[0]
+        self.batch = list()
+        self.amounts = Counter()
+
+    def add(self, record: dict[str, Any]):
+        try:
+            name, pk, fields = record['model'], record['pk'], record['fields']
+            order = ARCHIVE_MODEL_ORDER[name]
+        except (KeyError, TypeError) as error:
+            raise ArchiveError(f'The record is malformed: {record!r}.') from error
+        if order < ARCHIVE_MODEL_ORDER[self.archive_model.name]:
+            raise ArchiveError(f'The {name} records must precede the {self.archive_model.name} records.')
+        if name != self.archive_model.name or len(self.batch) >= self.batch_size:
+            self.flush()
+            self.archive_model = ARCHIVE_MODELS[order]
+        self.batch.append((pk, self.build(fields)))
+
+    def build(self, fields: dict[str, Any]) -> Model:
+        values = dict()
+        for name in self.archive_model.fields:
+            field = self.archive_model.model._meta.get_field(name)
+            value = fields.get(name)
+            relation = self.archive_model.relations.get(name)
+            if relation is not None and value is not None:
+                if value not in self.pks[relation]:
+                    raise ArchiveError(f'The archive references the missing {relation} {value}.')
+                value = self.pks[relation][value]
+            elif value is not None:
+                try:
+                    value = field.to_python(value)
+                except ValidationError as error:
+                    raise ArchiveError(f'The {name} of {self.archive_model.name} is invalid: {value!r}.') from error
+            values[field.attname] = value  # pyright: ignore[reportAttributeAccessIssue]
+        return self.archive_model.model(**values)
+
+    def flush(self):
+        if not self.batch:
+            return
+        name = self.archive_model.name
+        pks, objs = zip(*self.batch)
+        getattr(self, f'create_{name}s')(pks, objs)
+        self.amounts[name] += len(objs)
+        self.batch = list()
+
+    def create_objs(self, pks: Iterable[Any], objs: Iterable[Model]):
+        created = self.archive_model.model.objects.bulk_create(objs)
+        self.pks[self.archive_model.name].update(zip(pks, (obj.pk for obj in created)))
+
+    def create_users(self, pks: tuple[Any, ...], users: tuple[User, ...]):
+        # The existing users are matched by the username, the missing ones are created without the password.
+        existing = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'pk'))  # noqa E501
+        missing = list()
+        for pk, user in zip(pks, users):
+            if user.username in existing:
+                self.pks['user'][pk] = existing[user.username]
+            else:
+                user.password = make_password(None)
+                missing.append((pk, user))
+        if missing:
+            self.create_objs(*zip(*missing))
+
+    def create_projects(self, pks: tuple[Any, ...], projects: tuple[Project, ...]):
+        self.create_objs(pks, list(projects))
+        self.grant_access(((project.pk, project.owner_id) for project in projects), role=ProjectRole.OWNER)
+
+    def create_members(self, pks: tuple[Any, ...], members: tuple[Model, ...]):
+        Project.members.through.objects.bulk_create(members, ignore_conflicts=True)
+        self.grant_access(((member.project_id, member.user_id) for member in members), role=ProjectRole.MEMBER)  # pyright: ignore[reportAttributeAccessIssue]  # noqa E501
+
+    def grant_access(self, rows: Iterable[tuple[int, int]], role: str):
+        # The `bulk_create` doesn't send the signals which maintain the access table.
+        accesses = [ProjectAccess(project_id=project_id, user_id=user_id, role=role) for project_id, user_id in rows]
+        ProjectAccess.objects.bulk_create(accesses, ignore_conflicts=True)
+        invalidate_project_access(access.user_id for access in accesses)
+        invalidate_project_members(access.project_id for access in accesses)
+
+    def create_sections(self, pks: tuple[Any, ...], sections: tuple[Section, ...]):
+        self.create_objs(pks, list(sections))
+
+    def create_tasks(self, pks: tuple[Any, ...], tasks: tuple[Task, ...]):
+        # The tasks are not referenced by the other records, so their primary keys are not remapped.
+        Task.objects.bulk_create(tasks)
+
+    def finish(self) -> Counter:
+        self.flush()
+        # The `bulk_create` doesn't send the signals which maintain the task counters.
+        section_ids = list(self.pks['section'].values())
+        for start in range(0, len(section_ids), self.batch_size):
+            rebuild_counters(section_ids=section_ids[start:start + self.batch_size])
+        return self.amounts
+
+
+def read_archive(file: IO[str]) -> Iterator[dict[str, Any]]:
+    try:
+        header = json.loads(file.readline())
+    except ValueError as error:
+        raise ArchiveError('The file is not a project archive.') from error
+    if not isinstance(header, dict) or header.get('format') != ARCHIVE_FORMAT:
+        raise ArchiveError('The file is not a project archive.')
+    if header.get('version') != ARCHIVE_VERSION:
+        raise ArchiveError(f'The archive version {header.get("version")} is not supported.')
+    for number, line in enumerate(file, start=2):
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            raise ArchiveError(f'The line {number} is not valid JSON.') from error
+
+
+def restore_projects(path: str, batch_size: int = CHUNK_SIZE) -> Counter:
+    """
+    Restores the projects of the gzipped archive as new projects in one transaction,
+    returns the amount of the restored records by the model (including the users matched by the username).
+    """
+    loader = ArchiveLoader(batch_size=batch_size)
+    with gzip.open(path, 'rt', encoding='utf-8') as file, transaction.atomic():
+        for record in read_archive(file):
+            loader.add(record)
+        return loader.finish()
@@ -0,0 +1,185 @@
+import statistics
+import time
+from collections.abc import Iterator
+from typing import Any
+from typing import NamedTuple
+
+from django.db import connection
+from django.db.models import F
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern
+from django.urls import URLResolver
+from django.urls import get_resolver
+from django.urls import reverse
+
+from authentication.models import User
+from sections.models import Section
+from tasks.models import TaskStatus
+
+
+class Endpoint(NamedTuple):
+    """The route with its budget: the maximum of SQL queries and of the median wall time of the GET request."""
+    url_name: str
+    max_queries: int
+    max_ms: float
+    user: str = 'owner'
+    status: int = 200
+    skip: str = ''
+    query: str = ''
+
+
+# The sizes of the seeded datasets, the options of the `populate_database` command.
+DATASETS = {
+    'small': {},
+    'medium': {'users': 200, 'tasks_per_section': 40},
+    'large': {'users': 2000, 'tasks_per_section': 100},
+}
+
+# The settings of the deployment with the shared cache (`app_config.caches`), which the budgets are declared for.
+SHARED_CACHE_SETTINGS = {
+    'SHARED_CACHE': True,
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+}
+
+# The namespaces of the third-party routes which are not benchmarked.
+IGNORED_NAMESPACES = ('admin',)
+
+# The budgets of queries are the same for all datasets, the view which is O(1) in queries must stay so.
+# The session and the user of the logged in request are cached, so the steady state starts with one query:
+# the password and the flags of the user are read fresh for the session check.
+ENDPOINTS = (
+    Endpoint('app_home', max_queries=1, max_ms=50),
+    Endpoint('project_list', max_queries=3, max_ms=100),
+    # The members are invited by the usernames, the form doesn't load the users.
+    Endpoint('project_create', max_queries=1, max_ms=50),
+    Endpoint('project_detail', max_queries=4, max_ms=300),
+    Endpoint('project_update', max_queries=3, max_ms=100),
+    Endpoint('project_delete', max_queries=3, max_ms=100),
+    Endpoint('project_members', max_queries=3, max_ms=100),
+    # The members are searched in the cached list of the project.
+    Endpoint('project_member_search', max_queries=1, max_ms=50),
+    Endpoint('project_member_invite', max_queries=2, max_ms=50),
+    Endpoint('project_member_remove', max_queries=2, max_ms=50, status=405),
+    Endpoint('section_list', max_queries=3, max_ms=200),
+    Endpoint('section_create', max_queries=2, max_ms=50),
+    # The lists of tasks are served from the cached fragments, without the query of the task table.
+    Endpoint('section_detail', max_queries=2, max_ms=100),
+    Endpoint('section_update', max_queries=2, max_ms=100),
+    Endpoint('section_delete', max_queries=2, max_ms=100),
+    Endpoint('task_list', max_queries=3, max_ms=200),
+    # The executor is chosen by the autocomplete, only the selected member is rendered.
+    Endpoint('task_create', max_queries=2, max_ms=300),
+    Endpoint('task_detail', max_queries=2, max_ms=50),
+    Endpoint('task_board', max_queries=2, max_ms=100),
+    Endpoint('task_board_column', max_queries=2, max_ms=100),
+    # The test client is WSGI, the stream ends after the replay like the polling fallback.
+    Endpoint('task_events', max_queries=3, max_ms=50),
+    Endpoint('my_tasks', max_queries=2, max_ms=100),
+    Endpoint('my_tasks_column', max_queries=2, max_ms=100),
+    # The worst case of the search: every task matches the query and is ranked.
+    Endpoint('task_search', max_queries=3, max_ms=600, query='q=task'),
+    Endpoint('task_update', max_queries=0, max_ms=0, skip='The view is not implemented.'),
+    Endpoint('task_delete', max_queries=0, max_ms=0, skip='The view is not implemented.'),
+    Endpoint('auth_login', max_queries=0, max_ms=50, user=''),
+    Endpoint('auth_logout', max_queries=0, max_ms=50, status=405),
+    Endpoint('auth_register', max_queries=0, max_ms=50, user=''),
+    Endpoint('api_project_list', max_queries=2, max_ms=100),
+    Endpoint('api_project_detail', max_queries=2, max_ms=50),
+    # The timelines are read by the `(project|section|task, id)` indexes of the activity log.
+    Endpoint('api_project_activity', max_queries=2, max_ms=50),
+    Endpoint('api_section_list', max_queries=2, max_ms=100),
+    Endpoint('api_section_detail', max_queries=2, max_ms=50),
+    Endpoint('api_section_activity', max_queries=3, max_ms=50),
+    Endpoint('api_task_list', max_queries=3, max_ms=100),
+    Endpoint('api_task_bulk', max_queries=1, max_ms=50, status=405),
+    Endpoint('api_task_detail', max_queries=3, max_ms=50),
+    Endpoint('api_task_activity', max_queries=3, max_ms=50),
+    Endpoint('api_task_search', max_queries=3, max_ms=600, query='q=task'),
+    Endpoint('metrics', max_queries=0, max_ms=50, user=''),
+)
+
+
+class Result(NamedTuple):
+    dataset: str
+    endpoint: Endpoint
+    url: str
+    status: int
+    queries: int
+    median_ms: float
+
+    @property
+    def errors(self) -> list[str]:
+        errors = list()
+        if self.status != self.endpoint.status:
+            errors.append(f'status {self.status} != {self.endpoint.status}')
+        if self.queries > self.endpoint.max_queries:
+            errors.append(f'queries {self.queries} > {self.endpoint.max_queries}')
+        if self.median_ms > self.endpoint.max_ms:
+            errors.append(f'time {self.median_ms:.1f}ms > {self.endpoint.max_ms}ms')
+        return errors
+
+
+def iter_url_names(patterns: list | None = None, namespace: str | None = None) -> Iterator[str]:
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_url_names(pattern.url_patterns, pattern.namespace or namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name and namespace not in IGNORED_NAMESPACES:
+            yield pattern.name
+
+
+def get_missing_endpoints() -> list[str]:
+    """The routes of the project without the declared budget."""
+    declared = {endpoint.url_name for endpoint in ENDPOINTS}
+    return [url_name for url_name in iter_url_names() if url_name not in declared]
+
+
+def get_scope() -> dict[str, Any]:
+    """The largest section of the dataset (by the task counters), its project, task and the project owner."""
+    section = Section.objects.select_related('project__owner').order_by(
+        (F('tasks_to_do') + F('tasks_in_progress') + F('tasks_done')).desc(), 'pk',
+    ).first()
+    if section is None:
+        raise ValueError('The dataset has no sections.')
+    task = section.tasks.order_by('pk').first()
+    return {
+        'owner': section.project.owner,
+        'kwargs': {
+            'project_pk': section.project.pk,
+            'section_pk': section.pk,
+            'task_pk': task.pk if task is not None else 0,
+            'status': TaskStatus.TO_DO,
+        },
+    }
+
+
+def get_url(url_name: str, scope_kwargs: dict[str, Any]) -> str:
+    pattern = next(p for p in get_resolver().reverse_dict.getlist(url_name))
+    params = pattern[0][0][1]
+    return reverse(url_name, kwargs={param: scope_kwargs[param] for param in params})
+
+
+def run_endpoint(dataset: str, endpoint: Endpoint, scope: dict[str, Any], repeat: int) -> Result:
+    client = Client()
+    if endpoint.user:
+        user = scope[endpoint.user]
+        client.force_login(user if isinstance(user, User) else User.objects.get(username=user))
+    url = get_url(endpoint.url_name, scope['kwargs'])
+    if endpoint.query:
+        url = f'{url}?{endpoint.query}'
+    # The warm up request fills the caches, the budgets are for the steady state.
+    client.get(url)
+    timings = list()
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+    return Result(
+        dataset=dataset,
+        endpoint=endpoint,
+        url=url,
+        status=response.status_code,
+        queries=len(queries),
+        median_ms=statistics.median(timings),
+    )
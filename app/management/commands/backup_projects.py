@@ -0,0 +1,38 @@
+import time
+
+from django.core.management import BaseCommand
+from django.core.management import CommandError
+
+from app.archive import CHUNK_SIZE
+from app.archive import backup_projects
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        'Write the projects with their members, sections and tasks to the gzipped JSON lines archive. '
+        'The rows are streamed by the chunked reads, so the memory does not depend on the size of the projects.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_ids', nargs='*', type=int, help='Ids of the archived projects.')
+        parser.add_argument('--all', action='store_true', help='Archive all projects.')
+        parser.add_argument('--output', required=True, help='Path of the archive, e.g. "projects.jsonl.gz".')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Amount of rows in one read.')
+
+    def handle(self, *args, **options):
+        project_ids = options['project_ids']
+        if options['all'] == bool(project_ids):
+            raise CommandError('Pass either the ids of projects or --all.')
+        projects = Project.objects.all()
+        if project_ids:
+            projects = projects.filter(pk__in=project_ids)
+            missing = set(project_ids) - set(projects.values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f'No projects with ids: {", ".join(map(str, sorted(missing)))}.')
+
+        started = time.monotonic()
+        amounts = backup_projects(projects, path=options['output'], chunk_size=options['chunk_size'])
+        for name, amount in amounts.items():
+            self.stdout.write(f'{name}: {amount} rows')
+        self.stdout.write(f'The archive {options["output"]} is written in {time.monotonic() - started:.1f}s.')
@@ -0,0 +1,103 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import BaseCommand
+from django.core.management import CommandError
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import override_settings
+from django.test.utils import setup_test_environment
+from django.test.utils import teardown_test_environment
+
+from app.benchmarks import DATASETS
+from app.benchmarks import ENDPOINTS
+from app.benchmarks import SHARED_CACHE_SETTINGS
+from app.benchmarks import get_missing_endpoints
+from app.benchmarks import get_scope
+from app.benchmarks import run_endpoint
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every route against the seeded datasets of several sizes in the test database. '
+        'Records the median wall time and the amount of SQL queries of each endpoint and fails '
+        'when an endpoint goes over its budget declared in `app.benchmarks.ENDPOINTS`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset', action='append', choices=list(DATASETS),
+            help='Size of the seeded dataset, can be repeated. Default: small and medium.',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Amount of measured requests per endpoint.')
+        parser.add_argument('--endpoint', action='append', help='Name of the benchmarked route, can be repeated.')
+        parser.add_argument('--output', help='Path of the JSON file with the results.')
+
+    def handle(self, *args, **options):
+        missing = get_missing_endpoints()
+        if missing:
+            raise CommandError(f'No budget for the routes: {", ".join(missing)}.')
+
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not endpoint.skip and (not options['endpoint'] or endpoint.url_name in options['endpoint'])
+        ]
+        # The SQL logging of the debug settings distorts the timings, the expected 405 responses are not warnings.
+        logging.getLogger('django.db.backends').setLevel(logging.WARNING)
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        setup_test_environment()
+        old_name = settings.DATABASES['default']['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = list()
+            # The requests of the benchmark are served by one process, so its local memory cache is shared
+            # by all of them, the budgets are the budgets of the deployment with the shared cache.
+            with override_settings(**SHARED_CACHE_SETTINGS):
+                for dataset in options['dataset'] or ['small', 'medium']:
+                    results.extend(self.run_dataset(dataset, endpoints, options['repeat']))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump([
+                    {
+                        'dataset': result.dataset,
+                        'endpoint': result.endpoint.url_name,
+                        'url': result.url,
+                        'status': result.status,
+                        'queries': result.queries,
+                        'median_ms': round(result.median_ms, 2),
+                        'errors': result.errors,
+                    }
+                    for result in results
+                ], file, indent=2)
+
+        failed = [result for result in results if result.errors]
+        if failed:
+            raise CommandError(f'{len(failed)} endpoints over the budget.')
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} endpoints within the budget.'))
+
+    def run_dataset(self, dataset: str, endpoints: list, repeat: int) -> list:
+        self.stdout.write(f'Dataset "{dataset}":')
+        call_command('flush', interactive=False, verbosity=0)
+        cache.clear()
+        call_command('populate_database', stdout=self.stdout, **DATASETS[dataset])
+        scope = get_scope()
+
+        results = list()
+        self.stdout.write(f'{"endpoint":<24} {"status":>6} {"queries":>7} {"budget":>6} {"ms":>8} {"budget":>8}')
+        for endpoint in endpoints:
+            result = run_endpoint(dataset=dataset, endpoint=endpoint, scope=scope, repeat=repeat)
+            line = (
+                f'{endpoint.url_name:<24} {result.status:>6} {result.queries:>7} {endpoint.max_queries:>6} '
+                f'{result.median_ms:>8.1f} {endpoint.max_ms:>8.1f}'
+            )
+            if result.errors:
+                line = self.style.ERROR(f'{line}  {"; ".join(result.errors)}')
+            self.stdout.write(line)
+            results.append(result)
+        return results
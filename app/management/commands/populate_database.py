@@ -1,69 +1,243 @@
+import datetime as dt
+import itertools
+import json
 import random
-from typing import cast
+import time
+from collections.abc import Iterator
 
+from django.contrib.auth.hashers import make_password
 from django.core.management import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
 
 from authentication.models import User
+from projects.access import rebuild_project_access
 from projects.models import Project
 from sections.models import Section
+from tasks.counters import is_task_overdue
+from tasks.counters import rebuild_counters
 from tasks.models import Task
+from tasks.models import TaskEvent
+from tasks.models import TaskEventAction
 from tasks.models import TaskPriority
 from tasks.models import TaskStatus
 
 
+# The skewed distributions of the generated values, close to the production data.
+STATUS_WEIGHTS = {
+    TaskStatus.TO_DO: 30,
+    TaskStatus.IN_PROGRESS: 15,
+    TaskStatus.DONE: 55,
+}
+PRIORITY_WEIGHTS = {
+    TaskPriority.URGENT: 5,
+    TaskPriority.HIGH: 15,
+    TaskPriority.MEDIUM: 30,
+    TaskPriority.LOW: 50,
+}
+# The part of tasks with the deadline, the deadlines are spread around the current day.
+DEADLINE_RATIO = 0.6
+DEADLINE_SPREAD_DAYS = 90
+
+
 class Command(BaseCommand):
-    help = 'Populate the database with test entities.'
+    help = (
+        'Populate the database with test entities. The sizes are parameterized and the data is generated '
+        'by the seeded random generator, so the same arguments produce the same dataset. The rows are inserted '
+        'in batches, the users share one precomputed password hash.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Amount of users including the superuser "admin".')
+        parser.add_argument('--projects-per-user', type=int, default=5, help='Average amount of projects owned by user.')
+        parser.add_argument('--sections-per-project', type=int, default=5, help='Amount of sections in project.')
+        parser.add_argument('--tasks-per-section', type=int, default=5, help='Average amount of tasks in section.')
+        parser.add_argument('--events-per-task', type=int, default=2, help='Average amount of activity events of task.')
+        parser.add_argument('--members-per-project', type=int, default=5, help='Average amount of members of project.')
+        parser.add_argument('--skew', type=float, default=1.0, help='Exponent of the Zipf-like skew, 0 is uniform.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Amount of rows in one INSERT.')
+        parser.add_argument('--password', default='password', help='Password of all users except the "admin".')
 
     def handle(self, *args, **options):
-        self.create_users(amount=10)
-        self.create_projects(amount_for_user=5)
-        self.create_sections(amount_for_project=5)
-        self.create_tasks(amount_for_section=5)
+        self.random = random.Random(options['seed'])
+        self.skew = options['skew']
+        self.batch_size = options['batch_size']
+        # The deadlines are relative to the current day, so the dataset is the same during the day.
+        self.today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        self.run_step('users', self.create_users, amount=options['users'], password=options['password'])
+        self.run_step('projects', self.create_projects, amount_for_user=options['projects_per_user'])
+        self.run_step('members', self.create_members, amount_for_project=options['members_per_project'])
+        self.run_step('sections', self.create_sections, amount_for_project=options['sections_per_project'])
+        self.run_step('tasks', self.create_tasks, amount_for_section=options['tasks_per_section'])
+        self.run_step('task events', self.create_task_events, amount_for_task=options['events_per_task'])
+        # The `bulk_create` doesn't send the signals which maintain the access table and the task counters.
+        self.run_step('project access', rebuild_project_access)
+        self.run_step('task counters', rebuild_counters)
+
+    def run_step(self, name: str, step, **kwargs):
+        started = time.monotonic()
+        amount = step(**kwargs)
+        self.stdout.write(f'{name}: {amount} rows in {time.monotonic() - started:.1f}s')
+
+    def zipf_weights(self, amount: int, shuffle: bool = True) -> list[float]:
+        """Weights of the Zipf-like distribution over the `amount` items, randomly ranked if `shuffle`."""
+        ranks = list(range(1, amount + 1))
+        if shuffle:
+            self.random.shuffle(ranks)
+        return [1 / rank ** self.skew for rank in ranks]
 
-    def create_users(self, amount: int):
+    def split_skewed(self, total: int, amount: int) -> list[int]:
+        """Splits the `total` into `amount` skewed parts with the exact sum."""
+        if amount == 0:
+            return []
+        weights = self.zipf_weights(amount)
+        weights_sum = sum(weights)
+        parts = [int(total * weight / weights_sum) for weight in weights]
+        for index in self.random.sample(range(amount), k=total - sum(parts)):
+            parts[index] += 1
+        return parts
+
+    def bulk_create(self, model, objects: Iterator) -> int:
+        amount = 0
+        while batch := list(itertools.islice(objects, self.batch_size)):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+            amount += len(batch)
+        return amount
+
+    def create_users(self, amount: int, password: str) -> int:
         User.objects.create_superuser(username='admin', password='admin', email='admin@gmail.com')
-        for i in range(1, amount):
-            User.objects.create_user(username=f'user{i}', password=f'user{i}', email=f'user{i}@gmail.com')
-
-    def create_projects(self, amount_for_user: int):
-        users = User.objects.all()
-        projects_list = list()
-        for user in users:
-            for i in range(1, amount_for_user+1):
-                project = Project(
-                    title=f'Project {i} [owner: {user.username}]',
-                    owner=user,
-                )
-                projects_list.append(project)
-        projects = Project.objects.bulk_create(projects_list)
-        for project in projects:
-            project.members.set(random.choices(users, k=random.randint(2, len(users))))
-
-    def create_sections(self, amount_for_project: int):
-        sections_list = list()
-        for project in Project.objects.all():
-            for i in range(1, amount_for_project+1):
-                section = Section(
-                    name=f'Section {i} [project: {project.title}]',
-                    project=project,
-                )
-                sections_list.append(section)
-        Section.objects.bulk_create(sections_list)
-
-    def create_tasks(self, amount_for_section: int):
-        tasks_list = list()
-        for section in Section.objects.all():
-            for i in range(1, amount_for_section+1):
-                executor = cast(User, random.choice(section.project.members.all()))
-                creator = cast(User, random.choice(section.project.members.all()))
-                task = Task(
-                    title=f'Task {i} [creator: {creator.username}, executor: {executor.username}, section: {section.name}]',  # noqa E501
-                    description=f'Description of task {i} [section: {section.name}]',
-                    priority=random.choice(TaskPriority.values),
-                    status=random.choice(TaskStatus.values),
-                    executor=executor,
-                    creator=creator,
-                    section=section,
-                )
-                tasks_list.append(task)
-        Task.objects.bulk_create(tasks_list)
+        password_hash = make_password(password)
+        users = (
+            User(username=f'user{i}', password=password_hash, email=f'user{i}@gmail.com')
+            for i in range(1, amount)
+        )
+        return 1 + self.bulk_create(User, users)
+
+    def create_projects(self, amount_for_user: int) -> int:
+        self.user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        owners = self.split_skewed(total=len(self.user_ids) * amount_for_user, amount=len(self.user_ids))
+        projects = (
+            Project(title=f'Project {i} [owner: {user_id}]', owner_id=user_id)
+            for user_id, amount in zip(self.user_ids, owners)
+            for i in range(1, amount + 1)
+        )
+        return self.bulk_create(Project, projects)
+
+    def create_members(self, amount_for_project: int) -> int:
+        user_weights = list(itertools.accumulate(self.zipf_weights(len(self.user_ids))))
+        projects = list(Project.objects.order_by('pk').values_list('pk', 'owner_id'))
+        # The owner and the members of project, used to choose the creator and the executor of tasks.
+        self.project_users = dict()
+
+        def generate():
+            for project_id, owner_id in projects:
+                amount = min(len(self.user_ids), int(self.random.expovariate(1 / amount_for_project)))
+                chosen = self.random.choices(self.user_ids, cum_weights=user_weights, k=amount * 2)
+                members = list(dict.fromkeys(chosen))[:amount]
+                self.project_users[project_id] = (owner_id, *(member for member in members if member != owner_id))
+                for user_id in members:
+                    yield Project.members.through(project_id=project_id, user_id=user_id)
+
+        return self.bulk_create(Project.members.through, generate())
+
+    def create_sections(self, amount_for_project: int) -> int:
+        sections = (
+            Section(name=f'Section {i} [project: {project_id}]', project_id=project_id)
+            for project_id in self.project_users
+            for i in range(1, amount_for_project + 1)
+        )
+        return self.bulk_create(Section, sections)
+
+    def insert_rows(self, model, fields: tuple[str, ...], rows: Iterator[tuple]) -> int:
+        """
+        Inserts the rows of prepared database values with `executemany` of one `INSERT` statement per batch.
+        Used for the tasks, where the compilation of `bulk_create` costs more than the insert itself.
+        """
+        quote_name = connection.ops.quote_name
+        columns = ', '.join(quote_name(model._meta.get_field(field).column) for field in fields)
+        placeholders = ', '.join(['%s'] * len(fields))
+        sql = f'INSERT INTO {quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+        amount = 0
+        while batch := list(itertools.islice(rows, self.batch_size)):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, batch)
+            amount += len(batch)
+        return amount
+
+    def create_tasks(self, amount_for_section: int) -> int:
+        sections = list(Section.objects.order_by('pk').values_list('pk', 'project_id'))
+        amounts = self.split_skewed(total=len(sections) * amount_for_section, amount=len(sections))
+        statuses, status_weights = list(STATUS_WEIGHTS), list(itertools.accumulate(STATUS_WEIGHTS.values()))
+        priorities, priority_weights = list(PRIORITY_WEIGHTS), list(itertools.accumulate(PRIORITY_WEIGHTS.values()))
+        spread = DEADLINE_SPREAD_DAYS * 24 * 60 * 60
+        adapt_deadline = connection.ops.adapt_datetimefield_value
+        # The first users of project (the owner first) get the most of tasks, the weights are cached by the amount of users.
+        user_weights = dict()
+
+        def generate():
+            for (section_id, project_id), amount in zip(sections, amounts):
+                users = self.project_users[project_id]
+                if len(users) not in user_weights:
+                    user_weights[len(users)] = list(itertools.accumulate(self.zipf_weights(len(users), shuffle=False)))
+                for i in range(1, amount + 1):
+                    executor_id, creator_id = self.random.choices(users, cum_weights=user_weights[len(users)], k=2)
+                    deadline = None
+                    if self.random.random() < DEADLINE_RATIO:
+                        deadline = self.today + dt.timedelta(seconds=self.random.randint(-spread, spread))
+                    priority = self.random.choices(priorities, cum_weights=priority_weights)[0].value
+                    status = self.random.choices(statuses, cum_weights=status_weights)[0].value
+                    yield (
+                        f'Task {i} [section: {section_id}]',
+                        f'Description of task {i} [section: {section_id}]',
+                        priority,
+                        status,
+                        executor_id,
+                        creator_id,
+                        section_id,
+                        adapt_deadline(deadline),
+                        is_task_overdue(status, deadline),
+                    )
+
+        fields = ('title', 'description', 'priority', 'status', 'executor', 'creator', 'section', 'deadline', 'is_overdue')  # noqa E501
+        return self.insert_rows(Task, fields, generate())
+
+    def create_task_events(self, amount_for_task: int) -> int:
+        """The status changes of tasks by the users of project, the timeline of every task ends with its status."""
+        tasks = Task.objects.order_by('pk').values_list('pk', 'section_id', 'section__project_id', 'status')
+        statuses = list(STATUS_WEIGHTS)
+        spread = DEADLINE_SPREAD_DAYS * 24 * 60 * 60
+        adapt_created_at = connection.ops.adapt_datetimefield_value
+
+        def iterate_tasks():
+            # The tasks are read by the keyset chunks of the primary key, not all at once into the memory.
+            last_pk = 0
+            while chunk := list(tasks.filter(pk__gt=last_pk)[:self.batch_size]):
+                yield from chunk
+                last_pk = chunk[-1][0]
+
+        def generate():
+            for task_id, section_id, project_id, status in iterate_tasks():
+                users = self.project_users[project_id]
+                amount = int(self.random.expovariate(1 / amount_for_task)) if amount_for_task else 0
+                changed = [self.random.choice(statuses) for _ in range(amount)] + [status]
+                created_at = self.today - dt.timedelta(seconds=self.random.randint(0, spread))
+                for old, new in itertools.pairwise(changed):
+                    if old == new:
+                        continue
+                    created_at += dt.timedelta(seconds=self.random.randint(1, spread // 10))
+                    yield (
+                        task_id,
+                        section_id,
+                        project_id,
+                        self.random.choice(users),
+                        TaskEventAction.UPDATED.value,
+                        json.dumps({'status': [old, new]}),
+                        adapt_created_at(created_at),
+                    )
+
+        fields = ('task', 'section', 'project', 'actor', 'action', 'changes', 'created_at')
+        return self.insert_rows(TaskEvent, fields, generate())
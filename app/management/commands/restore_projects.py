@@ -0,0 +1,30 @@
+import time
+
+from django.core.management import BaseCommand
+from django.core.management import CommandError
+
+from app.archive import CHUNK_SIZE
+from app.archive import ArchiveError
+from app.archive import restore_projects
+
+
+class Command(BaseCommand):
+    help = (
+        'Restore the projects of the archive written by the `backup_projects` command as new projects. '
+        'The users are matched by the username, the missing users are created without the password. '
+        'The rows are inserted by the batches in one transaction, nothing is restored if the archive is invalid.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='Path of the archive.')
+        parser.add_argument('--batch-size', type=int, default=CHUNK_SIZE, help='Amount of rows in one INSERT.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            amounts = restore_projects(path=options['input'], batch_size=options['batch_size'])
+        except (ArchiveError, OSError, EOFError) as error:
+            raise CommandError(f'The archive {options["input"]} is not restored: {error}') from error
+        for name, amount in amounts.items():
+            self.stdout.write(f'{name}: {amount} rows')
+        self.stdout.write(f'The archive {options["input"]} is restored in {time.monotonic() - started:.1f}s.')
@@ -0,0 +1,35 @@
+import sqlite3
+
+from django.core.management import BaseCommand
+from django.core.management import CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+from app_config.replicas import get_replicas
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into the SQLite replicas of the `DATABASE_REPLICAS`. '
+        'Used for the local testing of the replica routing, the real replicas are synced by the database server.'
+    )
+
+    def handle(self, *args, **options):
+        replicas = get_replicas()
+        if not replicas:
+            raise CommandError('No replicas in the DATABASE_REPLICAS setting.')
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('Only the SQLite primary can be copied.')
+        primary.ensure_connection()
+        for alias in replicas:
+            replica = connections[alias]
+            if replica.vendor != 'sqlite':
+                raise CommandError(f'The replica "{alias}" is not SQLite.')
+            replica.close()
+            target = sqlite3.connect(replica.settings_dict['NAME'])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(f'{alias}: copied from {primary.settings_dict["NAME"]}')
@@ -0,0 +1,166 @@
+import asyncio
+import functools
+import json
+import threading
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+DEFAULT_BROKER = {
+    'BACKEND': 'app_config.broker.InProcessBroker',
+    'OPTIONS': {},
+}
+# The messages waiting for the slow subscriber, the subscriber which lags behind more is closed.
+MAX_PENDING_MESSAGES = 100
+
+
+class SubscriptionClosed(Exception):
+    pass
+
+
+class Subscription(ABC):
+    """The messages of one channel for one consumer, opened by `Broker.subscribe`."""
+
+    @abstractmethod
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        """The next message or `None` after the timeout, raises `SubscriptionClosed` if it is closed by the broker."""
+
+    @abstractmethod
+    async def close(self):
+        """Unsubscribes from the channel and releases the connection of the subscription."""
+
+
+class Broker(ABC):
+    """
+    Publish/subscribe of the JSON messages by the channel names. The messages are published by the sync code
+    (signals, `on_commit` callbacks) of any thread and consumed by the async views.
+    """
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict[str, Any]):
+        """Sends the message to the current subscribers of the channel, it is not stored for the later ones."""
+
+    @abstractmethod
+    async def subscribe(self, channel: str) -> Subscription:
+        """Opens the subscription, only the messages published after it are delivered."""
+
+
+class InProcessSubscription(Subscription):
+    def __init__(self, broker: 'InProcessBroker', channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        self.closed = False
+
+    def put(self, message: dict[str, Any]):
+        try:
+            self.loop.call_soon_threadsafe(self.deliver, message)
+        except RuntimeError:
+            # The event loop of the finished request is closed.
+            pass
+
+    def deliver(self, message: dict[str, Any]):
+        if self.closed:
+            return
+        if self.queue.qsize() >= self.broker.max_pending:
+            # The consumer is closed instead of the growing queue, it catches up by other means (the reconnect).
+            self.closed = True
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except TimeoutError:
+            return None
+        if message is None:
+            raise SubscriptionClosed()
+        return message
+
+    async def close(self):
+        self.closed = True
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker(Broker):
+    """The messages are delivered to the subscribers of the current process only, for the single process deployment."""
+
+    def __init__(self, max_pending: int = MAX_PENDING_MESSAGES):
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.subscriptions: dict[str, set[InProcessSubscription]] = dict()
+
+    def publish(self, channel: str, message: dict[str, Any]):
+        with self.lock:
+            subscriptions = tuple(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        subscription = InProcessSubscription(broker=self, channel=channel)
+        with self.lock:
+            self.subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: InProcessSubscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.channel]
+
+
+class RedisSubscription(Subscription):
+    def __init__(self, pubsub: Any, client: Any):
+        self.pubsub = pubsub
+        self.client = client
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message['data'])
+
+    async def close(self):
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class RedisBroker(Broker):
+    """The Redis pub/sub, the messages are delivered to the subscribers of all processes. Requires the `redis` package."""
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = 'broker:'):
+        try:
+            import redis
+        except ImportError as error:
+            raise ImproperlyConfigured('The RedisBroker requires the "redis" package.') from error
+        self.url = url
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel: str, message: dict[str, Any]):
+        self.client.publish(self.prefix + channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    async def subscribe(self, channel: str) -> Subscription:
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.prefix + channel)
+        return RedisSubscription(pubsub=pubsub, client=client)
+
+
+@functools.cache
+def get_broker() -> Broker:
+    """The broker of the `EVENT_BROKER` setting, one instance per process."""
+    config = getattr(settings, 'EVENT_BROKER', DEFAULT_BROKER)
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', dict()))
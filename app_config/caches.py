@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.checks import Error
+from django.core.checks import Tags
+from django.core.checks import register
+
+
+# The backends whose entries are visible only to the process which wrote them.
+PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+# The session engines which read the sessions from the cache, the logout would end the session only in one process.
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def is_cache_shared() -> bool:
+    """
+    Whether the default cache is shared by all processes of the deployment (`SHARED_CACHE`). The cached project
+    access, members, users and fragments are invalidated by the process of the write, so they need the shared cache.
+    """
+    return getattr(settings, 'SHARED_CACHE', False)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs: Any, **kwargs) -> list[Error]:
+    errors = list()
+    backend = settings.CACHES['default']['BACKEND']
+    if is_cache_shared() and backend in PER_PROCESS_CACHE_BACKENDS:
+        errors.append(Error(
+            f'SHARED_CACHE is set, but the default cache backend {backend} is not shared by the processes.',
+            hint='Configure the Redis or Memcached backend of the default cache or unset SHARED_CACHE.',
+            id='app_config.E001',
+        ))
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES and not is_cache_shared():
+        errors.append(Error(
+            f'The session engine {settings.SESSION_ENGINE} needs the shared cache, but SHARED_CACHE is not set.',
+            hint='Use the django.contrib.sessions.backends.db engine or configure the shared cache.',
+            id='app_config.E002',
+        ))
+    return errors
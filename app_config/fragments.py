@@ -0,0 +1,101 @@
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.db.models import Model
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
+
+from app_config.caches import is_cache_shared
+from app_config.replicas import is_reading_from_replica
+
+
+# The fragments are cached by the views with the version of the object in the key (the same key as the `{% cache %}` tag),
+# so the change of the object (bumped version) makes all its fragments unreachable and they expire by the timeout.
+# The versions are timestamps, so the evicted version never brings back the fragments of the previous one.
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+VERSION_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def get_version_key(model: type[Model], pk: int) -> str:
+    return f'fragment_version:{model._meta.label_lower}:{pk}'
+
+
+def get_fragment_versions(model: type[Model], pks: Iterable[int]) -> dict[int, int]:
+    """The versions of the fragments of objects by the primary key, with one cache request."""
+    keys = {get_version_key(model, pk): pk for pk in pks}
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=VERSION_CACHE_TIMEOUT)
+        versions.update(missing)
+    return {pk: versions[key] for key, pk in keys.items()}
+
+
+async def aget_fragment_versions(model: type[Model], pks: Iterable[int]) -> dict[int, int]:
+    keys = {get_version_key(model, pk): pk for pk in pks}
+    versions = await cache.aget_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=VERSION_CACHE_TIMEOUT)
+        versions.update(missing)
+    return {pk: versions[key] for key, pk in keys.items()}
+
+
+def get_fragment_version(model: type[Model], pk: int) -> int:
+    return get_fragment_versions(model, (pk,))[pk]
+
+
+async def aget_fragment_version(model: type[Model], pk: int) -> int:
+    return (await aget_fragment_versions(model, (pk,)))[pk]
+
+
+def bump_fragment_versions(model: type[Model], pks: Iterable[int]):
+    """Invalidates the cached fragments of the objects after the commit of the current transaction."""
+    keys = [get_version_key(model, pk) for pk in set(pks) if pk is not None]
+    if not keys:
+        return
+    transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), timeout=VERSION_CACHE_TIMEOUT))
+
+
+def get_fragment_timeout(*versions: int) -> int:
+    """
+    The timeout of the cached fragment, zero when the fragment isn't cached. The fragments are cached only in the shared
+    cache, the version bumped in the local cache of the writing process would never reach the other processes.
+    The fragment read from a replica isn't cached within the replica pin window after the change,
+    because the lagging replica could store the previous data under the new version.
+    """
+    if not is_cache_shared():
+        return 0
+    if is_reading_from_replica():
+        pin_nanoseconds = getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 10) * 1_000_000_000
+        if time.time_ns() - max(versions, default=0) < pin_nanoseconds:
+            return 0
+    return FRAGMENT_CACHE_TIMEOUT
+
+
+def get_fragment(name: str, vary_on: Iterable[Any], timeout: int, render: Callable[[], str]) -> SafeString:
+    """The cached fragment, `render` is called (and loads the data of the fragment) only when the fragment is missing."""
+    key = make_template_fragment_key(name, vary_on)
+    fragment = cache.get(key) if timeout else None
+    if fragment is None:
+        fragment = render()
+        if timeout:
+            cache.set(key, fragment, timeout=timeout)
+    return mark_safe(fragment)
+
+
+async def aget_fragment(name: str, vary_on: Iterable[Any], timeout: int, render: Callable[[], Awaitable[str]]) -> SafeString:  # noqa E501
+    key = make_template_fragment_key(name, vary_on)
+    fragment = await cache.aget(key) if timeout else None
+    if fragment is None:
+        fragment = await render()
+        if timeout:
+            await cache.aset(key, fragment, timeout=timeout)
+    return mark_safe(fragment)
@@ -0,0 +1,235 @@
+import bisect
+import contextvars
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import Http404
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+
+# The upper bounds of the histogram buckets, the last bucket `+Inf` is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERIES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+# The label of the requests which are not resolved to a view (404 of the URL resolver).
+UNRESOLVED_VIEW = '<unresolved>'
+# The SQL of the slow query sample is truncated to this length.
+SLOW_QUERY_SQL_LENGTH = 300
+
+
+class Histogram:
+    """Cumulative histogram per labels, the same as the Prometheus `histogram` type."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.series: dict[tuple, list] = dict()
+
+    def observe(self, labels: tuple, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            # The counts of buckets (without `+Inf`), the total count and the sum.
+            series = self.series[labels] = [[0] * len(self.buckets), 0, 0.0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += 1
+        series[2] += value
+
+
+class MetricsRegistry:
+    """
+    In-memory metrics of the process: the latency histogram, the query count histogram and the query time per view,
+    and the samples of the slow queries. The metrics are per process, every worker exposes its own `/metrics`.
+    """
+
+    def __init__(self, slow_query_samples: int):
+        self.lock = threading.Lock()
+        self.requests: dict[tuple, int] = dict()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERIES_BUCKETS)
+        self.query_seconds: dict[tuple, float] = dict()
+        self.slow_queries: dict[tuple, int] = dict()
+        self.slow_query_samples: deque[tuple[str, str, float]] = deque(maxlen=slow_query_samples)
+
+    def record_request(self, view: str, method: str, status: int, seconds: float, queries: int, query_seconds: float):
+        with self.lock:
+            key = (view, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.observe((view, method), seconds)
+            self.queries.observe((view,), queries)
+            self.query_seconds[(view,)] = self.query_seconds.get((view,), 0.0) + query_seconds
+
+    def record_slow_query(self, view: str, sql: str, seconds: float):
+        with self.lock:
+            self.slow_queries[(view,)] = self.slow_queries.get((view,), 0) + 1
+            self.slow_query_samples.append((view, sql[:SLOW_QUERY_SQL_LENGTH], seconds))
+
+    def render(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines = list()
+        with self.lock:
+            render_counter(
+                lines, 'http_requests_total', 'Total HTTP requests.', ('view', 'method', 'status'), self.requests,
+            )
+            render_histogram(
+                lines, 'http_request_duration_seconds', 'Latency of HTTP requests.', ('view', 'method'), self.latency,
+            )
+            render_histogram(lines, 'db_queries_per_request', 'SQL queries per HTTP request.', ('view',), self.queries)
+            render_counter(
+                lines, 'db_query_duration_seconds_total', 'Total time of SQL queries.', ('view',), self.query_seconds,
+            )
+            render_counter(lines, 'db_slow_queries_total', 'Total slow SQL queries.', ('view',), self.slow_queries)
+            lines.append('# HELP db_slow_query_sample_seconds Duration of the last slow SQL queries.')
+            lines.append('# TYPE db_slow_query_sample_seconds gauge')
+            for index, (view, sql, seconds) in enumerate(self.slow_query_samples):
+                labels = format_labels(('view', 'sql', 'sample'), (view, sql, str(index)))
+                lines.append(f'db_slow_query_sample_seconds{labels} {seconds}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def render_counter(
+    lines: list[str], name: str, description: str, label_names: tuple[str, ...], series: dict[tuple, Any],
+):
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} counter')
+    for labels, value in sorted(series.items()):
+        lines.append(f'{name}{format_labels(label_names, labels)} {value}')
+
+
+def render_histogram(lines: list[str], name: str, description: str, label_names: tuple[str, ...], histogram: Histogram):
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} histogram')
+    bucket_names = (*label_names, 'le')
+    for labels, (counts, count, total) in sorted(histogram.series.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{format_labels(bucket_names, (*labels, str(bound)))} {cumulative}')
+        lines.append(f'{name}_bucket{format_labels(bucket_names, (*labels, "+Inf"))} {count}')
+        lines.append(f'{name}_sum{format_labels(label_names, labels)} {total}')
+        lines.append(f'{name}_count{format_labels(label_names, labels)} {count}')
+
+
+registry = MetricsRegistry(slow_query_samples=getattr(settings, 'METRICS_SLOW_QUERY_SAMPLES', 50))
+
+
+class QueryRecorder:
+    """The execute wrapper of the database connections, counts the queries and their time without the SQL logging."""
+
+    def __init__(self, slow_query_seconds: float):
+        self.slow_query_seconds = slow_query_seconds
+        self.count = 0
+        self.seconds = 0.0
+        self.slow_queries: list[tuple[str, float]] = list()
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            seconds = time.perf_counter() - started
+            self.count += 1
+            self.seconds += seconds
+            if seconds >= self.slow_query_seconds:
+                self.slow_queries.append((sql, seconds))
+
+
+_recorder: contextvars.ContextVar[QueryRecorder | None] = contextvars.ContextVar('query_recorder', default=None)
+
+
+def record_query(execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    """
+    The execute wrapper of all database connections, records the query by the recorder of the current request.
+    The recorder is found by the context, so the queries of the async views, run by the connections of other threads,
+    are recorded too.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender: Any, connection: BaseDatabaseWrapper, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, the amount and the time of SQL queries of every request by the name of the resolved view.
+    Should be the first middleware, so the queries of the session and the user are recorded too.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+        self.slow_query_seconds = getattr(settings, 'METRICS_SLOW_QUERY_MS', 100) / 1000
+        # The connections of the worker threads of the async views are created later, they get the wrapper when opened.
+        connection_created.connect(install_query_recorder, dispatch_uid='metrics_install_query_recorder')
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # pyright: ignore[reportReturnType]
+        for connection in connections.all():
+            install_query_recorder(sender=None, connection=connection)
+        recorder = QueryRecorder(slow_query_seconds=self.slow_query_seconds)
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        recorder = QueryRecorder(slow_query_seconds=self.slow_query_seconds)
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)  # pyright: ignore[reportGeneralTypeIssues]
+        finally:
+            _recorder.reset(token)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    def record(self, request: HttpRequest, response: HttpResponse, recorder: QueryRecorder, seconds: float):
+        match = request.resolver_match
+        view = (match.view_name or match._func_path) if match is not None else UNRESOLVED_VIEW
+        registry.record_request(
+            view=view,
+            method=request.method or '',
+            status=response.status_code,
+            seconds=seconds,
+            queries=recorder.count,
+            query_seconds=recorder.seconds,
+        )
+        for sql, query_seconds in recorder.slow_queries:
+            registry.record_slow_query(view=view, sql=sql, seconds=query_seconds)
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """The metrics of the process for the Prometheus scraper, available only from the `METRICS_ALLOWED_IPS`."""
+    if request.META.get('REMOTE_ADDR') not in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1']):
+        raise Http404()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
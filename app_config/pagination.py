@@ -0,0 +1,285 @@
+import base64
+import binascii
+import json
+from typing import Any
+from typing import cast
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F
+from django.db.models import Max
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.db.models.lookups import IsNull
+from django.http import Http404
+from django.http import QueryDict
+from django.utils.functional import SimpleLazyObject
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    def __init__(self, object_list: list[Any], next_cursor: str | None, is_first: bool):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or not self.is_first
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset) paginator: the page is selected with `WHERE (field, pk) > (value, pk)` instead of `OFFSET`,
+    so every page costs the same as the first one when `(field, pk)` is covered by an index.
+    The ordering is `field` (or `-field`) with the primary key as a tiebreaker in the same direction.
+    The nullable field is preceded by its `field IS NULL` flag as in the `CompositeKeysetPaginator`, so the NULL values
+    are last in the ascending order and first in the descending one, which is its reverse: both directions are read
+    from one index `(field IS NULL, field, id)`.
+    """
+
+    def __init__(self, queryset: QuerySet, ordering: str, per_page: int):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.descending = ordering.startswith('-')
+        self.field_name = ordering.removeprefix('-')
+        opts = queryset.model._meta
+        self.field = opts.pk if self.field_name == 'pk' else opts.get_field(self.field_name)
+        self.attname = getattr(self.field, 'attname', self.field_name)
+
+    def get_ordering(self) -> tuple:
+        if self.field.primary_key:
+            return ('-pk',) if self.descending else ('pk',)
+        if self.descending:
+            ordering = (F(self.attname).desc(), '-pk')
+            return (IsNull(F(self.attname), True).desc(), *ordering) if self.field.null else ordering
+        ordering = (F(self.attname).asc(), 'pk')
+        return (IsNull(F(self.attname), True).asc(), *ordering) if self.field.null else ordering
+
+    def encode_cursor(self, obj: Any) -> str:
+        value = getattr(obj, self.attname)
+        if value is not None and not self.field.primary_key:
+            value = self.field.value_to_string(obj)
+        payload = json.dumps([self.ordering, value, obj.pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> tuple[Any, Any]:
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            ordering, value, pk = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if ordering != self.ordering:
+                raise InvalidCursor('The cursor was issued for the different ordering.')
+            pk = self.queryset.model._meta.pk.to_python(pk)
+            if value is not None:
+                value = self.field.target_field.to_python(value) if self.field.is_relation else self.field.to_python(value)
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError, ValidationError) as error:
+            raise InvalidCursor('The cursor is malformed.') from error
+        return value, pk
+
+    def get_keyset_filter(self, value: Any, pk: Any) -> Q:
+        gt, pk_gt = ('lt', 'pk__lt') if self.descending else ('gt', 'pk__gt')
+        if self.field.primary_key:
+            return Q(**{pk_gt: pk})
+        if value is None:
+            filters = Q(**{f'{self.attname}__isnull': True, pk_gt: pk})
+            # The values are after NULL in the descending order.
+            return filters | Q(**{f'{self.attname}__isnull': False}) if self.descending else filters
+        filters = Q(**{f'{self.attname}__{gt}': value}) | Q(**{self.attname: value, pk_gt: pk})
+        if self.field.null and not self.descending:
+            filters |= Q(**{f'{self.attname}__isnull': True})
+        return filters
+
+    def get_page_queryset(self, cursor: str | None) -> QuerySet:
+        queryset = self.queryset.order_by(*self.get_ordering())
+        if cursor:
+            value, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(self.get_keyset_filter(value, pk))
+            if value is None and not self.descending:
+                # Only the NULL values are after NULL, ordered by the primary key, which SQLite reads from the index
+                # of the filter without the sort of the remaining NULL values.
+                queryset = queryset.order_by('pk')
+        # One more object tells whether there is the next page.
+        return queryset[:self.per_page + 1]
+
+    def get_page(self, cursor: str | None) -> KeysetPage:
+        return self.build_page(list(self.get_page_queryset(cursor)), cursor)
+
+    async def aget_page(self, cursor: str | None) -> KeysetPage:
+        return self.build_page([obj async for obj in self.get_page_queryset(cursor)], cursor)
+
+    def build_page(self, object_list: list[Any], cursor: str | None) -> KeysetPage:
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[:self.per_page]
+            next_cursor = self.encode_cursor(object_list[-1])
+        return KeysetPage(object_list=object_list, next_cursor=next_cursor, is_first=not cursor)
+
+
+class CompositeKeysetPaginator(KeysetPaginator):
+    """
+    The keyset paginator over several fields `(field_1, ..., field_n, pk)`, all ascending with NULL values last.
+    The row comparison `(field_1, ..., pk) > (value_1, ..., pk)` is expanded to the `OR` of the equal prefixes,
+    so the page is the range scan of the index over the same fields.
+    The NULL values are ordered last by the `field IS NULL` flag before the nullable field instead of `NULLS LAST`,
+    which SQLite can't read from the index (it stores NULL first). The index has the same expressions, e.g.
+    `(section, status, priority, deadline IS NULL, deadline, id)`, so the page needs no sort on every database.
+    """
+
+    def __init__(self, queryset: QuerySet, orderings: tuple[str, ...], per_page: int):
+        self.queryset = queryset
+        self.ordering = ','.join(orderings)
+        self.per_page = per_page
+        self.fields = [queryset.model._meta.get_field(name) for name in orderings]
+
+    def get_ordering(self) -> tuple:
+        ordering = list()
+        for field in self.fields:
+            if field.null:
+                ordering.append(IsNull(F(field.attname), True).asc())
+            ordering.append(F(field.attname).asc())
+        return *ordering, 'pk'
+
+    def encode_cursor(self, obj: Any) -> str:
+        values = [
+            field.value_to_string(obj) if getattr(obj, field.attname) is not None else None
+            for field in self.fields
+        ]
+        payload = json.dumps([self.ordering, values, obj.pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> tuple[Any, Any]:
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            ordering, values, pk = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if ordering != self.ordering:
+                raise InvalidCursor('The cursor was issued for the different ordering.')
+            if len(values) != len(self.fields):
+                raise InvalidCursor('The cursor is malformed.')
+            pk = self.queryset.model._meta.pk.to_python(pk)
+            values = [
+                None if value is None else
+                field.target_field.to_python(value) if field.is_relation else field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError, ValidationError) as error:
+            raise InvalidCursor('The cursor is malformed.') from error
+        return values, pk
+
+    def get_keyset_filter(self, values: list[Any], pk: Any) -> Q:
+        # Built from the last field: `after(field) OR (field = value AND <the filter of the next fields>)`.
+        filters = Q(pk__gt=pk)
+        for field, value in reversed(list(zip(self.fields, values))):
+            if value is None:
+                # Nothing is after NULL except the NULL values with the greater next fields.
+                filters = Q(**{f'{field.attname}__isnull': True}) & filters
+                continue
+            after = Q(**{f'{field.attname}__gt': value})
+            if field.null:
+                after |= Q(**{f'{field.attname}__isnull': True})
+            filters = after | (Q(**{field.attname: value}) & filters)
+        return filters
+
+
+class KeysetPaginationMixin:
+    """Replaces the `page` based pagination of the `ListView` by the `KeysetPaginator`."""
+    paginate_by = 50
+    cursor_kwarg = 'cursor'
+    default_ordering = 'pk'
+
+    def get_keyset_ordering(self) -> str:
+        return self.default_ordering
+
+    def get_keyset_paginator(self, queryset: QuerySet, page_size: int) -> tuple[KeysetPaginator, str | None]:
+        """The paginator and the validated cursor of the request, raises `Http404` if the cursor is invalid."""
+        paginator = KeysetPaginator(queryset=queryset, ordering=self.get_keyset_ordering(), per_page=page_size)
+        cursor = self.request.GET.get(self.cursor_kwarg) or None  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            if cursor:
+                paginator.decode_cursor(cursor)
+        except InvalidCursor as error:
+            raise Http404(str(error)) from error
+        return paginator, cursor
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int):
+        paginator, cursor = self.get_keyset_paginator(queryset, page_size)
+        # The page is loaded on the first access, so the cached fragment of the list is served without the query.
+        # The keyset list is always paginated, the links are shown by `page_obj.is_first` and `next_page_query`.
+        page = cast(KeysetPage, SimpleLazyObject(lambda: paginator.get_page(cursor)))
+        return paginator, page, page, True
+
+    def get_cursor_query(self, cursor: str | None) -> str:
+        return build_cursor_query(
+            query=self.request.GET,  # pyright: ignore[reportAttributeAccessIssue]
+            cursor_kwarg=self.cursor_kwarg,
+            cursor=cursor,
+        )
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)  # pyright: ignore[reportAttributeAccessIssue]
+        page = context.get('page_obj')
+        if page is not None:
+            context['first_page_query'] = self.get_cursor_query(None)
+            context['next_page_query'] = lambda: self.get_cursor_query(page.next_cursor) if page.has_next() else None
+        return context
+
+
+# The unfiltered tables with more rows are counted by the estimate of the database instead of `COUNT(*)`.
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+def get_estimated_count(queryset: QuerySet) -> int | None:
+    """The estimated amount of rows of the table, from the statistics of PostgreSQL or the max rowid of SQLite."""
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        # The table which was never analyzed has -1.
+        return int(row[0]) if row is not None and row[0] >= 0 else None
+    if connection.vendor == 'sqlite':
+        # The max of the primary key is the index seek, the deleted rows make the estimate higher.
+        return queryset.model._base_manager.using(queryset.db).aggregate(max_pk=Max('pk'))['max_pk'] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    The paginator of the admin changelists of the large tables: the unfiltered list is counted by the estimate,
+    the filtered list (by the indexed filters) and the small table are counted exactly.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and self.is_unfiltered(queryset):
+            estimate = get_estimated_count(queryset)
+            if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+    def is_unfiltered(self, queryset: QuerySet) -> bool:
+        """Whether the list has no filters except the filter of the default manager (the `AliveManager`)."""
+        return queryset.query.where == queryset.model._default_manager.get_queryset().query.where
+
+
+def build_cursor_query(query: QueryDict, cursor_kwarg: str, cursor: str | None) -> str:
+    """Returns the url query string with the replaced (or removed when it is `None`) cursor."""
+    query = query.copy()
+    query.pop(cursor_kwarg, None)
+    if cursor:
+        query[cursor_kwarg] = cursor
+    return query.urlencode()
@@ -0,0 +1,128 @@
+import contextvars
+import random
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+
+# The cookie of the client which has written to the primary, its reads go to the primary until the cookie expires.
+PIN_COOKIE_NAME = 'primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaState:
+    """The routing state of the current request, mutated by the router and read by the middleware."""
+
+    def __init__(self, pinned: bool = False):
+        self.pinned = pinned
+        self.read_database: str | None = None
+        self.wrote = False
+
+
+_state: contextvars.ContextVar[ReplicaState | None] = contextvars.ContextVar('replica_state', default=None)
+
+
+def get_replicas() -> list[str]:
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def is_reading_from_replica() -> bool:
+    state = _state.get()
+    return state is not None and state.read_database is not None
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of the views with `read_from_replica = True` to a random replica of `DATABASE_REPLICAS`,
+    everything else (writes, reads of other views, management commands) goes to the primary `default` database.
+    """
+
+    def db_for_read(self, model, **hints) -> str | None:
+        state = _state.get()
+        if state is not None and state.read_database is not None:
+            return state.read_database
+        return None
+
+    def db_for_write(self, model, **hints) -> str:
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        # The replicas have the same data as the primary, so the objects loaded from any of them can be related.
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None, **hints) -> bool | None:
+        # The schema of the replicas is replicated from the primary.
+        if db in get_replicas():
+            return False
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Activates the replica for the safe requests of the views with `read_from_replica = True`,
+    unless the client is pinned.
+    The client is pinned to the primary for `DATABASE_REPLICA_PIN_SECONDS` after any write of its request,
+    so the users read their own writes while the replicas catch up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 10)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            # The async handler would run the sync `process_view` in a thread.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # pyright: ignore[reportReturnType]
+        state = ReplicaState(pinned=PIN_COOKIE_NAME in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin_client(state, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        state = ReplicaState(pinned=PIN_COOKIE_NAME in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)  # pyright: ignore[reportGeneralTypeIssues]
+        finally:
+            _state.reset(token)
+        return self.pin_client(state, response)
+
+    def pin_client(self, state: ReplicaState, response: HttpResponse) -> HttpResponse:
+        if state.wrote:
+            response.set_cookie(PIN_COOKIE_NAME, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict[str, Any]):
+        state = _state.get()
+        replicas = get_replicas()
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            state is not None and replicas and not state.pinned and request.method in SAFE_METHODS
+            and getattr(view_class, 'read_from_replica', False)
+        ):
+            state.read_database = random.choice(replicas)
+        return None
+
+    async def aprocess_view(self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict[str, Any]):  # noqa E501
+        return ReplicaMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
@@ -6,27 +6,20 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 # Custom parameter used in the RegisterView - the url when user is redirected after success registration.
 REGISTER_REDIRECT_URL = '/'
-# Required for debugging the SQL queries.
-INTERNAL_IPS = [
-    'localhost',
+# The user of the logged in request is read from the shared cache (`SHARED_CACHE`) by the `CachedModelBackend`,
+# the password and the flags are always read from the database. The deployment with the shared cache serves
+# the sessions from it as well with `SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'`.
+SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.CachedModelBackend',
 ]
-# Required for debugging the SQL queries.
-LOGGING = {
-    'version': 1,
-    'disable_existing_loggers': False,
-    'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
-        },
-    },
-    'loggers': {
-        'django.db.backends': {
-            'level': 'DEBUG',  # The DEBUG level show all queries.
-            'handlers': ['console'],
-        }
-    }
-}
-
+# The per-view latency, SQL query count and query time are exposed at `/metrics` by the `MetricsMiddleware`.
+# The queries slower than `METRICS_SLOW_QUERY_MS` are counted and the last `METRICS_SLOW_QUERY_SAMPLES` are kept.
+METRICS_ALLOWED_IPS = [
+    '127.0.0.1',
+]
+METRICS_SLOW_QUERY_MS = 100
+METRICS_SLOW_QUERY_SAMPLES = 50
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -54,7 +47,7 @@ INSTALLED_APPS = [
     'projects.apps.ProjectsConfig',
     'authentication.apps.AuthenticationConfig',
     'app.apps.AppConfig',
-    'debug_toolbar',  # Required for debugging the SQL queries.
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -64,12 +57,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'debug_toolbar.middleware.DebugToolbarMiddleware',  # Required for debugging the SQL queries.
+    'app_config.metrics.MetricsMiddleware',
+    'app_config.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'tasks.activity.ActivityActorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -93,6 +88,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'app_config.wsgi.application'
 
+# The async list and detail views of projects, sections and tasks, enable them when the project is served
+# by an ASGI server (`app_config.asgi.application`). Under WSGI every async view would run its own event loop.
+ASYNC_READ_VIEWS = False
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -104,6 +103,55 @@ DATABASES = {
     }
 }
 
+# The reads of the list and detail views go to a random replica of `DATABASE_REPLICAS`, the writes go to `default`.
+# The client is pinned to the primary for `DATABASE_REPLICA_PIN_SECONDS` after its own write.
+# For the local testing add the SQLite replica and copy the primary into it with `python manage.py sync_replicas`:
+# DATABASES['replica'] = {
+#     'ENGINE': 'django.db.backends.sqlite3',
+#     'NAME': BASE_DIR / 'db.replica.sqlite3',
+#     'TEST': {'MIRROR': 'default'},
+# }
+# DATABASE_REPLICAS = ['replica']
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_PIN_SECONDS = 10
+DATABASE_ROUTERS = [
+    'app_config.replicas.ReplicaRouter',
+]
+
+# The pub/sub of the live task events of sections. The in-process broker delivers the events to the streams
+# of the same process only, the deployment with several processes needs the shared broker:
+# EVENT_BROKER = {
+#     'BACKEND': 'app_config.broker.RedisBroker',
+#     'OPTIONS': {'url': 'redis://localhost:6379/0'},
+# }
+EVENT_BROKER = {
+    'BACKEND': 'app_config.broker.InProcessBroker',
+    'OPTIONS': {},
+}
+
+# The cache of the project access, members, fragments and (with the `cached_db` sessions) of the session users.
+# They are invalidated by the process of the write, so they are cached only when `SHARED_CACHE` is set, the local
+# memory cache of one process would keep serving the revoked access in the other processes. The deployment with
+# several processes sets the shared backend, the `app_config.E001` check refuses `SHARED_CACHE` with a local one:
+# CACHES = {
+#     'default': {
+#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#         'LOCATION': 'redis://localhost:6379/1',
+#     },
+# }
+# SHARED_CACHE = True
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+SHARED_CACHE = False
+
+# The deadline reminders of the `send_deadline_reminders` worker are written to the console locally,
+# the deployment sets the SMTP backend (`django.core.mail.backends.smtp.EmailBackend`) and its `EMAIL_HOST`.
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'reminders@localhost'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
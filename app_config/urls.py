@@ -1,18 +1,22 @@
-from django.conf import settings
 from django.contrib import admin
 from django.urls import include
 from django.urls import path
 
+from app_config.metrics import metrics_view
+from tasks.views import MyTasksColumnView
+from tasks.views import MyTasksView
+from tasks.views import TaskSearchView
+
 
 urlpatterns = [
     path(route='', view=include('app.urls')),
     path(route='projects/', view=include('projects.urls')),
     path(route='accounts/', view=include('authentication.urls')),
+    path(route='my-tasks/', view=MyTasksView.as_view(), name='my_tasks'),
+    path(route='my-tasks/<str:status>/', view=MyTasksColumnView.as_view(), name='my_tasks_column'),
+    path(route='search/', view=TaskSearchView.as_view(), name='task_search'),
+    path(route='api/v1/', view=include('api.urls')),
     path(route='admin/', view=admin.site.urls),
+    path(route='metrics', view=metrics_view, name='metrics'),
 ]
 
-
-# Required for debugging the SQL queries.
-if getattr(settings, 'DEBUG', False):
-    import debug_toolbar
-    urlpatterns.insert(0, path(route='__debug__/', view=include(debug_toolbar.urls)))
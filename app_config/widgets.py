@@ -18,3 +18,35 @@ class ClientTimezoneOffsetWidget(forms.HiddenInput):
         if attrs:
             default_attr.update(attrs)
         super().__init__(default_attr)
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    The select which renders only the empty and the selected options, the other choices are searched by the script
+    at the `url` which responds `{"results": [{"id": ..., "text": ...}], "pagination": {"more": ...}}`.
+    """
+    class Media:
+        js = (
+            f'{get_static_url()}js/autocompleteSelect.js',
+        )
+
+    def __init__(self, url: str = '', attrs=None, choices=()):
+        default_attr = {'class': 'autocompleteSelect'}
+        if attrs:
+            default_attr.update(attrs)
+        super().__init__(default_attr, choices)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = self.url
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        # The choices can be all members of the project, only the selected one is rendered.
+        choices, selected = self.choices, {str(v) for v in value}
+        self.choices = [(key, label) for key, label in choices if key == '' or str(key) in selected]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
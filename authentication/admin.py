@@ -1,8 +1,21 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from app_config.pagination import EstimatedCountPaginator
 from authentication.models import User
 
 
+class UserAdmin(BaseUserAdmin):
+    # The users are searched by the autocompletes of the task and project admins. The case-insensitive prefix of
+    # the username or the email is the range scan of their prefix indexes (`0002_user_search_prefix_indexes`) instead of
+    # `LIKE '%term%'` over four columns, the first and the last name are not searched.
+    search_fields = ('username__istartswith', 'email__istartswith')
+    # The `groups` filter joins the groups of every user.
+    list_filter = ('is_staff', 'is_superuser', 'is_active')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 admin.site.register((
     User,
-))
+), UserAdmin)
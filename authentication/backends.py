@@ -0,0 +1,78 @@
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from app_config.caches import is_cache_shared
+from authentication.cache import USER_CACHE_TIMEOUT
+from authentication.cache import get_user_cache_key
+from authentication.models import User
+from projects.access import GENERATION_CACHE_KEY
+from projects.access import USER_ATTRIBUTE
+from projects.access import get_generation
+from projects.access import get_project_access
+
+
+# The fields of the session check (`get_session_auth_hash`) and of the permissions, read fresh on every request.
+# The password hash is never cached.
+FRESH_USER_FIELDS = ('password', 'is_active', 'is_staff', 'is_superuser')
+
+
+def get_cached_user_fields() -> list[str]:
+    return [field.attname for field in User._meta.concrete_fields if field.attname not in FRESH_USER_FIELDS]
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    The `ModelBackend` which loads the user of the session from the shared cache together with the project access
+    summary. Only the password and the flags are read, by one query of the primary key, so the session of the changed
+    password or the deactivated user is rejected by every process. The entry is valid for the generation of the access
+    table, it is dropped when the user is saved or deleted and when the project access of the user changes.
+    Without the shared cache (`is_cache_shared`) the user is loaded by the `ModelBackend`.
+    """
+
+    def get_cached_entry(self, user_id: int, values: dict[str, Any]) -> dict[str, Any] | None:
+        entry = values.get(get_user_cache_key(user_id))
+        if entry is None or entry['generation'] != values.get(GENERATION_CACHE_KEY):
+            return None
+        return entry
+
+    def build_user(self, entry: dict[str, Any], fresh: dict[str, Any] | None) -> Any:
+        if fresh is None:
+            return None
+        user = User(**entry['fields'], **fresh)
+        user._state.adding = False
+        user._state.db = DEFAULT_DB_ALIAS
+        if not self.user_can_authenticate(user):
+            return None
+        # The permission checks of the request read the access memorized in the user object.
+        setattr(user, USER_ATTRIBUTE, entry['access'])
+        return user
+
+    def get_user(self, user_id: int) -> Any:
+        if not is_cache_shared():
+            return super().get_user(user_id)
+        entry = self.get_cached_entry(user_id, cache.get_many([get_user_cache_key(user_id), GENERATION_CACHE_KEY]))
+        if entry is not None:
+            fresh = User._default_manager.using(DEFAULT_DB_ALIAS).filter(pk=user_id).values(*FRESH_USER_FIELDS).first()
+            return self.build_user(entry, fresh)
+        user = super().get_user(user_id)
+        if user is not None:
+            entry = {
+                'fields': {attname: getattr(user, attname) for attname in get_cached_user_fields()},
+                'generation': get_generation(),
+                'access': get_project_access(user),
+            }
+            cache.set(get_user_cache_key(user_id), entry, timeout=USER_CACHE_TIMEOUT)
+        return user
+
+    async def aget_user(self, user_id: int) -> Any:
+        if is_cache_shared():
+            values = await cache.aget_many([get_user_cache_key(user_id), GENERATION_CACHE_KEY])
+            entry = self.get_cached_entry(user_id, values)
+            if entry is not None:
+                users = User._default_manager.using(DEFAULT_DB_ALIAS).filter(pk=user_id)
+                return self.build_user(entry, await users.values(*FRESH_USER_FIELDS).afirst())
+        return await sync_to_async(self.get_user)(user_id)
@@ -0,0 +1,21 @@
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+# The user of the session is cached with the project access summary by the `CachedModelBackend`,
+# so the entry expires with the cached access (`projects.access.CACHE_TIMEOUT`).
+USER_CACHE_TIMEOUT = 5 * 60
+
+
+def get_user_cache_key(user_id: int) -> str:
+    return f'auth_user:{user_id}'
+
+
+def invalidate_cached_users(user_ids: Iterable[int]):
+    """Drops the cached users after the commit of the current transaction."""
+    keys = [get_user_cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if not keys:
+        return
+    transaction.on_commit(lambda: cache.delete_many(keys))
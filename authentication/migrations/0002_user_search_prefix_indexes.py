@@ -0,0 +1,52 @@
+from django.db import migrations
+
+
+# The prefix search of the admin (`username__istartswith`, `email__istartswith`) is case-insensitive on both databases.
+# SQLite compares `LIKE 'term%'` case-insensitively (ASCII only), so it reads only the index of the NOCASE collation.
+# PostgreSQL compares `UPPER(field::text) LIKE UPPER('term%')`, so it reads the index of the same expression
+# with the pattern operator class.
+STATEMENTS = {
+    'sqlite': (
+        (
+            'CREATE INDEX authentication_user_username_prefix_idx ON authentication_user (username COLLATE NOCASE)',
+            'CREATE INDEX authentication_user_email_prefix_idx ON authentication_user (email COLLATE NOCASE)',
+        ),
+        (
+            'DROP INDEX IF EXISTS authentication_user_username_prefix_idx',
+            'DROP INDEX IF EXISTS authentication_user_email_prefix_idx',
+        ),
+    ),
+    'postgresql': (
+        (
+            'CREATE INDEX authentication_user_username_prefix_idx ON authentication_user (UPPER(username::text) text_pattern_ops)',  # noqa E501
+            'CREATE INDEX authentication_user_email_prefix_idx ON authentication_user (UPPER(email::text) text_pattern_ops)',  # noqa E501
+        ),
+        (
+            'DROP INDEX IF EXISTS authentication_user_username_prefix_idx',
+            'DROP INDEX IF EXISTS authentication_user_email_prefix_idx',
+        ),
+    ),
+}
+
+
+def create_prefix_index(apps, schema_editor):
+    forward, _ = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in forward:
+        schema_editor.execute(statement)
+
+
+def drop_prefix_index(apps, schema_editor):
+    _, backward = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in backward:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
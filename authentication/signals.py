@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from authentication.cache import invalidate_cached_users
+from authentication.models import User
+
+
+@receiver(signal=post_save, sender=User)
+@receiver(signal=post_delete, sender=User)
+def invalidate_cached_user(sender: type[User], instance: User, **kwargs):
+    # The password, the superuser flag and the last login are a part of the cached user.
+    invalidate_cached_users((instance.pk,))
@@ -0,0 +1,220 @@
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+from django.http import Http404
+
+from app_config.caches import is_cache_shared
+from authentication.cache import get_user_cache_key
+from projects.models import Project
+from projects.models import ProjectAccess
+from projects.models import ProjectRole
+
+
+# The generation is the part of every cache key, so the full rebuild of the access table invalidates all users at once.
+# The default value is a timestamp, so the evicted generation never brings back the keys of the previous one.
+GENERATION_CACHE_KEY = 'project_access:generation'
+# The access is cached only in the shared cache (`is_cache_shared`), where the revocation reaches every process.
+# The timeout bounds the stale entry stored by the concurrent load which raced with the revocation.
+CACHE_TIMEOUT = 5 * 60
+# The attribute of the user object where the access is memorized for the lifetime of the request.
+USER_ATTRIBUTE = '_project_access'
+BATCH_SIZE = 1000
+
+
+def get_generation() -> int:
+    return cache.get_or_set(GENERATION_CACHE_KEY, time.time_ns, timeout=None)
+
+
+async def aget_generation() -> int:
+    return await cache.aget_or_set(GENERATION_CACHE_KEY, time.time_ns, timeout=None)
+
+
+def get_cache_key(user_id: int) -> str:
+    return f'project_access:{get_generation()}:{user_id}'
+
+
+async def aget_cache_key(user_id: int) -> str:
+    return f'project_access:{await aget_generation()}:{user_id}'
+
+
+def load_project_access(user_id: int) -> dict[str, frozenset[int]]:
+    access = {role: set() for role in ProjectRole.values}
+    # The access is cached until the next change, so it is read from the primary, never from a lagging replica.
+    accesses = ProjectAccess.objects.using(DEFAULT_DB_ALIAS).filter(user=user_id)
+    for project_id, role in accesses.values_list('project_id', 'role'):
+        access[role].add(project_id)
+    return {role: frozenset(project_ids) for role, project_ids in access.items()}
+
+
+async def aload_project_access(user_id: int) -> dict[str, frozenset[int]]:
+    access = {role: set() for role in ProjectRole.values}
+    accesses = ProjectAccess.objects.using(DEFAULT_DB_ALIAS).filter(user=user_id)
+    async for project_id, role in accesses.values_list('project_id', 'role'):
+        access[role].add(project_id)
+    return {role: frozenset(project_ids) for role, project_ids in access.items()}
+
+
+def get_project_access(user: Any) -> dict[str, frozenset[int]]:
+    """The ids of projects of the user by the role, from the request memo, the shared cache or the access table."""
+    access = getattr(user, USER_ATTRIBUTE, None)
+    if access is not None:
+        return access
+    if not is_cache_shared():
+        access = load_project_access(user.pk)
+    else:
+        key = get_cache_key(user.pk)
+        access = cache.get(key)
+        if access is None:
+            access = load_project_access(user.pk)
+            cache.set(key, access, timeout=CACHE_TIMEOUT)
+    setattr(user, USER_ATTRIBUTE, access)
+    return access
+
+
+async def aget_project_access(user: Any) -> dict[str, frozenset[int]]:
+    """
+    The async `get_project_access` of the async views. The access is memorized in the user object as well,
+    so the permission checks of the request (`check_project_access`, `get_*_project_ids`) are done without queries.
+    """
+    access = getattr(user, USER_ATTRIBUTE, None)
+    if access is not None:
+        return access
+    if not is_cache_shared():
+        access = await aload_project_access(user.pk)
+    else:
+        key = await aget_cache_key(user.pk)
+        access = await cache.aget(key)
+        if access is None:
+            access = await aload_project_access(user.pk)
+            await cache.aset(key, access, timeout=CACHE_TIMEOUT)
+    setattr(user, USER_ATTRIBUTE, access)
+    return access
+
+
+def forget_project_access(user: Any):
+    """Drops the access memorized in the user object, after the write of the request which changed the access."""
+    if hasattr(user, USER_ATTRIBUTE):
+        delattr(user, USER_ATTRIBUTE)
+
+
+def get_accessible_project_ids(user: Any) -> frozenset[int]:
+    """The ids of projects where the user is an owner or a member."""
+    access = get_project_access(user)
+    return access[ProjectRole.OWNER] | access[ProjectRole.MEMBER]
+
+
+def get_owned_project_ids(user: Any) -> frozenset[int]:
+    return get_project_access(user)[ProjectRole.OWNER]
+
+
+def get_member_project_ids(user: Any) -> frozenset[int]:
+    return get_project_access(user)[ProjectRole.MEMBER]
+
+
+def get_members_cache_key(project_id: int) -> str:
+    return f'project_members:{get_generation()}:{project_id}'
+
+
+def get_project_members(project_id: int) -> dict[int, str]:
+    """The usernames of the owner and the members of the project by their ids ordered by the username."""
+    accesses = ProjectAccess.objects.using(DEFAULT_DB_ALIAS).filter(project=project_id).order_by('user__username')
+    if not is_cache_shared():
+        return dict(accesses.values_list('user_id', 'user__username'))
+    key = get_members_cache_key(project_id)
+    members = cache.get(key)
+    if members is None:
+        members = dict(accesses.values_list('user_id', 'user__username'))
+        cache.set(key, members, timeout=CACHE_TIMEOUT)
+    return members
+
+
+def invalidate_project_members(project_ids: Iterable[int]):
+    """Drops the cached members of the projects after the commit of the current transaction."""
+    project_ids = set(project_ids)
+    if not project_ids:
+        return
+    transaction.on_commit(lambda: cache.delete_many([get_members_cache_key(project_id) for project_id in project_ids]))
+
+
+def invalidate_project_access(user_ids: Iterable[int]):
+    """Drops the cached access and the cached users after the commit of the current transaction."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    transaction.on_commit(lambda: cache.delete_many(
+        [get_cache_key(user_id) for user_id in user_ids] + [get_user_cache_key(user_id) for user_id in user_ids],
+    ))
+
+
+def grant_project_access(project_id: int, user_ids: Iterable[int], role: str):
+    user_ids = set(user_ids)
+    accesses = [ProjectAccess(user_id=user_id, project_id=project_id, role=role) for user_id in user_ids]
+    ProjectAccess.objects.bulk_create(accesses, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    invalidate_project_access(user_ids)
+    invalidate_project_members((project_id,))
+
+
+def revoke_project_access(project_id: int, user_ids: Iterable[int] | None, role: str):
+    """Revokes the role of the users in the project, of all users when `user_ids` is `None`."""
+    accesses = ProjectAccess.objects.filter(project=project_id, role=role)
+    if user_ids is not None:
+        accesses = accesses.filter(user__in=set(user_ids))
+    revoked_user_ids = list(accesses.values_list('user_id', flat=True))
+    if revoked_user_ids:
+        ProjectAccess.objects.filter(project=project_id, role=role, user__in=revoked_user_ids).delete()
+        invalidate_project_access(revoked_user_ids)
+        invalidate_project_members((project_id,))
+
+
+def rebuild_project_access() -> int:
+    """Rebuilds the whole access table from the `Project.owner` and `Project.members`, returns the amount of rows."""
+    with transaction.atomic():
+        ProjectAccess.objects.all().delete()
+        owners = Project.objects.values_list('pk', 'owner_id').iterator(chunk_size=BATCH_SIZE)
+        # The deleted projects (not purged yet) have no access, the owners are read by the default manager without them.
+        members = Project.members.through.objects.filter(project__deleted_at__isnull=True)
+        members = members.values_list('project_id', 'user_id').iterator(chunk_size=BATCH_SIZE)
+        amount = 0
+        for role, rows in ((ProjectRole.OWNER, owners), (ProjectRole.MEMBER, members)):
+            batch = list()
+            for project_id, user_id in rows:
+                batch.append(ProjectAccess(user_id=user_id, project_id=project_id, role=role))
+                if len(batch) >= BATCH_SIZE:
+                    amount += len(ProjectAccess.objects.bulk_create(batch))
+                    batch = list()
+            amount += len(ProjectAccess.objects.bulk_create(batch))
+        transaction.on_commit(lambda: cache.set(GENERATION_CACHE_KEY, time.time_ns(), timeout=None))
+    return amount
+
+
+def check_project_access(user: Any, project_pk: int, owner_only: bool = False) -> bool:
+    if user.is_superuser:
+        return True
+    project_ids = get_owned_project_ids(user) if owner_only else get_accessible_project_ids(user)
+    return project_pk in project_ids
+
+
+def get_scoped_project(user: Any, project_pk: int, owner_only: bool = False, fields: tuple[str, ...] = ('id', 'title')) -> Project:
+    """
+    Loads the project of the nested views (sections, tasks) with the only required fields in one query.
+    The access is checked by the cached project ids before the query, raises `Http404` if user has no access.
+    """
+    if check_project_access(user=user, project_pk=project_pk, owner_only=owner_only):
+        project = Project.objects.only(*fields).filter(pk=project_pk).first()
+        if project is not None:
+            return project
+    raise Http404(f'No {Project._meta.object_name} matches the given query.')
+
+
+async def aget_scoped_project(user: Any, project_pk: int, owner_only: bool = False, fields: tuple[str, ...] = ('id', 'title')) -> Project:
+    """The async `get_scoped_project`, the access of the user is loaded by `aget_project_access`."""
+    await aget_project_access(user)
+    if check_project_access(user=user, project_pk=project_pk, owner_only=owner_only):
+        project = await Project.objects.only(*fields).filter(pk=project_pk).afirst()
+        if project is not None:
+            return project
+    raise Http404(f'No {Project._meta.object_name} matches the given query.')
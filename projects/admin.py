@@ -1,8 +1,21 @@
 from django.contrib import admin
 
+from app_config.pagination import EstimatedCountPaginator
 from projects.models import Project
 
 
+class ProjectAdmin(admin.ModelAdmin):
+    list_display = ('id', 'title', 'owner', 'tasks_to_do', 'tasks_in_progress', 'tasks_done')
+    list_select_related = ('owner',)
+    # The projects are searched by the autocomplete of the section admin, the prefix of the title is the range scan
+    # of its prefix index (`0005_title_prefix_index`).
+    search_fields = ('title__istartswith',)
+    autocomplete_fields = ('owner', 'members')
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 admin.site.register((
     Project,
-))
+), ProjectAdmin)
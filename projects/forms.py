@@ -1,19 +1,72 @@
 from django import forms
+from django.core.exceptions import ValidationError
 
+from authentication.models import User
+from projects.membership import MAX_INVITE_USERNAMES
+from projects.membership import get_members_queryset
+from projects.membership import parse_usernames
+from projects.membership import resolve_usernames
 from projects.models import Project
 
 
+class UsernamesField(forms.CharField):
+    """The usernames separated by the whitespaces or commas, cleaned to the ids of the users by their usernames."""
+    widget = forms.Textarea(attrs={'rows': '4'})
+    # The amount of the unknown usernames shown in the error.
+    max_unknown_shown = 20
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('help_text', 'Usernames separated by spaces, commas or new lines.')
+        super().__init__(**kwargs)
+
+    def clean(self, value: str) -> dict[str, int]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        usernames = parse_usernames(super().clean(value))
+        if len(usernames) > MAX_INVITE_USERNAMES:
+            raise ValidationError(f'At most {MAX_INVITE_USERNAMES} users can be invited at once.')
+        user_ids, unknown = resolve_usernames(usernames)
+        if unknown:
+            shown = ', '.join(unknown[:self.max_unknown_shown])
+            more = f' and {len(unknown) - self.max_unknown_shown} more' if len(unknown) > self.max_unknown_shown else ''
+            raise ValidationError(f'Unknown users: {shown}{more}.')
+        return user_ids
+
+
 class ProjectCreateForm(forms.ModelForm):
+    # The members are invited by the usernames instead of the choice of every user.
+    usernames = UsernamesField(
+        required=False,
+        label='Members',
+    )
+
     class Meta:
         model = Project
         fields = (
             'title',
-            'members',
         )
-        widgets = {
-            'members': forms.CheckboxSelectMultiple,
-        }
 
 
-class ProjectUpdateForm(ProjectCreateForm):
-    pass
+class ProjectUpdateForm(forms.ModelForm):
+    """The members are managed by the member views, so the update doesn't rewrite the whole members set."""
+    class Meta:
+        model = Project
+        fields = (
+            'title',
+        )
+
+
+class ProjectMemberInviteForm(forms.Form):
+    usernames = UsernamesField(
+        label='Invite',
+    )
+
+
+class ProjectMemberRemoveForm(forms.Form):
+    # Not rendered, the checkboxes of the members are rendered only for the page of the member list.
+    members = forms.ModelMultipleChoiceField(
+        queryset=User.objects.none(),
+    )
+
+    def __init__(self, *args, project_id: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only the chosen members are loaded by the validation.
+        self.fields['members'].queryset = get_members_queryset(project_id)  # pyright: ignore[reportAttributeAccessIssue]
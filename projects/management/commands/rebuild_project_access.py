@@ -0,0 +1,11 @@
+from django.core.management import BaseCommand
+
+from projects.access import rebuild_project_access
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the project access table from the owners and members of projects.'
+
+    def handle(self, *args, **options):
+        amount = rebuild_project_access()
+        self.stdout.write(f'The project access table is rebuilt: {amount} rows.')
@@ -0,0 +1,54 @@
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from authentication.models import User
+from projects.access import BATCH_SIZE
+from projects.models import Project
+
+
+# The usernames of one invite are separated by the whitespaces or commas.
+USERNAME_SEPARATOR = re.compile(r'[\s,]+')
+# The invite is validated and added in one request, so its size is limited.
+MAX_INVITE_USERNAMES = 5000
+
+
+def parse_usernames(text: str) -> list[str]:
+    """The unique usernames of the text in the original order."""
+    return list(dict.fromkeys(username for username in USERNAME_SEPARATOR.split(text) if username))
+
+
+def resolve_usernames(usernames: list[str]) -> tuple[dict[str, int], list[str]]:
+    """The ids of the existing users by their usernames and the unknown usernames, loaded by the batches."""
+    user_ids = dict()
+    for start in range(0, len(usernames), BATCH_SIZE):
+        batch = usernames[start:start + BATCH_SIZE]
+        user_ids.update(User.objects.filter(username__in=batch).values_list('username', 'pk'))
+    return user_ids, [username for username in usernames if username not in user_ids]
+
+
+def get_members_queryset(project_id: int) -> QuerySet[User]:
+    """The members of the project, paginated by the keyset over the unique `username`."""
+    return User.objects.filter(member_of_projects=project_id).only('id', 'username')
+
+
+def add_project_members(project: Project, user_ids: Iterable[Any]):
+    """
+    Adds the users to the members of the project. Only the missing rows of the through table are inserted
+    and only the new members are granted the access, the other members are not loaded.
+    """
+    user_ids = list(set(user_ids))
+    with transaction.atomic():
+        for start in range(0, len(user_ids), BATCH_SIZE):
+            project.members.add(*user_ids[start:start + BATCH_SIZE])
+
+
+def remove_project_members(project: Project, user_ids: Iterable[Any]):
+    """Removes the users from the members of the project, only their rows of the through table are deleted."""
+    user_ids = list(set(user_ids))
+    with transaction.atomic():
+        for start in range(0, len(user_ids), BATCH_SIZE):
+            project.members.remove(*user_ids[start:start + BATCH_SIZE])
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_project_access(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectAccess = apps.get_model('projects', 'ProjectAccess')
+    accesses = [
+        ProjectAccess(user_id=owner_id, project_id=project_id, role='OWNER')
+        for project_id, owner_id in Project.objects.values_list('pk', 'owner_id').iterator()
+    ]
+    accesses.extend(
+        ProjectAccess(user_id=user_id, project_id=project_id, role='MEMBER')
+        for project_id, user_id in Project.members.through.objects.values_list('project_id', 'user_id').iterator()
+    )
+    ProjectAccess.objects.bulk_create(accesses, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('OWNER', 'Owner'), ('MEMBER', 'Member')], verbose_name='Role')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='accesses', to='projects.project', verbose_name='Project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_accesses', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'project', 'role'), name='project_access_unique_user_project_role')],
+            },
+        ),
+        migrations.RunPython(code=fill_project_access, reverse_code=migrations.RunPython.noop),
+    ]
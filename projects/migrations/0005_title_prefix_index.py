@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+# The prefix search of the admin (`title__istartswith`) is case-insensitive on both databases.
+# SQLite compares `LIKE 'term%'` case-insensitively (ASCII only), so it reads only the index of the NOCASE collation.
+# PostgreSQL compares `UPPER(field::text) LIKE UPPER('term%')`, so it reads the index of the same expression
+# with the pattern operator class.
+STATEMENTS = {
+    'sqlite': (
+        (
+            'CREATE INDEX projects_project_title_prefix_idx ON projects_project (title COLLATE NOCASE)',
+        ),
+        (
+            'DROP INDEX IF EXISTS projects_project_title_prefix_idx',
+        ),
+    ),
+    'postgresql': (
+        (
+            'CREATE INDEX projects_project_title_prefix_idx ON projects_project (UPPER(title::text) text_pattern_ops)',
+        ),
+        (
+            'DROP INDEX IF EXISTS projects_project_title_prefix_idx',
+        ),
+    ),
+}
+
+
+def create_prefix_index(apps, schema_editor):
+    forward, _ = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in forward:
+        schema_editor.execute(statement)
+
+
+def drop_prefix_index(apps, schema_editor):
+    _, backward = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in backward:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_soft_delete'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
@@ -3,7 +3,36 @@ from django.db import models
 from authentication.models import User
 
 
-class Project(models.Model):
+class TaskCounters(models.Model):
+    """Denormalized counters of tasks, maintained incrementally by the `tasks.counters` module."""
+    tasks_to_do = models.IntegerField(default=0, editable=False, verbose_name='Tasks to do')
+    tasks_in_progress = models.IntegerField(default=0, editable=False, verbose_name='Tasks in progress')
+    tasks_done = models.IntegerField(default=0, editable=False, verbose_name='Tasks done')
+    tasks_urgent = models.IntegerField(default=0, editable=False, verbose_name='Urgent tasks')
+    tasks_high = models.IntegerField(default=0, editable=False, verbose_name='High priority tasks')
+    tasks_medium = models.IntegerField(default=0, editable=False, verbose_name='Medium priority tasks')
+    tasks_low = models.IntegerField(default=0, editable=False, verbose_name='Low priority tasks')
+    tasks_overdue = models.IntegerField(default=0, editable=False, verbose_name='Overdue tasks')
+
+    class Meta:
+        abstract = True
+
+    @property
+    def tasks_total(self) -> int:
+        return self.tasks_to_do + self.tasks_in_progress + self.tasks_done
+
+
+class AliveManager(models.Manager):
+    """
+    The default manager without the soft-deleted rows. The deleted project or section is hidden at once
+    and its rows are removed in the background by the `purge_deleted` worker, `all_objects` includes them.
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class Project(TaskCounters):
     title = models.CharField(
         blank=False,
         null=False,
@@ -23,6 +52,67 @@ class Project(models.Model):
         related_name='member_of_projects',
         verbose_name='Members',
     )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Deleted at',
+    )
+
+    objects = AliveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = (
+            # The deleted projects waiting for the purge, oldest first.
+            models.Index(
+                fields=('deleted_at', 'id'),
+                condition=models.Q(deleted_at__isnull=False),
+                name='project_deleted_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title
+
+
+class ProjectRole(models.TextChoices):
+    OWNER = 'OWNER', 'Owner'
+    MEMBER = 'MEMBER', 'Member'
+
+
+class ProjectAccess(models.Model):
+    """
+    Materialized `(user, project, role)` access table, kept in sync with `Project.owner` and `Project.members`
+    by the signals of the `projects.signals` module. Used for the permission checks instead of the `members` join.
+    """
+    user = models.ForeignKey(
+        blank=False,
+        null=False,
+        to=User,
+        on_delete=models.CASCADE,
+        related_name='project_accesses',
+        verbose_name='User',
+    )
+    project = models.ForeignKey(
+        blank=False,
+        null=False,
+        to=Project,
+        on_delete=models.CASCADE,
+        related_name='accesses',
+        verbose_name='Project',
+    )
+    role = models.CharField(
+        blank=False,
+        null=False,
+        choices=ProjectRole.choices,
+        verbose_name='Role',
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=('user', 'project', 'role'), name='project_access_unique_user_project_role'),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.user_id} - {self.project_id} - {self.role}'
@@ -0,0 +1,89 @@
+from typing import Any
+
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from app_config.fragments import bump_fragment_versions
+from authentication.models import User
+from projects.access import grant_project_access
+from projects.access import invalidate_project_access
+from projects.access import invalidate_project_members
+from projects.access import revoke_project_access
+from projects.models import Project
+from projects.models import ProjectAccess
+from projects.models import ProjectRole
+
+
+@receiver(signal=post_save, sender=Project)
+def sync_project_owner_access(sender: type[Project], instance: Project, created: bool, **kwargs):
+    if not created:
+        owner_ids = ProjectAccess.objects.filter(project=instance, role=ProjectRole.OWNER).values_list('user_id', flat=True)
+        if list(owner_ids) == [instance.owner_id]:
+            return
+        revoke_project_access(project_id=instance.pk, user_ids=None, role=ProjectRole.OWNER)
+    grant_project_access(project_id=instance.pk, user_ids=(instance.owner_id,), role=ProjectRole.OWNER)
+
+
+@receiver(signal=pre_delete, sender=Project)
+def invalidate_deleted_project_access(sender: type[Project], instance: Project, **kwargs):
+    # The access rows are removed by the cascade, only the cache of the users must be dropped.
+    invalidate_project_access(ProjectAccess.objects.filter(project=instance).values_list('user_id', flat=True))
+
+
+@receiver(signal=post_save, sender=User)
+def invalidate_renamed_member(sender: type[User], instance: User, created: bool, update_fields: frozenset[str] | None, **kwargs):  # noqa E501
+    # The cached members of the projects are the usernames, the other fields of the user (the last login) don't matter.
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    invalidate_project_members(ProjectAccess.objects.filter(user=instance).values_list('project_id', flat=True))
+
+
+@receiver(signal=pre_delete, sender=User)
+def invalidate_deleted_member(sender: type[User], instance: User, **kwargs):
+    # The access rows are removed by the cascade, only the cached members of the projects must be dropped.
+    invalidate_project_members(ProjectAccess.objects.filter(user=instance).values_list('project_id', flat=True))
+
+
+@receiver(signal=m2m_changed, sender=Project.members.through)
+def sync_project_members_access(sender: Any, instance: Any, action: str, reverse: bool, pk_set: set[int] | None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if action == 'pre_clear':
+        # The `pk_set` is not provided for the clear, so the access is revoked before the through rows are removed.
+        if reverse:
+            for project_id in ProjectAccess.objects.filter(user=instance, role=ProjectRole.MEMBER).values_list('project_id', flat=True):  # noqa E501
+                revoke_project_access(project_id=project_id, user_ids=(instance.pk,), role=ProjectRole.MEMBER)
+        else:
+            revoke_project_access(project_id=instance.pk, user_ids=None, role=ProjectRole.MEMBER)
+        return
+
+    update_access = grant_project_access if action == 'post_add' else revoke_project_access
+    if reverse:
+        # For the reverse relation the instance is the user and the `pk_set` contains the projects.
+        for project_id in pk_set or ():
+            update_access(project_id=project_id, user_ids=(instance.pk,), role=ProjectRole.MEMBER)
+    else:
+        update_access(project_id=instance.pk, user_ids=pk_set or (), role=ProjectRole.MEMBER)
+
+
+@receiver(signal=post_save, sender=Project)
+@receiver(signal=post_delete, sender=Project)
+def bump_project_fragments(sender: type[Project], instance: Project, **kwargs):
+    bump_fragment_versions(Project, (instance.pk,))
+
+
+@receiver(signal=m2m_changed, sender=Project.members.through)
+def bump_project_members_fragments(sender: Any, instance: Any, action: str, reverse: bool, pk_set: set[int] | None, **kwargs):  # noqa E501
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        bump_fragment_versions(Project, (instance.pk,))
+    elif action == 'pre_clear':
+        # For the reverse relation the instance is the user, the `pk_set` of projects is not provided for the clear.
+        bump_fragment_versions(Project, sender.objects.filter(user=instance).values_list('project_id', flat=True))
+    else:
+        bump_fragment_versions(Project, pk_set or ())
@@ -1,17 +1,34 @@
+from django.conf import settings
 from django.urls import include
 from django.urls import path
 
+from projects.views import AsyncProjectDetailView
+from projects.views import AsyncProjectListView
 from projects.views import ProjectCreateView
 from projects.views import ProjectDeleteView
 from projects.views import ProjectDetailView
 from projects.views import ProjectListView
+from projects.views import ProjectMemberAutocompleteView
+from projects.views import ProjectMemberInviteView
+from projects.views import ProjectMemberListView
+from projects.views import ProjectMemberRemoveView
 from projects.views import ProjectUpdateView
 
 
+# The async read views are enabled for the ASGI server by the `ASYNC_READ_VIEWS` setting.
+if settings.ASYNC_READ_VIEWS:
+    list_view, detail_view = AsyncProjectListView, AsyncProjectDetailView
+else:
+    list_view, detail_view = ProjectListView, ProjectDetailView
+
 urlpatterns = [
-    path(route='', view=ProjectListView.as_view(), name='project_list'),
+    path(route='', view=list_view.as_view(), name='project_list'),
     path(route='create/', view=ProjectCreateView.as_view(), name='project_create'),
-    path(route='<int:project_pk>/', view=ProjectDetailView.as_view(), name='project_detail'),
+    path(route='<int:project_pk>/', view=detail_view.as_view(), name='project_detail'),
+    path(route='<int:project_pk>/members/', view=ProjectMemberListView.as_view(), name='project_members'),
+    path(route='<int:project_pk>/members/search/', view=ProjectMemberAutocompleteView.as_view(), name='project_member_search'),  # noqa E501
+    path(route='<int:project_pk>/members/invite/', view=ProjectMemberInviteView.as_view(), name='project_member_invite'),
+    path(route='<int:project_pk>/members/remove/', view=ProjectMemberRemoveView.as_view(), name='project_member_remove'),
     path(route='<int:project_pk>/sections/', view=include('sections.urls')),
     path(route='<int:project_pk>/update/', view=ProjectUpdateView.as_view(), name='project_update'),
     path(route='<int:project_pk>/delete/', view=ProjectDeleteView.as_view(), name='project_delete'),
@@ -1,23 +1,56 @@
 from typing import Any
 from typing import cast
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
 from django.db.models.query import QuerySet
+from django.forms import BaseForm
 from django.forms import BaseModelForm
+from django.http import Http404
+from django.http import HttpRequest
 from django.http import HttpResponse
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.shortcuts import render
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.generic import CreateView
 from django.views.generic import DeleteView
 from django.views.generic import DetailView
+from django.views.generic import FormView
 from django.views.generic import ListView
 from django.views.generic import UpdateView
+from django.views.generic.detail import SingleObjectMixin
+from django.views.generic.list import MultipleObjectMixin
 
+from app_config.fragments import aget_fragment
+from app_config.fragments import aget_fragment_versions
+from app_config.fragments import get_fragment
+from app_config.fragments import get_fragment_timeout
+from app_config.fragments import get_fragment_versions
+from app_config.pagination import InvalidCursor
+from app_config.pagination import KeysetPage
+from app_config.pagination import KeysetPaginationMixin
+from app_config.pagination import KeysetPaginator
+from app_config.pagination import build_cursor_query
 from authentication.models import User
+from projects.access import aget_project_access
+from projects.access import check_project_access
+from projects.access import get_accessible_project_ids
+from projects.access import get_member_project_ids
+from projects.access import get_owned_project_ids
+from projects.access import get_project_members
+from projects.access import get_scoped_project
 from projects.forms import ProjectCreateForm
+from projects.forms import ProjectMemberInviteForm
+from projects.forms import ProjectMemberRemoveForm
 from projects.forms import ProjectUpdateForm
+from projects.membership import add_project_members
+from projects.membership import get_members_queryset
+from projects.membership import remove_project_members
 from projects.models import Project
+from tasks.deletion import soft_delete_project
 
 
 class ProjectViewMixin(LoginRequiredMixin, View):
@@ -27,49 +60,169 @@ class ProjectViewMixin(LoginRequiredMixin, View):
     def get_queryset(self) -> QuerySet[Project]:
         queryset = self.model.objects.all()
         queryset = queryset.select_related('owner')
-        queryset = queryset.prefetch_related('members', 'sections')
-        queryset = queryset.distinct()
+        # The members are paginated separately, only the first page is shown by the detail.
+        queryset = queryset.prefetch_related('sections')
         user = self.request.user
 
         if isinstance(self, (ProjectListView, ProjectDetailView)):
-            filters = Q(owner=user) | Q(members=user)
+            get_project_ids = get_accessible_project_ids
         elif isinstance(self, (ProjectUpdateView, ProjectDeleteView)):
-            filters = Q(owner=user)
+            get_project_ids = get_owned_project_ids
         else:
             raise Exception()
 
         if user.is_superuser:
             return queryset
         else:
-            return queryset.filter(filters)
+            return queryset.filter(pk__in=get_project_ids(user))
+
+
+class AsyncReadViewMixin:
+    """
+    The async `GET` of the read views for the ASGI server, the data of the page is loaded by the async ORM
+    in `aget_context_data`. The user and the project access are loaded first, so the permission filtering
+    of `get_queryset` doesn't query the database and the querysets are evaluated only asynchronously.
+    """
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        # The `LoginRequiredMixin` and the `dispatch` of the sync views would load the user synchronously.
+        return View.dispatch(self, request, *args, **kwargs)  # pyright: ignore[reportArgumentType]
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        # The templates and the permission filtering read the `request.user`, which would be loaded synchronously.
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()  # pyright: ignore[reportAttributeAccessIssue]
+        await aget_project_access(request.user)
+        context = await self.aget_context_data()
+        # The template is rendered here, the deferred rendering of the `TemplateResponse` would run in a thread.
+        return render(request, self.get_template_names(), context)  # pyright: ignore[reportAttributeAccessIssue]
+
+    async def aget_context_data(self) -> dict[str, Any]:
+        # The default loads the data as the sync `get` would and builds the context in a thread,
+        # the views override it to load the data by the async ORM.
+        if isinstance(self, SingleObjectMixin):
+            self.object = await self.aget_object()
+        if isinstance(self, MultipleObjectMixin):
+            self.object_list = self.get_queryset()
+        return await sync_to_async(self.get_context_data)()  # pyright: ignore[reportAttributeAccessIssue]
+
+    async def aget_object(self) -> Any:
+        queryset = self.get_queryset()  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])  # pyright: ignore[reportAttributeAccessIssue]
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
 
 
 class ProjectListView(ProjectViewMixin, ListView):
-    """User can get the list of projects where he is a member or owner, if user is superuser he can get all projects."""
+    """User can get the list of projects where he is a member or owner, if user is superuser he can get all projects.
+    The role of the user is taken from the project access table and every list is paginated separately with own cursor."""
     context_object_name = 'projects'
     template_name = 'projects/list.html'
+    read_from_replica = True
     extra_context = {'page_title': 'Projects'}
+    bucket_paginate_by = 50
 
-    def get_context_data(self, **kwargs) -> dict[str, Any]:
-        context = super().get_context_data(**kwargs)
+    def get_queryset(self) -> QuerySet[Project]:
         user = self.request.user
-        projects = cast(list[Project], self.object_list)  # pyright: ignore[reportAttributeAccessIssue]
-        context['projects'] = dict()
+        queryset = self.model.objects.only('id', 'title')
+
+        if user.is_superuser:
+            return queryset
+        else:
+            return queryset.filter(pk__in=get_accessible_project_ids(user))
+
+    bucket_template_name = 'projects/list_bucket_projects.html'
+
+    def get_bucket_cursor(self, name: str) -> str | None:
+        return self.request.GET.get(f'{name}_cursor') or None
+
+    def get_bucket_page(self, name: str, queryset: QuerySet[Project]) -> dict[str, Any]:
+        paginator = KeysetPaginator(queryset=queryset, ordering='pk', per_page=self.bucket_paginate_by)
+        try:
+            page = paginator.get_page(self.get_bucket_cursor(name))
+        except InvalidCursor as error:
+            raise Http404(str(error)) from error
+        # The rendered rows are cached by the versions of the projects on the page.
+        versions = get_fragment_versions(Project, [project.pk for project in page])
+        fragment = get_fragment(
+            name='project_list_bucket',
+            vary_on=[self.get_bucket_fragment_key(versions)],
+            timeout=get_fragment_timeout(*versions.values()),
+            render=lambda: render_to_string(self.bucket_template_name, {'projects': page}),
+        )
+        return self.get_bucket(name, page, fragment)
 
-        # user is owner;
-        context['projects']['my'] = filter(lambda p: user == p.owner, projects)
-        # user is member and not owner;
-        context['projects']['member'] = filter(lambda p: user in p.members.all() and not p.owner == user, projects)
+    def get_bucket_fragment_key(self, versions: dict[int, int]) -> str:
+        return ','.join(f'{pk}:{version}' for pk, version in versions.items())
 
-        if not user.is_superuser:
-            return context
+    def get_bucket(self, name: str, page: KeysetPage, fragment: str) -> dict[str, Any]:
+        cursor_kwarg = f'{name}_cursor'
+        next_page_query = None
+        if page.has_next():
+            next_page_query = build_cursor_query(query=self.request.GET, cursor_kwarg=cursor_kwarg, cursor=page.next_cursor)
+        return {
+            'page': page,
+            'first_page_query': build_cursor_query(query=self.request.GET, cursor_kwarg=cursor_kwarg, cursor=None),
+            'next_page_query': next_page_query,
+            'fragment': fragment,
+        }
 
-        # user is not member and is not owner;
-        context['projects']['admin_list'] = filter(lambda p: user != p.owner and user not in p.members.all(), projects)
+    def get_bucket_querysets(self, projects: QuerySet[Project]) -> dict[str, QuerySet[Project]]:
+        user = self.request.user
+        owned_project_ids = get_owned_project_ids(user)
+        member_project_ids = get_member_project_ids(user)
+        buckets = {
+            # user is owner;
+            'my': projects.filter(pk__in=owned_project_ids),
+            # user is member and not owner;
+            'member': projects.filter(pk__in=member_project_ids - owned_project_ids),
+        }
+        if user.is_superuser:
+            # user is not member and is not owner;
+            buckets['admin_list'] = projects.exclude(pk__in=owned_project_ids | member_project_ids)
+        return buckets
 
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        projects = cast(QuerySet[Project], self.object_list)  # pyright: ignore[reportAttributeAccessIssue]
+        buckets = self.get_bucket_querysets(projects)
+        context['projects'] = {name: self.get_bucket_page(name, queryset) for name, queryset in buckets.items()}
         return context
 
 
+class AsyncProjectListView(AsyncReadViewMixin, ProjectListView):
+    async def aget_bucket_page(self, name: str, queryset: QuerySet[Project]) -> dict[str, Any]:
+        paginator = KeysetPaginator(queryset=queryset, ordering='pk', per_page=self.bucket_paginate_by)
+        try:
+            page = await paginator.aget_page(self.get_bucket_cursor(name))
+        except InvalidCursor as error:
+            raise Http404(str(error)) from error
+        versions = await aget_fragment_versions(Project, [project.pk for project in page])
+
+        async def render() -> str:
+            return render_to_string(self.bucket_template_name, {'projects': page})
+
+        fragment = await aget_fragment(
+            name='project_list_bucket',
+            vary_on=[self.get_bucket_fragment_key(versions)],
+            timeout=get_fragment_timeout(*versions.values()),
+            render=render,
+        )
+        return self.get_bucket(name, page, fragment)
+
+    async def aget_context_data(self) -> dict[str, Any]:
+        self.object_list = self.get_queryset()
+        buckets = self.get_bucket_querysets(self.object_list)
+        self.bucket_pages = {name: await self.aget_bucket_page(name, queryset) for name, queryset in buckets.items()}
+        return self.get_context_data()
+
+    def get_bucket_page(self, name: str, queryset: QuerySet[Project]) -> dict[str, Any]:
+        # The page is already loaded by the `aget_context_data`.
+        return self.bucket_pages[name]
+
+
 class ProjectCreateView(ProjectViewMixin, CreateView):
     """User can create new project if he is logged in."""
     form_class = ProjectCreateForm
@@ -79,7 +232,9 @@ class ProjectCreateView(ProjectViewMixin, CreateView):
         project = cast(Project, form.instance)
         user = cast(User, self.request.user)
         project.owner = user
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        add_project_members(project, form.cleaned_data['usernames'].values())
+        return response
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
@@ -95,6 +250,19 @@ class ProjectDetailView(ProjectViewMixin, DetailView):
     """User can get the detail of the project only if he is a owner or member of project or superuser."""
     context_object_name = 'project'
     template_name = 'projects/detail.html'
+    read_from_replica = True
+    # The amount of the members shown by the detail, the others are shown by the member list.
+    members_paginate_by = 10
+
+    def get_members_paginator(self, project: Project) -> KeysetPaginator:
+        return KeysetPaginator(
+            queryset=get_members_queryset(project.pk),
+            ordering='username',
+            per_page=self.members_paginate_by,
+        )
+
+    def get_members_page(self, project: Project) -> KeysetPage:
+        return self.get_members_paginator(project).get_page(cursor=None)
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         user = self.request.user
@@ -103,9 +271,22 @@ class ProjectDetailView(ProjectViewMixin, DetailView):
         context['page_title'] = f'Detail of project: {project.title}'
         context['user_is_admin'] = user.is_superuser
         context['user_is_project_owner'] = project.owner == user
+        context['members'] = self.get_members_page(project)
         return context
 
 
+class AsyncProjectDetailView(AsyncReadViewMixin, ProjectDetailView):
+    async def aget_context_data(self) -> dict[str, Any]:
+        # The owner and the sections are loaded by the `select_related` and `prefetch_related`.
+        self.object = await self.aget_object()
+        self.members_page = await self.get_members_paginator(self.object).aget_page(cursor=None)
+        return self.get_context_data(object=self.object)
+
+    def get_members_page(self, project: Project) -> KeysetPage:
+        # The page is already loaded by the `aget_context_data`.
+        return self.members_page
+
+
 class ProjectUpdateView(ProjectViewMixin, UpdateView):
     """User can update the project only if he is a owner of project or superuser."""
     form_class = ProjectUpdateForm
@@ -134,3 +315,112 @@ class ProjectDeleteView(ProjectViewMixin, DeleteView):
         context = super().get_context_data(**kwargs)
         context['page_title'] = f'Delete project: {project.title}'
         return context
+
+    def form_valid(self, form: BaseForm) -> HttpResponse:
+        # The project is hidden at once, its sections and tasks are removed by the `purge_deleted` worker.
+        soft_delete_project(cast(Project, self.object))  # pyright: ignore[reportAttributeAccessIssue]
+        return redirect(self.get_success_url())
+
+
+class ProjectMemberViewMixin(LoginRequiredMixin, View):
+    """The views of the members of the project, the members are managed only by the owner or superuser."""
+    owner_only = False
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        # The anonymous user is redirected to the login page by the `LoginRequiredMixin`.
+        if request.user.is_authenticated:
+            self.project = get_scoped_project(
+                user=request.user,
+                project_pk=kwargs[ProjectViewMixin.pk_url_kwarg],
+                owner_only=self.owner_only,
+                fields=('id', 'title', 'owner'),
+            )
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_success_url(self) -> str:
+        return reverse_lazy('project_members', kwargs={ProjectViewMixin.pk_url_kwarg: self.project.pk})
+
+
+class ProjectMemberListView(ProjectMemberViewMixin, KeysetPaginationMixin, ListView):
+    """User can get the members of the project only if he is a owner or member of project or superuser."""
+    context_object_name = 'members'
+    template_name = 'projects/members.html'
+    read_from_replica = True
+    default_ordering = 'username'
+
+    def get_queryset(self) -> QuerySet[User]:
+        return get_members_queryset(self.project.pk)
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        user = self.request.user
+        context = super().get_context_data(**kwargs)
+        context['page_title'] = f'Members of project: {self.project.title}'
+        context['project'] = self.project
+        context['user_can_manage'] = user.is_superuser or self.project.owner_id == user.pk
+        if context['user_can_manage']:
+            context['invite_form'] = ProjectMemberInviteForm()
+        return context
+
+
+class ProjectMemberInviteView(ProjectMemberViewMixin, FormView):
+    """User can invite the members of the project by their usernames only if he is a owner of project or superuser."""
+    owner_only = True
+    form_class = ProjectMemberInviteForm
+    template_name = 'projects/member_invite.html'
+
+    def form_valid(self, form: ProjectMemberInviteForm) -> HttpResponse:
+        add_project_members(self.project, form.cleaned_data['usernames'].values())
+        return super().form_valid(form)
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context['page_title'] = f'Invite members of project: {self.project.title}'
+        return context
+
+
+class ProjectMemberRemoveView(ProjectMemberViewMixin, FormView):
+    """User can remove the members of the project only if he is a owner of project or superuser."""
+    owner_only = True
+    form_class = ProjectMemberRemoveForm
+    http_method_names = ['post']
+
+    def get_form_kwargs(self) -> dict[str, Any]:
+        kwargs = super().get_form_kwargs()
+        kwargs['project_id'] = self.project.pk
+        return kwargs
+
+    def form_valid(self, form: ProjectMemberRemoveForm) -> HttpResponse:
+        remove_project_members(self.project, (user.pk for user in form.cleaned_data['members']))
+        return super().form_valid(form)
+
+    def form_invalid(self, form: ProjectMemberRemoveForm) -> HttpResponse:
+        # Nothing is chosen or the chosen users were already removed, e.g. by the repeated submit of the stale page.
+        return redirect(self.get_success_url())
+
+
+class ProjectMemberAutocompleteView(LoginRequiredMixin, View):
+    """
+    The owner and the members of the project whose username contains the `term`, paginated by the `page`.
+    The members are searched in the cached list of the project, so the cost doesn't depend on the amount of users.
+    """
+    paginate_by = 20
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        project_pk = kwargs[ProjectViewMixin.pk_url_kwarg]
+        if not check_project_access(user=request.user, project_pk=project_pk):
+            raise Http404(f'No {Project._meta.object_name} matches the given query.')
+        term = request.GET.get('term', '').casefold()
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+        members = [
+            {'id': user_id, 'text': username}
+            for user_id, username in get_project_members(project_pk).items()
+            if term in username.casefold()
+        ]
+        start = (page - 1) * self.paginate_by
+        return JsonResponse({
+            'results': members[start:start + self.paginate_by],
+            'pagination': {'more': len(members) > start + self.paginate_by},
+        })
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.http import Http404
+
+from projects.access import aget_project_access
+from projects.access import check_project_access
+from sections.models import Section
+
+
+def get_scoped_section(
+    user: Any,
+    project_pk: int,
+    section_pk: int,
+    owner_only: bool = False,
+    fields: tuple[str, ...] = ('id', 'name', 'project__id', 'project__title'),
+) -> Section:
+    """
+    Loads the section of the nested views (tasks) together with its project in one query.
+    The access to the project is checked by the cached project ids before the query, raises `Http404` if user has no access.
+    """
+    if check_project_access(user=user, project_pk=project_pk, owner_only=owner_only):
+        queryset = Section.objects.select_related('project').only(*fields)
+        section = queryset.filter(pk=section_pk, project__pk=project_pk).first()
+        if section is not None:
+            return section
+    raise Http404(f'No {Section._meta.object_name} matches the given query.')
+
+
+async def aget_scoped_section(
+    user: Any,
+    project_pk: int,
+    section_pk: int,
+    owner_only: bool = False,
+    fields: tuple[str, ...] = ('id', 'name', 'project__id', 'project__title'),
+) -> Section:
+    """The async `get_scoped_section`, the access of the user is loaded by `aget_project_access`."""
+    await aget_project_access(user)
+    if check_project_access(user=user, project_pk=project_pk, owner_only=owner_only):
+        queryset = Section.objects.select_related('project').only(*fields)
+        section = await queryset.filter(pk=section_pk, project__pk=project_pk).afirst()
+        if section is not None:
+            return section
+    raise Http404(f'No {Section._meta.object_name} matches the given query.')
@@ -1,8 +1,21 @@
 from django.contrib import admin
 
+from app_config.pagination import EstimatedCountPaginator
 from sections.models import Section
 
 
+class SectionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'project', 'tasks_to_do', 'tasks_in_progress', 'tasks_done')
+    list_select_related = ('project',)
+    # The sections are searched by the autocomplete of the task admin, the prefix of the name is the range scan
+    # of its prefix index (`0004_name_prefix_index`).
+    search_fields = ('name__istartswith',)
+    autocomplete_fields = ('project',)
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 admin.site.register((
     Section,
-))
+), SectionAdmin)
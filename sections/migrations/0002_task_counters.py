@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='tasks_done',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tasks done'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='tasks_high',
+            field=models.IntegerField(default=0, editable=False, verbose_name='High priority tasks'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='tasks_in_progress',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tasks in progress'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='tasks_low',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Low priority tasks'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='tasks_medium',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Medium priority tasks'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='tasks_overdue',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Overdue tasks'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='tasks_to_do',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tasks to do'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='tasks_urgent',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Urgent tasks'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_soft_delete'),
+        ('sections', '0002_task_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at', 'id'], name='section_deleted_idx'),
+        ),
+    ]
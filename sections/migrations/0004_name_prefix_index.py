@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+# The prefix search of the admin (`name__istartswith`) is case-insensitive on both databases.
+# SQLite compares `LIKE 'term%'` case-insensitively (ASCII only), so it reads only the index of the NOCASE collation.
+# PostgreSQL compares `UPPER(field::text) LIKE UPPER('term%')`, so it reads the index of the same expression
+# with the pattern operator class.
+STATEMENTS = {
+    'sqlite': (
+        (
+            'CREATE INDEX sections_section_name_prefix_idx ON sections_section (name COLLATE NOCASE)',
+        ),
+        (
+            'DROP INDEX IF EXISTS sections_section_name_prefix_idx',
+        ),
+    ),
+    'postgresql': (
+        (
+            'CREATE INDEX sections_section_name_prefix_idx ON sections_section (UPPER(name::text) text_pattern_ops)',
+        ),
+        (
+            'DROP INDEX IF EXISTS sections_section_name_prefix_idx',
+        ),
+    ),
+}
+
+
+def create_prefix_index(apps, schema_editor):
+    forward, _ = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in forward:
+        schema_editor.execute(statement)
+
+
+def drop_prefix_index(apps, schema_editor):
+    _, backward = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in backward:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0003_soft_delete'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
@@ -1,9 +1,11 @@
 from django.db import models
 
+from projects.models import AliveManager
 from projects.models import Project
+from projects.models import TaskCounters
 
 
-class Section(models.Model):
+class Section(TaskCounters):
     name = models.CharField(
         blank=False,
         null=False,
@@ -17,6 +19,25 @@ class Section(models.Model):
         related_name='sections',
         verbose_name='Project',
     )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Deleted at',
+    )
+
+    objects = AliveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = (
+            # The deleted sections waiting for the purge, oldest first.
+            models.Index(
+                fields=('deleted_at', 'id'),
+                condition=models.Q(deleted_at__isnull=False),
+                name='section_deleted_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return self.name
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from app_config.fragments import bump_fragment_versions
+from projects.models import Project
+from sections.models import Section
+
+
+@receiver(signal=post_save, sender=Section)
+@receiver(signal=post_delete, sender=Section)
+def bump_section_fragments(sender: type[Section], instance: Section, **kwargs):
+    bump_fragment_versions(Section, (instance.pk,))
+    bump_fragment_versions(Project, (instance.project_id,))
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.urls import include
 from django.urls import path
 
+from sections.views import AsyncSectionDetailView
+from sections.views import AsyncSectionListView
 from sections.views import SectionCreateView
 from sections.views import SectionDeleteView
 from sections.views import SectionDetailView
@@ -8,10 +11,16 @@ from sections.views import SectionListView
 from sections.views import SectionUpdateView
 
 
+# The async read views are enabled for the ASGI server by the `ASYNC_READ_VIEWS` setting.
+if settings.ASYNC_READ_VIEWS:
+    list_view, detail_view = AsyncSectionListView, AsyncSectionDetailView
+else:
+    list_view, detail_view = SectionListView, SectionDetailView
+
 urlpatterns = [
-    path(route='', view=SectionListView.as_view(), name='section_list'),
+    path(route='', view=list_view.as_view(), name='section_list'),
     path(route='create/', view=SectionCreateView.as_view(), name='section_create'),
-    path(route='<int:section_pk>/', view=SectionDetailView.as_view(), name='section_detail'),
+    path(route='<int:section_pk>/', view=detail_view.as_view(), name='section_detail'),
     path(route='<int:section_pk>/tasks/', view=include('tasks.urls')),
     path(route='<int:section_pk>/update/', view=SectionUpdateView.as_view(), name='section_update'),
     path(route='<int:section_pk>/delete/', view=SectionDeleteView.as_view(), name='section_delete'),
@@ -2,12 +2,13 @@ from typing import Any
 from typing import cast
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
 from django.db.models import QuerySet
+from django.forms import BaseForm
 from django.forms import BaseModelForm
-from django.http import Http404
 from django.http import HttpRequest
 from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.generic import CreateView
@@ -16,12 +17,23 @@ from django.views.generic import DetailView
 from django.views.generic import ListView
 from django.views.generic import UpdateView
 
-from projects.models import Project
-from projects.views import ProjectDetailView
+from app_config.fragments import aget_fragment
+from app_config.fragments import aget_fragment_version
+from app_config.fragments import get_fragment
+from app_config.fragments import get_fragment_timeout
+from app_config.fragments import get_fragment_version
+from projects.access import aget_scoped_project
+from projects.access import get_accessible_project_ids
+from projects.access import get_member_project_ids
+from projects.access import get_owned_project_ids
+from projects.access import get_scoped_project
+from projects.views import AsyncReadViewMixin
 from projects.views import ProjectViewMixin
 from sections.forms import SectionCreateForm
 from sections.forms import SectionUpdateForm
 from sections.models import Section
+from tasks.deletion import soft_delete_section
+from tasks.models import Task
 
 
 class SectionViewMixin(LoginRequiredMixin, View):
@@ -31,34 +43,38 @@ class SectionViewMixin(LoginRequiredMixin, View):
     def get_queryset(self) -> QuerySet[Section]:
         queryset = self.model.objects.all()
         queryset = queryset.select_related('project', 'project__owner')
-        queryset = queryset.prefetch_related('tasks', 'project__members')
-        queryset = queryset.distinct()
         user = self.request.user
         project_pk = self.kwargs[ProjectViewMixin.pk_url_kwarg]
 
         if isinstance(self, (SectionListView, SectionDetailView)):
-            filters = Q(project__owner=user) | Q(project__members=user)
+            get_project_ids = get_accessible_project_ids
         elif isinstance(self, (SectionUpdateView, SectionDeleteView)):
-            filters = Q(project__owner=user)
+            get_project_ids = get_owned_project_ids
         else:
             raise Exception()
 
-        if user.is_superuser:
+        if user.is_superuser or project_pk in get_project_ids(user):
             return queryset.filter(project__pk=project_pk)
         else:
-            return queryset.filter(filters, project__pk=project_pk)
+            return queryset.none()
 
 
 class SectionListView(SectionViewMixin, ListView):
     """User can get the list of the project sections only if he is a owner or member of project or superuser."""
     context_object_name = 'sections'
     template_name = 'sections/list.html'
+    read_from_replica = True
 
     def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        project = ProjectDetailView(request=request, kwargs=kwargs).get_object()
-        self.project = cast(Project, project)
+        # The anonymous user is redirected to the login page by the `LoginRequiredMixin`.
+        if request.user.is_authenticated:
+            self.project = get_scoped_project(user=request.user, project_pk=kwargs[ProjectViewMixin.pk_url_kwarg])
         return super().dispatch(request, *args, **kwargs)
 
+    def get_queryset(self) -> QuerySet[Section]:
+        # The project is already loaded by the dispatch, the list shows only the names of sections.
+        return super().get_queryset().select_related(None).only('id', 'name', 'project')
+
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context['page_title'] = f'Sections of project: {self.project.title}'
@@ -66,20 +82,24 @@ class SectionListView(SectionViewMixin, ListView):
         return context
 
 
+class AsyncSectionListView(AsyncReadViewMixin, SectionListView):
+    async def aget_context_data(self) -> dict[str, Any]:
+        project_pk = self.kwargs[ProjectViewMixin.pk_url_kwarg]
+        self.project = await aget_scoped_project(user=self.request.user, project_pk=project_pk)
+        self.object_list = [section async for section in self.get_queryset()]
+        return self.get_context_data()
+
+
 class SectionCreateView(SectionViewMixin, CreateView):
     """User can create new section for project only if he is a owner of the project or superuser."""
     form_class = SectionCreateForm
     template_name = 'sections/create.html'
 
     def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        project = ProjectDetailView(request=request, kwargs=kwargs).get_object()
-        self.project = cast(Project, project)
-
-        user = request.user
         # Raise 404 if user try to add the section into the project where he is not a owner.
-        if not user.is_superuser and self.project.owner != user:
-            raise Http404(f'No {self.project._meta.object_name} matches the given query.')
-
+        if request.user.is_authenticated:
+            project_pk = kwargs[ProjectViewMixin.pk_url_kwarg]
+            self.project = get_scoped_project(user=request.user, project_pk=project_pk, owner_only=True)
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form: BaseModelForm) -> HttpResponse:
@@ -105,6 +125,8 @@ class SectionDetailView(SectionViewMixin, DetailView):
     """User can see detail of the project section only if he is a member or owner of the project or superuser."""
     context_object_name = 'section'
     template_name = 'sections/detail.html'
+    tasks_template_name = 'sections/detail_tasks.html'
+    read_from_replica = True
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         section = cast(Section, self.object)  # pyright: ignore[reportAttributeAccessIssue]
@@ -113,9 +135,48 @@ class SectionDetailView(SectionViewMixin, DetailView):
         context['page_title'] = f'Detail of section: {section.name}'
         context['user_is_admin'] = user.is_superuser
         context['user_is_project_owner'] = section.project.owner == user
-        context['user_is_project_member'] = section.project.members.filter(pk=user.pk).exists()
+        context['user_is_project_member'] = section.project_id in get_member_project_ids(user)
+        context['tasks_fragment'] = self.get_tasks_fragment(section)
         return context
 
+    def get_tasks(self, section: Section) -> QuerySet[Task]:
+        return section.tasks.only('id', 'title', 'section').order_by('pk')
+
+    def get_tasks_fragment(self, section: Section) -> str:
+        # The tasks are loaded only when the cached fragment of the list is missing or stale.
+        version = get_fragment_version(Section, section.pk)
+        return get_fragment(
+            name='section_tasks',
+            vary_on=[section.pk, version],
+            timeout=get_fragment_timeout(version),
+            render=lambda: render_to_string(self.tasks_template_name, {'section': section, 'tasks': self.get_tasks(section)}),  # noqa E501
+        )
+
+
+class AsyncSectionDetailView(AsyncReadViewMixin, SectionDetailView):
+    async def aget_tasks_fragment(self, section: Section) -> str:
+        version = await aget_fragment_version(Section, section.pk)
+
+        async def render() -> str:
+            tasks = [task async for task in self.get_tasks(section)]
+            return render_to_string(self.tasks_template_name, {'section': section, 'tasks': tasks})
+
+        return await aget_fragment(
+            name='section_tasks',
+            vary_on=[section.pk, version],
+            timeout=get_fragment_timeout(version),
+            render=render,
+        )
+
+    async def aget_context_data(self) -> dict[str, Any]:
+        self.object = await self.aget_object()
+        self.tasks_fragment = await self.aget_tasks_fragment(self.object)
+        return self.get_context_data(object=self.object)
+
+    def get_tasks_fragment(self, section: Section) -> str:
+        # The fragment is already loaded by the `aget_context_data`.
+        return self.tasks_fragment
+
 
 class SectionUpdateView(SectionViewMixin, UpdateView):
     """User can update section of project only if he is a owner of project or superuser."""
@@ -143,6 +204,11 @@ class SectionDeleteView(SectionViewMixin, DeleteView):
     context_object_name = 'section'
     template_name = 'sections/delete.html'
 
+    def form_valid(self, form: BaseForm) -> HttpResponse:
+        # The section is hidden at once, its tasks are removed by the `purge_deleted` worker.
+        soft_delete_section(cast(Section, self.object))  # pyright: ignore[reportAttributeAccessIssue]
+        return redirect(self.get_success_url())
+
     def get_success_url(self) -> str:
         kwargs = {
             ProjectViewMixin.pk_url_kwarg: self.kwargs[ProjectViewMixin.pk_url_kwarg]
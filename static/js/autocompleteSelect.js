@@ -0,0 +1,55 @@
+// The delay of the search after the last typed character.
+const AUTOCOMPLETE_DELAY_MS = 250;
+
+async function loadAutocompletePage(select, term, page) {
+    const url = new URL(select.dataset.autocompleteUrl, window.location.href);
+    url.searchParams.set('term', term);
+    url.searchParams.set('page', page);
+
+    const response = await fetch(url);
+    if (!response.ok) {
+        return;
+    }
+    const data = await response.json();
+    // The empty option and the selected one stay, the found members replace the previous results.
+    if (page === 1) {
+        for (const option of Array.from(select.options)) {
+            if (option.value !== '' && !option.selected) {
+                option.remove();
+            }
+        }
+    }
+    for (const result of data.results) {
+        if (!select.querySelector(`option[value="${result.id}"]`)) {
+            select.add(new Option(result.text, result.id));
+        }
+    }
+    const more = select.nextElementSibling;
+    more.hidden = !data.pagination.more;
+    more.dataset.page = page + 1;
+}
+
+function initAutocompleteSelect(select) {
+    const search = document.createElement('input');
+    search.type = 'search';
+    search.placeholder = 'Search...';
+    select.before(search);
+
+    const more = document.createElement('input');
+    more.type = 'button';
+    more.value = 'More';
+    more.hidden = true;
+    select.after(more);
+
+    let timeout = null;
+    search.addEventListener('input', () => {
+        clearTimeout(timeout);
+        timeout = setTimeout(() => loadAutocompletePage(select, search.value, 1), AUTOCOMPLETE_DELAY_MS);
+    });
+    more.addEventListener('click', () => loadAutocompletePage(select, search.value, Number(more.dataset.page)));
+    loadAutocompletePage(select, '', 1);
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('select.autocompleteSelect').forEach(initAutocompleteSelect);
+});
@@ -0,0 +1,64 @@
+function findTaskItem(taskId) {
+    return document.getElementById(`task-${taskId}`);
+}
+
+function createTaskItem(board, event) {
+    const list = board.querySelector('ul');
+    if (!list || findTaskItem(event.task)) {
+        return;
+    }
+    const item = document.createElement('li');
+    const link = document.createElement('a');
+    item.id = `task-${event.task}`;
+    link.href = `${location.pathname}tasks/${event.task}/`;
+    // The title of the task moved from another section isn't in the changes.
+    link.textContent = event.changes.title ? event.changes.title[1] : `Task ${event.task}`;
+    item.appendChild(link);
+    list.appendChild(item);
+}
+
+function updateTaskItem(board, event) {
+    const item = findTaskItem(event.task);
+    if (event.section !== Number(board.dataset.sectionId)) {
+        // The task is moved to another section.
+        if (item) {
+            item.remove();
+        }
+        return;
+    }
+    if (!item) {
+        createTaskItem(board, event);
+        return;
+    }
+    if (event.changes.title) {
+        item.querySelector('a').textContent = event.changes.title[1];
+    }
+}
+
+function deleteTaskItem(board, event) {
+    const item = findTaskItem(event.task);
+    if (item) {
+        item.remove();
+    }
+}
+
+function subscribeToSectionTasks() {
+    const board = document.getElementById('section-tasks');
+
+    if (!board || !window.EventSource) {
+        return;
+    }
+    const source = new EventSource(board.dataset.eventsUrl);
+    const handlers = {
+        CREATED: createTaskItem,
+        UPDATED: updateTaskItem,
+        DELETED: deleteTaskItem,
+    };
+    for (const [action, handler] of Object.entries(handlers)) {
+        source.addEventListener(action, (message) => handler(board, JSON.parse(message.data)));
+    }
+    // The browser missed too many events to replay them.
+    source.addEventListener('reset', () => location.reload());
+}
+
+document.addEventListener('DOMContentLoaded', subscribeToSectionTasks);
@@ -0,0 +1,22 @@
+async function loadColumnPage(button) {
+    const item = button.closest('li');
+
+    button.disabled = true;
+    const response = await fetch(button.dataset.columnUrl);
+    if (!response.ok) {
+        button.disabled = false;
+        return;
+    }
+    // The page ends with the button of the next page, if there is one.
+    item.outerHTML = await response.text();
+}
+
+function handleBoardClick(event) {
+    const button = event.target.closest('.task-board-column input[data-column-url]');
+
+    if (button) {
+        loadColumnPage(button);
+    }
+}
+
+document.addEventListener('click', handleBoardClick);
@@ -0,0 +1,169 @@
+import contextvars
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+from django.dispatch import Signal
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+from sections.models import Section
+from tasks.models import Task
+from tasks.models import TaskEvent
+from tasks.models import TaskEventAction
+
+
+# The fields of the task which are recorded by the activity log, the relations are recorded by the ids.
+TRACKED_FIELDS = ('title', 'description', 'priority', 'status', 'executor', 'creator', 'deadline', 'section')
+TRACKED_ATTNAMES = {field: Task._meta.get_field(field).attname for field in TRACKED_FIELDS}
+BATCH_SIZE = 1000
+
+# Sent with the `events` after they are inserted, the events of the committed changes only.
+task_events_recorded = Signal()
+
+_request: contextvars.ContextVar[HttpRequest | None] = contextvars.ContextVar('activity_request', default=None)
+
+
+def get_actor_id() -> int | None:
+    """The id of the user of the current request, `None` outside of the request (commands, shell)."""
+    request = _request.get()
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+class ActivityActorMiddleware:
+    """Keeps the current request, so the events of the saved tasks are recorded with the user of the request."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # pyright: ignore[reportReturnType]
+        token = _request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _request.reset(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        token = _request.set(request)
+        try:
+            return await self.get_response(request)  # pyright: ignore[reportGeneralTypeIssues]
+        finally:
+            _request.reset(token)
+
+
+def get_task_values(task: Task) -> dict[str, Any]:
+    return {field: getattr(task, attname) for field, attname in TRACKED_ATTNAMES.items()}
+
+
+def load_task_values(task_id: int, *extra_attnames: str) -> dict[str, Any] | None:
+    """
+    The tracked values of the task in the database, with the keys of `TRACKED_FIELDS`, and the `extra_attnames`
+    which are read by the same query for the other consumers of the save (the counters).
+    """
+    values = Task.objects.filter(pk=task_id).values(*TRACKED_ATTNAMES.values(), *extra_attnames).first()
+    if values is None:
+        return None
+    tracked = {field: values.pop(attname) for field, attname in TRACKED_ATTNAMES.items()}
+    return {**tracked, **values}
+
+
+def diff_values(before: dict[str, Any] | None, after: dict[str, Any] | None) -> dict[str, list[Any]]:
+    """The changed fields `{field: [old, new]}`, the missing side (created or deleted task) is `None`."""
+    changes = dict()
+    for field in (before if before is not None else after or dict()):
+        old = before[field] if before is not None else None
+        new = after[field] if after is not None else None
+        if old != new:
+            changes[field] = [old, new]
+    return changes
+
+
+class TaskEventBuffer:
+    """
+    The events of one transaction, inserted with one `INSERT` after the commit, so the log doesn't hold the locks
+    of the transaction and the events of the rolled back changes are never written.
+    """
+
+    def __init__(self, using: str):
+        self.using = using
+        self.events: list[TaskEvent] = list()
+        # The projects of sections are resolved when the event is recorded, the section may be deleted by the commit.
+        self.project_ids: dict[int, int | None] = dict()
+
+    def add(self, events: Iterable[TaskEvent]):
+        events = list(events)
+        missing = {event.section_id for event in events if event.project_id is None} - self.project_ids.keys()
+        if missing:
+            self.project_ids.update(dict.fromkeys(missing))
+            sections = Section.objects.using(self.using).filter(pk__in=missing)
+            self.project_ids.update(sections.values_list('pk', 'project_id'))
+        for event in events:
+            if event.project_id is None:
+                event.project_id = self.project_ids[event.section_id]
+        self.events.extend(events)
+
+    def __call__(self):
+        events, self.events = self.events, list()
+        TaskEvent.objects.using(self.using).bulk_create(events, batch_size=BATCH_SIZE)
+        task_events_recorded.send(sender=TaskEvent, events=events)
+
+
+def get_event_buffer(using: str) -> TaskEventBuffer:
+    """The buffer of the current transaction (or savepoint), flushed by the `on_commit` callback."""
+    connection = transaction.get_connection(using)
+    if connection.in_atomic_block:
+        savepoint_ids = set(connection.savepoint_ids)
+        for callback_savepoint_ids, callback, _ in connection.run_on_commit:
+            if isinstance(callback, TaskEventBuffer) and callback_savepoint_ids == savepoint_ids:
+                return callback
+    return TaskEventBuffer(using=using)
+
+
+def record_task_events(events: Iterable[TaskEvent], using: str = DEFAULT_DB_ALIAS):
+    """
+    Appends the events to the log after the commit of the current transaction, all events of the transaction
+    are inserted together. Outside of the transaction the events are inserted immediately.
+    """
+    buffer = get_event_buffer(using)
+    is_registered = bool(buffer.events)
+    buffer.add(events)
+    if buffer.events and not is_registered:
+        # The failed insert of the log is logged and doesn't fail the committed change.
+        transaction.on_commit(buffer, using=using, robust=True)
+
+
+def record_task_change(task: Task, before: dict[str, Any] | None, after: dict[str, Any] | None, actor_id: int | None = None):  # noqa E501
+    """Records the created (`before` is `None`), changed or deleted (`after` is `None`) task, if anything changed."""
+    changes = diff_values(before, after)
+    if not changes:
+        return
+    if before is None:
+        action = TaskEventAction.CREATED
+    elif after is None:
+        action = TaskEventAction.DELETED
+    else:
+        action = TaskEventAction.UPDATED
+    # The section loaded by the view already knows its project.
+    section = task.section if Task.section.is_cached(task) else None  # pyright: ignore[reportAttributeAccessIssue]
+    event = TaskEvent(
+        task_id=task.pk,
+        section_id=task.section_id,  # pyright: ignore[reportAttributeAccessIssue]
+        project_id=section.project_id if section is not None else None,  # pyright: ignore[reportAttributeAccessIssue]
+        actor_id=actor_id if actor_id is not None else get_actor_id(),
+        action=action,
+        changes=changes,
+    )
+    record_task_events((event,), using=task._state.db or DEFAULT_DB_ALIAS)
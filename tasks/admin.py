@@ -3,9 +3,20 @@ from typing import Any
 
 from django import forms
 from django.contrib import admin
+from django.contrib import messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
+from app_config.pagination import EstimatedCountPaginator
 from app_config.widgets import ClientTimezoneOffsetWidget
+from tasks.bulk import bulk_update_tasks
 from tasks.models import Task
+from tasks.models import TaskEvent
+from tasks.models import TaskPriority
+from tasks.models import TaskReminder
+from tasks.models import TaskStatus
 
 
 class TaskAdminForm(forms.ModelForm):
@@ -40,10 +51,134 @@ class TaskAdminForm(forms.ModelForm):
         }
 
 
+class TaskBulkActionForm(ActionForm):
+    """The values of the bulk actions, shown next to the action select of the changelist."""
+    status = forms.ChoiceField(
+        required=False,
+        choices=(('', '---------'), *TaskStatus.choices),
+    )
+    priority = forms.TypedChoiceField(
+        required=False,
+        coerce=int,
+        empty_value=None,
+        choices=(('', '---------'), *TaskPriority.choices),
+    )
+    executor = forms.IntegerField(
+        required=False,
+        label='Executor id',
+        help_text='Empty value unassigns the executor.',
+    )
+    section = forms.IntegerField(
+        required=False,
+        label='Section id',
+    )
+
+
+def run_bulk_action(modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet[Task], field: str, required: bool):  # noqa E501
+    form = TaskBulkActionForm(request.POST)
+    form.fields['action'].choices = modeladmin.get_action_choices(request)  # pyright: ignore[reportAttributeAccessIssue]
+    if not form.is_valid() or (required and form.cleaned_data[field] in (None, '')):
+        modeladmin.message_user(request, f'Choose the {field} for the action.', level=messages.ERROR)
+        return
+    try:
+        amount = bulk_update_tasks(user=request.user, tasks=queryset, changes={field: form.cleaned_data[field]})
+    except ValidationError as error:
+        modeladmin.message_user(request, ' '.join(error.messages), level=messages.ERROR)
+        return
+    modeladmin.message_user(request, f'{amount} tasks were updated.', level=messages.SUCCESS)
+
+
+@admin.action(description='Change status of selected tasks')
+def change_status(modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet[Task]):
+    run_bulk_action(modeladmin, request, queryset, field='status', required=True)
+
+
+@admin.action(description='Change priority of selected tasks')
+def change_priority(modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet[Task]):
+    run_bulk_action(modeladmin, request, queryset, field='priority', required=True)
+
+
+@admin.action(description='Reassign executor of selected tasks')
+def reassign_executor(modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet[Task]):
+    run_bulk_action(modeladmin, request, queryset, field='executor', required=False)
+
+
+@admin.action(description='Move selected tasks to section')
+def move_to_section(modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet[Task]):
+    run_bulk_action(modeladmin, request, queryset, field='section', required=True)
+
+
 class TaskAdmin(admin.ModelAdmin):
     form = TaskAdminForm
+    action_form = TaskBulkActionForm
+    list_display = ('id', 'title', 'status', 'priority', 'section', 'executor', 'creator', 'deadline')
+    # The related objects of the page are joined instead of the query per row.
+    list_select_related = ('section', 'executor', 'creator')
+    # The filtered page is the range scan of the `(status, id)` or `(priority, id)` index.
+    list_filter = ('status', 'priority')
+    # The select with every section and user is replaced by the searched and paginated one.
+    autocomplete_fields = ('section', 'executor', 'creator')
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = (
+        change_status,
+        change_priority,
+        reassign_executor,
+        move_to_section,
+    )
 
 
 admin.site.register((
     Task,
 ), TaskAdmin)
+
+
+class TaskEventAdmin(admin.ModelAdmin):
+    """The activity log is append-only, so it is read-only in the admin too."""
+    list_display = ('id', 'task_id', 'action', 'actor', 'created_at')
+    list_filter = ('action',)
+    list_select_related = ('actor',)
+    ordering = ('-id',)
+    # The log grows to millions of events: the unfiltered list is counted by the estimate instead of the full scan,
+    # and the filtered list has no second count of the whole table for the "N total" link.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: TaskEvent | None = None) -> bool:
+        return False
+
+    def has_delete_permission(self, request: HttpRequest, obj: TaskEvent | None = None) -> bool:
+        return False
+
+
+admin.site.register((
+    TaskEvent,
+), TaskEventAdmin)
+
+
+class TaskReminderAdmin(admin.ModelAdmin):
+    """The sent reminders are the guard against the repeated sending, so they are read-only in the admin."""
+    list_display = ('id', 'task_id', 'kind', 'deadline', 'recipient', 'sent_at')
+    list_filter = ('kind',)
+    ordering = ('-id',)
+    # The sent reminders grow with the tasks, they are counted the same as the activity log.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: TaskReminder | None = None) -> bool:
+        return False
+
+    def has_delete_permission(self, request: HttpRequest, obj: TaskReminder | None = None) -> bool:
+        return False
+
+
+admin.site.register((
+    TaskReminder,
+), TaskReminderAdmin)
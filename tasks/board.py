@@ -0,0 +1,38 @@
+from django.db.models import Q
+from django.db.models import QuerySet
+
+from app_config.pagination import CompositeKeysetPaginator
+from app_config.pagination import KeysetPage
+from tasks.models import Task
+from tasks.models import TaskStatus
+
+
+# The tasks of the column are ordered by the priority (urgent first) and the deadline (the nearest first, none last),
+# the page is the range scan of the `task_section_board_idx` index.
+BOARD_ORDERING = ('priority', 'deadline')
+# The dashboard of the executor is ordered by the deadline first, the page is the range scan of `task_executor_idx`.
+DASHBOARD_ORDERING = ('deadline', 'priority')
+PER_COLUMN = 20
+
+
+def get_column_paginator(queryset: QuerySet[Task], status: str, per_page: int = PER_COLUMN, orderings: tuple[str, ...] = BOARD_ORDERING) -> CompositeKeysetPaginator:  # noqa E501
+    return CompositeKeysetPaginator(queryset=queryset.filter(status=status), orderings=orderings, per_page=per_page)
+
+
+def get_board_pages(queryset: QuerySet[Task], filters: Q, per_page: int = PER_COLUMN, orderings: tuple[str, ...] = BOARD_ORDERING) -> dict[str, KeysetPage]:  # noqa E501
+    """
+    The first pages of all status columns of the `filters` tasks by one query. Every column is selected by its own
+    subquery limited by the page size, so the cost doesn't depend on the amount of tasks in the section (or of the
+    executor). The `queryset` loads the selected tasks only by the primary key, so it must not be filtered.
+    """
+    paginators = {
+        status: get_column_paginator(queryset.filter(filters), status, per_page, orderings)
+        for status in TaskStatus.values
+    }
+    pks = Q()
+    for paginator in paginators.values():
+        pks |= Q(pk__in=paginator.get_page_queryset(cursor=None).values('pk'))
+    columns = {status: list() for status in paginators}
+    for task in queryset.filter(pks).order_by(*next(iter(paginators.values())).get_ordering()):
+        columns[task.status].append(task)
+    return {status: paginator.build_page(columns[status], cursor=None) for status, paginator in paginators.items()}
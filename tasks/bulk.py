@@ -0,0 +1,158 @@
+from collections import Counter
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import QuerySet
+
+from app_config.fragments import bump_fragment_versions
+from authentication.models import User
+from projects.access import check_project_access
+from projects.access import get_owned_project_ids
+from projects.access import get_project_members
+from sections.models import Section
+from tasks.activity import TRACKED_ATTNAMES
+from tasks.activity import diff_values
+from tasks.activity import record_task_events
+from tasks.counters import apply_counters_delta
+from tasks.counters import count_section_counters
+from tasks.counters import get_status_overdue_update
+from tasks.deletion import exclude_deleted_sections
+from tasks.models import Task
+from tasks.models import TaskEvent
+from tasks.models import TaskEventAction
+from tasks.models import TaskPriority
+from tasks.models import TaskStatus
+
+
+BULK_FIELDS = ('status', 'priority', 'executor', 'section')
+BATCH_SIZE = 1000
+
+
+def is_id(value: Any) -> bool:
+    """Whether the JSON value is the integer, the `bool` is the subclass of `int` but neither the id nor the priority."""
+    return type(value) is int
+
+
+def clean_bulk_changes(user: Any, changes: dict[str, Any]) -> dict[str, Any]:
+    """Validates the changes of the bulk update, the target section must be in the project owned by user."""
+    unknown = [field for field in changes if field not in BULK_FIELDS]
+    if unknown:
+        raise ValidationError(f'Unknown fields: {", ".join(unknown)}. Allowed fields: {", ".join(BULK_FIELDS)}.')
+    if not changes:
+        raise ValidationError('Nothing to change.')
+
+    cleaned = dict()
+    if 'status' in changes:
+        if not isinstance(changes['status'], str) or changes['status'] not in TaskStatus.values:
+            raise ValidationError(f'Invalid status: {changes["status"]}.')
+        cleaned['status'] = changes['status']
+    if 'priority' in changes:
+        if not is_id(changes['priority']) or changes['priority'] not in TaskPriority.values:
+            raise ValidationError(f'Invalid priority: {changes["priority"]}.')
+        cleaned['priority'] = changes['priority']
+    if 'executor' in changes:
+        executor_id = changes['executor']
+        if executor_id is not None and not is_id(executor_id):
+            raise ValidationError(f'Invalid executor: {executor_id}.')
+        if executor_id is not None and not User.objects.filter(pk=executor_id).exists():
+            raise ValidationError(f'No user with id: {executor_id}.')
+        cleaned['executor_id'] = executor_id
+    if 'section' in changes:
+        if not is_id(changes['section']):
+            raise ValidationError(f'Invalid section: {changes["section"]}.')
+        project_id = Section.objects.filter(pk=changes['section']).values_list('project_id', flat=True).first()
+        if project_id is None or not check_project_access(user=user, project_pk=project_id, owner_only=True):
+            raise ValidationError(f'No section with id: {changes["section"]}.')
+        cleaned['section_id'] = changes['section']
+    return cleaned
+
+
+def check_bulk_executor(tasks: QuerySet[Task], changes: dict[str, Any]):
+    """The new executor must be the owner or a member of every project of the tasks, of the target section when moved."""
+    executor_id = changes.get('executor_id')
+    if executor_id is None:
+        return
+    if 'section_id' in changes:
+        project_ids = Section.objects.filter(pk=changes['section_id']).values_list('project_id', flat=True)
+    else:
+        project_ids = tasks.order_by().values_list('section__project_id', flat=True).distinct()
+    for project_id in project_ids:
+        if executor_id not in get_project_members(project_id):
+            raise ValidationError(f'The user {executor_id} is not a member of the project {project_id}.')
+
+
+def filter_writable_tasks(user: Any, tasks: QuerySet[Task]) -> QuerySet[Task]:
+    """The tasks can be changed in bulk only by the owner of project or superuser, not in the deleted sections."""
+    tasks = exclude_deleted_sections(tasks)
+    if user.is_superuser:
+        return tasks
+    return tasks.filter(section__project__pk__in=get_owned_project_ids(user))
+
+
+def build_batch_events(batch: QuerySet[Task], changes: dict[str, Any], actor_id: int | None) -> list[TaskEvent]:
+    """The events of the batch update, the changed fields are read with one query before the `UPDATE`."""
+    fields = {field: attname for field, attname in TRACKED_ATTNAMES.items() if attname in changes}
+    after = {field: changes[attname] for field, attname in fields.items()}
+    project_id = None
+    if 'section_id' in changes:
+        # All tasks of the batch are moved to the same section.
+        project_id = Section.objects.filter(pk=changes['section_id']).values_list('project_id', flat=True).first()
+    moved = 'section_id' in changes
+    events = list()
+    for values in batch.values('pk', 'section_id', 'section__project_id', *fields.values()):
+        diff = diff_values({field: values[attname] for field, attname in fields.items()}, after)
+        if not diff:
+            continue
+        events.append(TaskEvent(
+            task_id=values['pk'],
+            section_id=changes['section_id'] if moved else values['section_id'],
+            project_id=project_id if moved else values['section__project_id'],
+            actor_id=actor_id,
+            action=TaskEventAction.UPDATED,
+            changes=diff,
+        ))
+    return events
+
+
+def update_tasks_batch(task_ids: list[int], changes: dict[str, Any], actor_id: int | None = None) -> int:
+    """
+    Updates the batch with one `UPDATE` and moves the task counters by the difference of the batch aggregates.
+    The events of the batch are appended to the activity log with one `INSERT` after the commit.
+    """
+    with transaction.atomic():
+        batch = Task.objects.filter(pk__in=task_ids)
+        before = count_section_counters(tasks=batch)
+        record_task_events(build_batch_events(batch=batch, changes=changes, actor_id=actor_id))
+        overdue = dict()
+        if 'status' in changes:
+            # The counted overdue state follows the new status, the same as by the save of the task.
+            overdue['is_overdue'] = get_status_overdue_update(changes['status'])
+        amount = batch.update(**changes, **overdue)
+        after = count_section_counters(tasks=batch)
+        for section_id in before.keys() | after.keys():
+            delta = Counter(after.get(section_id, dict()))
+            delta.subtract(before.get(section_id, dict()))
+            apply_counters_delta(section_id=section_id, delta=delta)
+        # The `update` sends no signals, so the fragments of the changed sections are invalidated here.
+        bump_fragment_versions(Section, before.keys() | after.keys())
+    return amount
+
+
+def bulk_update_tasks(user: Any, tasks: QuerySet[Task], changes: dict[str, Any], batch_size: int = BATCH_SIZE) -> int:
+    """
+    Changes the status, priority, executor or section of the tasks with one set-based `UPDATE` per batch.
+    The tasks without the write access of user are skipped, returns the amount of updated tasks.
+    """
+    changes = clean_bulk_changes(user=user, changes=changes)
+    tasks = filter_writable_tasks(user=user, tasks=tasks).order_by('pk')
+    check_bulk_executor(tasks=tasks, changes=changes)
+    amount = 0
+    last_pk = 0
+    while True:
+        # The keyset over the primary key, the updated tasks may not match the filters of `tasks` anymore.
+        task_ids = list(tasks.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+        if not task_ids:
+            return amount
+        amount += update_tasks_batch(task_ids=task_ids, changes=changes, actor_id=user.pk)
+        last_pk = task_ids[-1]
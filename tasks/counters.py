@@ -0,0 +1,219 @@
+import datetime as dt
+from collections import Counter
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from app_config.fragments import bump_fragment_versions
+from projects.models import Project
+from sections.models import Section
+from tasks.models import Task
+from tasks.models import TaskPriority
+from tasks.models import TaskStatus
+
+
+STATUS_FIELDS = {
+    TaskStatus.TO_DO: 'tasks_to_do',
+    TaskStatus.IN_PROGRESS: 'tasks_in_progress',
+    TaskStatus.DONE: 'tasks_done',
+}
+PRIORITY_FIELDS = {
+    TaskPriority.URGENT: 'tasks_urgent',
+    TaskPriority.HIGH: 'tasks_high',
+    TaskPriority.MEDIUM: 'tasks_medium',
+    TaskPriority.LOW: 'tasks_low',
+}
+OVERDUE_FIELD = 'tasks_overdue'
+COUNTER_FIELDS = (*STATUS_FIELDS.values(), *PRIORITY_FIELDS.values(), OVERDUE_FIELD)
+BATCH_SIZE = 1000
+# The open tasks with the deadline which are not counted as overdue, the condition of `task_pending_overdue_idx`.
+PENDING_OVERDUE = Q(deadline__isnull=False) & ~Q(status=TaskStatus.DONE) & Q(is_overdue=False)
+
+
+def is_task_overdue(status: str, deadline: dt.datetime | None) -> bool:
+    """Whether the task is overdue now, stored by the write as the `Task.is_overdue` which is counted."""
+    return status != TaskStatus.DONE and deadline is not None and deadline < timezone.now()
+
+
+class CountedState(NamedTuple):
+    """
+    The values of task which are counted by the counters of its section and project. The overdue state is the stored
+    `Task.is_overdue`, not the current clock, so the task which became overdue after its last write is subtracted
+    only when it was added by `count_passed_deadlines`.
+    """
+    section_id: int
+    status: str
+    priority: int
+    is_overdue: bool
+
+    @classmethod
+    def from_task(cls, task: Task) -> 'CountedState':
+        return cls(section_id=task.section_id, status=task.status, priority=task.priority, is_overdue=task.is_overdue)
+
+    def get_counters(self) -> Counter:
+        counters = Counter({STATUS_FIELDS[self.status]: 1, PRIORITY_FIELDS[self.priority]: 1})
+        if self.is_overdue:
+            counters[OVERDUE_FIELD] += 1
+        return counters
+
+
+def overdue_filter() -> Q:
+    """The tasks which are overdue now, by the clock."""
+    return ~Q(status=TaskStatus.DONE) & Q(deadline__lt=timezone.now())
+
+
+def get_status_overdue_update(status: str) -> Case:
+    """The stored overdue state of the rows whose status is changed to `status` by the bulk `UPDATE`."""
+    return Case(When(deadline__lt=timezone.now(), then=Value(status != TaskStatus.DONE)), default=Value(False))
+
+
+def apply_counters_delta(section_id: int, delta: Counter):
+    """Adds the delta to the counters of the section and its project with the `UPDATE ... SET field = field + delta`."""
+    changes = {field: F(field) + value for field, value in delta.items() if value}
+    if not changes:
+        return
+    Section.objects.filter(pk=section_id).update(**changes)
+    Project.objects.filter(sections=section_id).update(**changes)
+
+
+def count_task_change(before: CountedState | None, after: CountedState | None):
+    """Updates the counters for the created (`before` is `None`), changed or deleted (`after` is `None`) task."""
+    if before == after:
+        return
+    if before is not None and after is not None and before.section_id == after.section_id:
+        delta = after.get_counters()
+        delta.subtract(before.get_counters())
+        apply_counters_delta(section_id=after.section_id, delta=delta)
+        return
+    if before is not None:
+        delta = Counter()
+        delta.subtract(before.get_counters())
+        apply_counters_delta(section_id=before.section_id, delta=delta)
+    if after is not None:
+        apply_counters_delta(section_id=after.section_id, delta=after.get_counters())
+
+
+def count_section_counters(section_ids: Iterable[int] | None = None, tasks: QuerySet[Task] | None = None) -> dict[int, dict[str, int]]:  # noqa E501
+    """
+    Aggregates the actual counters of sections from the task table, of all sections when `section_ids` is `None`.
+    The `tasks` limits the counted tasks, e.g. to the batch of the bulk update.
+    """
+    aggregations = {field: Count('pk', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()}
+    aggregations.update({field: Count('pk', filter=Q(priority=priority)) for priority, field in PRIORITY_FIELDS.items()})
+    aggregations[OVERDUE_FIELD] = Count('pk', filter=Q(is_overdue=True))
+    if tasks is None:
+        tasks = Task.objects.all()
+    if section_ids is not None:
+        tasks = tasks.filter(section__in=section_ids)
+    rows = tasks.order_by().values('section_id').annotate(**aggregations)
+    return {row.pop('section_id'): row for row in rows.iterator(chunk_size=BATCH_SIZE)}
+
+
+def get_stale_counters() -> tuple[list[int], list[int]]:
+    """Returns the ids of sections and projects whose stored counters differ from the task table."""
+    actual = count_section_counters()
+    empty = dict.fromkeys(COUNTER_FIELDS, 0)
+    stale_sections = list()
+    project_totals: dict[int, Counter] = dict()
+    for section in Section.objects.values('pk', 'project_id', *COUNTER_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        section_id, project_id = section.pop('pk'), section.pop('project_id')
+        counters = actual.get(section_id, empty)
+        if section != counters:
+            stale_sections.append(section_id)
+        project_totals.setdefault(project_id, Counter()).update(counters)
+    stale_projects = list()
+    for project in Project.objects.values('pk', *COUNTER_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        project_id = project.pop('pk')
+        totals = project_totals.get(project_id, Counter())
+        if any(project[field] != totals[field] for field in COUNTER_FIELDS):
+            stale_projects.append(project_id)
+    return stale_sections, stale_projects
+
+
+def count_subquery(filters: Q) -> Coalesce:
+    """The correlated subquery counting the tasks of the outer section, it reads the `(section, field, id)` index only."""
+    tasks = Task.objects.filter(filters, section=OuterRef('pk')).order_by().values('section')
+    return Coalesce(Subquery(tasks.annotate(amount=Count('pk')).values('amount')), 0)
+
+
+def rebuild_counters(section_ids: Iterable[int] | None = None) -> int:
+    """
+    Recounts the counters of the sections (all when `section_ids` is `None`) and of their projects from the task table
+    with one `UPDATE` of correlated subqueries per table.
+    The stored overdue states of the tasks are refreshed by the clock first, e.g. of the restored or inserted tasks.
+    Returns the amount of the updated sections.
+    """
+    changes = {field: count_subquery(Q(status=status)) for status, field in STATUS_FIELDS.items()}
+    changes.update({field: count_subquery(Q(priority=priority)) for priority, field in PRIORITY_FIELDS.items()})
+    changes[OVERDUE_FIELD] = count_subquery(Q(is_overdue=True))
+    sections = Section.objects.all()
+    projects = Project.objects.all()
+    tasks = Task.objects.all()
+    if section_ids is not None:
+        section_ids = list(section_ids)
+        sections = sections.filter(pk__in=section_ids)
+        projects = projects.filter(pk__in=set(sections.values_list('project_id', flat=True)))
+        tasks = tasks.filter(section__in=section_ids)
+    with transaction.atomic():
+        refresh_overdue_states(tasks)
+        amount = sections.update(**changes)
+        rebuild_project_counters(projects=projects)
+    return amount
+
+
+def rebuild_project_counters(projects: QuerySet[Project] | None = None):
+    """Sums the counters of the project sections, the projects without sections get zero counters."""
+    if projects is None:
+        projects = Project.objects.all()
+    sections = Section.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    projects.update(**{
+        field: Coalesce(Subquery(sections.annotate(amount=Sum(field)).values('amount')), 0)
+        for field in COUNTER_FIELDS
+    })
+
+
+def get_stale_overdue_states(tasks: QuerySet[Task] | None = None) -> QuerySet[Task]:
+    """The tasks whose stored overdue state differs from the clock, e.g. when `count_passed_deadlines` is not run."""
+    if tasks is None:
+        tasks = Task.objects.all()
+    return tasks.filter((overdue_filter() & Q(is_overdue=False)) | (~overdue_filter() & Q(is_overdue=True)))
+
+
+def refresh_overdue_states(tasks: QuerySet[Task]) -> int:
+    """Stores the current overdue state of the tasks without updating the counters, for the following recount."""
+    amount = tasks.filter(overdue_filter(), is_overdue=False).update(is_overdue=True)
+    return amount + tasks.filter(~overdue_filter(), is_overdue=True).update(is_overdue=False)
+
+
+def count_passed_deadlines(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Adds the open tasks whose deadline passed since their last write to the overdue counters of their sections and
+    projects, by the batches of the partial index `task_pending_overdue_idx`. Returns the amount of the counted tasks.
+    """
+    amount = 0
+    while True:
+        with transaction.atomic():
+            # The locked rows are not changed by the concurrent save between the read and the `UPDATE`.
+            pending = Task.objects.select_for_update().filter(PENDING_OVERDUE, deadline__lt=timezone.now())
+            rows = list(pending.order_by('deadline', 'pk').values_list('pk', 'section_id')[:batch_size])
+            if not rows:
+                return amount
+            Task.objects.filter(pk__in=[pk for pk, _ in rows]).update(is_overdue=True)
+            sections = Counter(section_id for _, section_id in rows)
+            for section_id, overdue in sections.items():
+                apply_counters_delta(section_id=section_id, delta=Counter({OVERDUE_FIELD: overdue}))
+            bump_fragment_versions(Section, sections.keys())
+        amount += len(rows)
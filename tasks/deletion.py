@@ -0,0 +1,127 @@
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from django.db import router
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from app_config.fragments import bump_fragment_versions
+from projects.access import invalidate_project_members
+from projects.access import revoke_project_access
+from projects.models import Project
+from projects.models import ProjectRole
+from sections.models import Section
+from tasks.counters import rebuild_project_counters
+from tasks.models import Task
+
+
+# The rows deleted by one short transaction of the purge, the other writers wait at most for one batch.
+BATCH_SIZE = 1000
+
+
+class PurgeProgress(NamedTuple):
+    """
+    The progress of the purge of the deleted section (the deleted tasks) or project (the deleted members),
+    reported after every batch and after the row of the section or project is deleted.
+    """
+    model: str
+    pk: int
+    deleted: int
+    total: int
+    finished: bool
+
+
+def soft_delete_project(project: Project):
+    """
+    Marks the project and its sections as deleted, so they are hidden from the views at once, and revokes the access.
+    The rows are removed by the batches of `purge_deleted` in the background instead of one long cascade.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk).update(deleted_at=now)
+        sections = Section.objects.filter(project=project.pk)
+        section_ids = list(sections.values_list('pk', flat=True))
+        sections.update(deleted_at=now)
+        for role in ProjectRole.values:
+            revoke_project_access(project_id=project.pk, user_ids=None, role=role)
+        invalidate_project_members((project.pk,))
+        # The `update` sends no signals, so the fragments are invalidated here.
+        bump_fragment_versions(Project, (project.pk,))
+        bump_fragment_versions(Section, section_ids)
+    project.deleted_at = now
+
+
+def soft_delete_section(section: Section):
+    """Marks the section as deleted and recounts the counters of its project without the tasks of the section."""
+    now = timezone.now()
+    with transaction.atomic():
+        Section.objects.filter(pk=section.pk).update(deleted_at=now)
+        rebuild_project_counters(projects=Project.objects.filter(pk=section.project_id))
+        bump_fragment_versions(Section, (section.pk,))
+        bump_fragment_versions(Project, (section.project_id,))
+    section.deleted_at = now
+
+
+def get_deleted_sections() -> QuerySet[Section]:
+    """The ids of the deleted sections which are not purged yet, read by the partial index `section_deleted_idx`."""
+    return Section.all_objects.filter(deleted_at__isnull=False).values('pk')
+
+
+def exclude_deleted_sections(tasks: QuerySet[Task]) -> QuerySet[Task]:
+    """The tasks without the tasks of the deleted sections, which are still in the table until the purge."""
+    return tasks.exclude(section__in=get_deleted_sections())
+
+
+def delete_in_batches(queryset: QuerySet, batch_size: int) -> Iterator[int]:
+    """
+    Deletes the rows by the batches of primary keys, each batch by one `DELETE` in its own transaction,
+    yields the amount of the deleted rows after every batch. The signals are not sent and the objects are not loaded.
+    """
+    using = router.db_for_write(queryset.model)
+    while batch := list(queryset.using(using).order_by('pk').values_list('pk', flat=True)[:batch_size]):
+        with transaction.atomic(using=using):
+            deleted = queryset.model._base_manager.using(using).filter(pk__in=batch)._raw_delete(using)
+        yield deleted
+
+
+def purge_section(section_id: int, batch_size: int = BATCH_SIZE) -> Iterator[PurgeProgress]:
+    """
+    Deletes the tasks of the deleted section by the batches and then the section itself.
+    The counters are not updated, the counters of the project were recounted without the section by the soft delete.
+    The activity log and the sent reminders of the tasks are kept, the same as for the cascade delete.
+    """
+    tasks = Task.objects.filter(section=section_id)
+    total = tasks.count()
+    deleted = 0
+    for amount in delete_in_batches(tasks, batch_size):
+        deleted += amount
+        yield PurgeProgress(model='section', pk=section_id, deleted=deleted, total=total, finished=False)
+    # The tasks created by the requests which raced with the soft delete are removed by the cascade.
+    Section.all_objects.filter(pk=section_id).delete()
+    yield PurgeProgress(model='section', pk=section_id, deleted=deleted, total=total, finished=True)
+
+
+def purge_project(project_id: int, batch_size: int = BATCH_SIZE) -> Iterator[PurgeProgress]:
+    """Deletes the sections of the deleted project one by one, then its members by the batches and the project itself."""
+    sections = Section.all_objects.filter(project=project_id).order_by('pk').values_list('pk', flat=True)
+    for section_id in list(sections):
+        yield from purge_section(section_id, batch_size=batch_size)
+    # The access of the members was revoked by the soft delete, the rows of the through table have no signals.
+    members = Project.members.through.objects.filter(project=project_id)
+    total = members.count()
+    deleted = 0
+    for amount in delete_in_batches(members, batch_size):
+        deleted += amount
+        yield PurgeProgress(model='project', pk=project_id, deleted=deleted, total=total, finished=False)
+    Project.all_objects.filter(pk=project_id).delete()
+    yield PurgeProgress(model='project', pk=project_id, deleted=deleted, total=total, finished=True)
+
+
+def purge_deleted(batch_size: int = BATCH_SIZE) -> Iterator[PurgeProgress]:
+    """Purges the deleted sections and then the deleted projects, the oldest first."""
+    for section_id in list(get_deleted_sections().order_by('deleted_at', 'pk').values_list('pk', flat=True)):
+        yield from purge_section(section_id, batch_size=batch_size)
+    projects = Project.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at', 'pk')
+    for project_id in list(projects.values_list('pk', flat=True)):
+        yield from purge_project(project_id, batch_size=batch_size)
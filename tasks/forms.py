@@ -1,8 +1,54 @@
+from typing import Any
 
+from django import forms
+from django.core.exceptions import ValidationError
+
+from app_config.widgets import AutocompleteSelect
+from authentication.models import User
 from tasks.admin import TaskAdminForm
+from tasks.models import TaskPriority
+from tasks.models import TaskStatus
+
+
+class ProjectMemberChoiceField(forms.ModelChoiceField):
+    """
+    The user of the project chosen by the autocomplete. The choices are the cached members of the project,
+    so the form is rendered without the query and the user is loaded only when the member is chosen.
+    """
+
+    def __init__(self, members: dict[int, str], url: str, **kwargs):
+        self.members = members
+        super().__init__(queryset=User.objects.all(), widget=AutocompleteSelect(url=url), **kwargs)
+
+    def _get_choices(self) -> list[tuple[Any, str]]:
+        return [('', self.empty_label or ''), *self.members.items()]
+
+    choices = property(_get_choices, forms.ChoiceField.choices.fset)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def to_python(self, value: Any) -> User | None:
+        if value in self.empty_values:
+            return None
+        try:
+            is_member = int(value) in self.members
+        except (TypeError, ValueError):
+            is_member = False
+        if not is_member:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+        return super().to_python(value)
 
 
 class TaskCreateForm(TaskAdminForm):
+    def __init__(self, *args, members: dict[int, str], members_url: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only the owner and the members of the project can be the executor.
+        executor = self.fields['executor']
+        self.fields['executor'] = ProjectMemberChoiceField(
+            members=members,
+            url=members_url,
+            required=executor.required,
+            label=executor.label,
+        )
+
     class Meta(TaskAdminForm.Meta):
         fields = (
             'title',
@@ -11,3 +57,93 @@ class TaskCreateForm(TaskAdminForm):
             'executor',
             'deadline',
         )
+
+
+class TaskFilterForm(forms.Form):
+    ORDERING_CHOICES = (
+        ('priority', 'Priority (urgent first)'),
+        ('-priority', 'Priority (low first)'),
+        ('deadline', 'Deadline (nearest first)'),
+        ('-deadline', 'Deadline (farthest first)'),
+        ('status', 'Status (ascending)'),
+        ('-status', 'Status (descending)'),
+        ('executor', 'Executor (ascending)'),
+        ('-executor', 'Executor (descending)'),
+    )
+
+    status = forms.ChoiceField(
+        required=False,
+        choices=(('', 'Any'), *TaskStatus.choices),
+    )
+    priority = forms.TypedChoiceField(
+        required=False,
+        coerce=int,
+        empty_value=None,
+        choices=(('', 'Any'), *TaskPriority.choices),
+    )
+    executor = forms.ModelChoiceField(
+        required=False,
+        queryset=User.objects.none(),
+        empty_label='Any',
+    )
+    deadline_from = forms.DateTimeField(
+        required=False,
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+    )
+    deadline_to = forms.DateTimeField(
+        required=False,
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+    )
+    ordering = forms.ChoiceField(
+        required=False,
+        choices=ORDERING_CHOICES,
+    )
+
+    def __init__(self, *args, executors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if executors is not None:
+            self.fields['executor'].queryset = executors  # pyright: ignore[reportAttributeAccessIssue]
+
+    async def aload_executor_choices(self):
+        """
+        Loads the executors by the async ORM and replaces the model choice field by the choice field of their ids,
+        so the validation and the rendering of the form don't query the database. Called before the validation.
+        """
+        field = self.fields['executor']
+        executors = [(user.pk, field.label_from_instance(user)) async for user in field.queryset]  # pyright: ignore[reportAttributeAccessIssue]  # noqa E501
+        self.fields['executor'] = forms.TypedChoiceField(
+            required=False,
+            coerce=int,
+            empty_value=None,
+            choices=(('', field.empty_label), *executors),  # pyright: ignore[reportAttributeAccessIssue]
+        )
+
+    def get_filters(self) -> dict:
+        if not self.is_valid():
+            return dict()
+        data = self.cleaned_data
+        filters = dict()
+        if data['status']:
+            filters['status'] = data['status']
+        if data['priority'] is not None:
+            filters['priority'] = data['priority']
+        if data['executor'] is not None:
+            filters['executor'] = data['executor']
+        if data['deadline_from'] is not None:
+            filters['deadline__gte'] = data['deadline_from']
+        if data['deadline_to'] is not None:
+            filters['deadline__lte'] = data['deadline_to']
+        return filters
+
+    def get_ordering(self, default: str) -> str:
+        if not self.is_valid():
+            return default
+        return self.cleaned_data['ordering'] or default
+
+
+class TaskSearchForm(forms.Form):
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        label='Search',
+    )
@@ -0,0 +1,42 @@
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from app_config.broker import get_broker
+from tasks.models import TaskEvent
+
+
+def get_section_channel(section_id: int) -> str:
+    return f'section:{section_id}:tasks'
+
+
+def get_event_message(event: TaskEvent) -> dict[str, Any]:
+    """The event as the JSON message of the broker and the data of the Server-Sent Event."""
+    return {
+        'id': event.pk,
+        'action': event.action,
+        'task': event.task_id,  # pyright: ignore[reportAttributeAccessIssue]
+        'section': event.section_id,  # pyright: ignore[reportAttributeAccessIssue]
+        'actor': event.actor_id,  # pyright: ignore[reportAttributeAccessIssue]
+        'changes': event.changes,
+    }
+
+
+def publish_task_events(events: Iterable[TaskEvent]):
+    """Publishes the events to the channels of their sections, the moved task to the channel of the previous section too."""  # noqa E501
+    broker = get_broker()
+    for event in events:
+        # The values of the changes (the datetimes) are the same as in the events replayed from the log.
+        message = json.loads(json.dumps(get_event_message(event), cls=DjangoJSONEncoder))
+        section_ids = {event.section_id}  # pyright: ignore[reportAttributeAccessIssue]
+        if 'section' in event.changes and event.changes['section'][0] is not None:
+            section_ids.add(event.changes['section'][0])
+        for section_id in section_ids:
+            broker.publish(get_section_channel(section_id), message)
+
+
+def format_event(message: dict[str, Any]) -> str:
+    """The Server-Sent Event of the message, the id lets the reconnected client continue from the last event."""
+    return f'id: {message["id"]}\nevent: {message["action"]}\ndata: {json.dumps(message, cls=DjangoJSONEncoder)}\n\n'
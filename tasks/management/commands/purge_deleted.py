@@ -0,0 +1,51 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from tasks.deletion import BATCH_SIZE
+from tasks.deletion import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove the rows of the deleted projects and sections. The delete views only mark them as deleted, '
+        'the worker deletes their tasks by the short transactions of the batches, so the other writers are not blocked.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Purge the deleted projects and sections and exit, for the cron instead of the long-running worker.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=30,
+            help='The seconds between the checks of the new deleted projects and sections.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='The rows deleted by one transaction.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                for progress in purge_deleted(batch_size=options['batch_size']):
+                    rows = 'tasks' if progress.model == 'section' else 'members'
+                    state = 'purged' if progress.finished else 'in progress'
+                    self.stdout.write(
+                        f'{progress.model.capitalize()} {progress.pk} {state}: '
+                        f'{progress.deleted}/{progress.total} {rows} deleted.'
+                    )
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                # The worker outlives the connections of the `CONN_MAX_AGE` and the restarted database.
+                close_old_connections()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
@@ -0,0 +1,32 @@
+from django.core.management import BaseCommand
+from django.core.management import CommandError
+
+from tasks.counters import get_stale_counters
+from tasks.counters import get_stale_overdue_states
+from tasks.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Check the denormalized task counters of sections and projects and rebuild them from the task table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report the stale counters, exit with the error if there are any.',
+        )
+
+    def handle(self, *args, **options):
+        stale_sections, stale_projects = get_stale_counters()
+        self.stdout.write(f'Stale counters: {len(stale_sections)} sections, {len(stale_projects)} projects.')
+        # The passed deadlines are counted by the `send_deadline_reminders` worker, the stale states are not counted yet.
+        stale_states = get_stale_overdue_states().count()
+        self.stdout.write(f'Stale overdue states: {stale_states} tasks.')
+
+        if options['check']:
+            if stale_sections or stale_projects or stale_states:
+                raise CommandError('The task counters are stale, run the command without --check to rebuild them.')
+            return
+
+        amount = rebuild_counters()
+        self.stdout.write(f'The task counters are rebuilt: {amount} sections.')
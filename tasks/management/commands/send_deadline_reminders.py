@@ -0,0 +1,68 @@
+import datetime as dt
+import time
+
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from tasks.counters import count_passed_deadlines
+from tasks.reminders import CATCH_UP
+from tasks.reminders import REMINDER_LEAD
+from tasks.reminders import SCHEDULE_HORIZON
+from tasks.reminders import ReminderSchedule
+
+
+class Command(BaseCommand):
+    help = (
+        'Send the reminders of the upcoming and overdue task deadlines by email and add the passed deadlines '
+        'to the overdue counters. The worker keeps running and refreshes its schedule every interval, '
+        'the deadlines are read by the partial indexes of the open tasks.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send the due reminders and exit, for the cron instead of the long-running worker.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=30,
+            help='The seconds between the refreshes of the schedule.',
+        )
+        parser.add_argument(
+            '--lead-minutes',
+            type=int,
+            default=int(REMINDER_LEAD.total_seconds() // 60),
+            help='The minutes before the deadline when the upcoming reminder is sent.',
+        )
+
+    def handle(self, *args, **options):
+        interval = dt.timedelta(seconds=options['interval'])
+        schedule = ReminderSchedule(
+            lead=dt.timedelta(minutes=options['lead_minutes']),
+            horizon=max(SCHEDULE_HORIZON, interval),
+            catch_up=CATCH_UP,
+        )
+        schedule.start(timezone.now())
+        self.stdout.write(f'Scheduled reminders: {len(schedule)}.')
+        try:
+            while True:
+                now = timezone.now()
+                sent = schedule.send_due(now)
+                if sent:
+                    self.stdout.write(f'Sent reminders: {sent}.')
+                counted = count_passed_deadlines()
+                if counted:
+                    self.stdout.write(f'Counted overdue tasks: {counted}.')
+                if options['once']:
+                    return
+                next_due_at = schedule.get_next_due_at()
+                wake_at = now + interval if next_due_at is None else min(now + interval, next_due_at)
+                time.sleep(max((wake_at - timezone.now()).total_seconds(), 0))
+                # The worker outlives the connections of the `CONN_MAX_AGE` and the restarted database.
+                close_old_connections()
+                schedule.refresh(timezone.now())
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
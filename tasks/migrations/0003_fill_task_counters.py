@@ -0,0 +1,50 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models import Q
+from django.db.models import Sum
+from django.utils import timezone
+
+
+STATUS_FIELDS = {
+    'TO_DO': 'tasks_to_do',
+    'IN_PROGRESS': 'tasks_in_progress',
+    'DONE': 'tasks_done',
+}
+PRIORITY_FIELDS = {
+    1: 'tasks_urgent',
+    2: 'tasks_high',
+    3: 'tasks_medium',
+    4: 'tasks_low',
+}
+OVERDUE_FIELD = 'tasks_overdue'
+COUNTER_FIELDS = (*STATUS_FIELDS.values(), *PRIORITY_FIELDS.values(), OVERDUE_FIELD)
+
+
+def fill_task_counters(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Section = apps.get_model('sections', 'Section')
+    Project = apps.get_model('projects', 'Project')
+
+    aggregations = {field: Count('pk', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()}
+    aggregations.update({field: Count('pk', filter=Q(priority=priority)) for priority, field in PRIORITY_FIELDS.items()})
+    aggregations[OVERDUE_FIELD] = Count('pk', filter=~Q(status='DONE') & Q(deadline__lt=timezone.now()))
+    rows = Task.objects.order_by().values('section_id').annotate(**aggregations)
+    sections = [Section(pk=row.pop('section_id'), **row) for row in rows]
+    Section.objects.bulk_update(sections, fields=COUNTER_FIELDS, batch_size=1000)
+
+    totals = Section.objects.order_by().values('project_id').annotate(**{field: Sum(field) for field in COUNTER_FIELDS})
+    projects = [Project(pk=row.pop('project_id'), **row) for row in totals]
+    Project.objects.bulk_update(projects, fields=COUNTER_FIELDS, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_task_counters'),
+        ('sections', '0002_task_counters'),
+        ('tasks', '0002_task_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=fill_task_counters, reverse_code=migrations.RunPython.noop),
+    ]
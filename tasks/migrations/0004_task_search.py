@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+SQLITE_FORWARD = (
+    # The external content table: the index stores only the tokens, the text is read from the task table.
+    "CREATE VIRTUAL TABLE tasks_task_search USING fts5("
+    "title, description, content='tasks_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER tasks_task_search_insert AFTER INSERT ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_search (rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER tasks_task_search_delete AFTER DELETE ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_search (tasks_task_search, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER tasks_task_search_update AFTER UPDATE OF title, description ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_search (tasks_task_search, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_task_search (rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO tasks_task_search (tasks_task_search) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    'DROP TRIGGER IF EXISTS tasks_task_search_update',
+    'DROP TRIGGER IF EXISTS tasks_task_search_delete',
+    'DROP TRIGGER IF EXISTS tasks_task_search_insert',
+    'DROP TABLE IF EXISTS tasks_task_search',
+)
+POSTGRESQL_FORWARD = (
+    "CREATE INDEX tasks_task_search_idx ON tasks_task "
+    "USING GIN (to_tsvector('simple'::regconfig, tasks_task.title || ' ' || tasks_task.description))",
+)
+POSTGRESQL_BACKWARD = (
+    'DROP INDEX IF EXISTS tasks_task_search_idx',
+)
+STATEMENTS = {
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+    'postgresql': (POSTGRESQL_FORWARD, POSTGRESQL_BACKWARD),
+}
+
+
+def create_search_index(apps, schema_editor):
+    forward, _ = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in forward:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    _, backward = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in backward:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_fill_task_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
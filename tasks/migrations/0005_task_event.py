@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:09
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_task_counters'),
+        ('sections', '0002_task_counters'),
+        ('tasks', '0004_task_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('CREATED', 'Created'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], verbose_name='Action')),
+                ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Changes')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='task_events', to=settings.AUTH_USER_MODEL, verbose_name='Actor')),
+                ('project', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='task_events', to='projects.project', verbose_name='Project')),
+                ('section', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='task_events', to='sections.section', verbose_name='Section')),
+                ('task', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='events', to='tasks.task', verbose_name='Task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'id'], name='task_event_task_idx'), models.Index(fields=['section', 'id'], name='task_event_section_idx'), models.Index(fields=['project', 'id'], name='task_event_project_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0002_task_counters'),
+        ('tasks', '0005_task_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['section', 'status', 'priority', 'deadline', 'id'], name='task_section_board_idx'),
+        ),
+    ]
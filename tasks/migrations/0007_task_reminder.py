@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0002_task_counters'),
+        ('tasks', '0006_task_board_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('UPCOMING', 'Upcoming'), ('OVERDUE', 'Overdue')], verbose_name='Kind')),
+                ('deadline', models.DateTimeField(verbose_name='Deadline')),
+                ('recipient', models.EmailField(blank=True, max_length=254, verbose_name='Recipient')),
+                ('sent_at', models.DateTimeField(auto_now_add=True, verbose_name='Sent at')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deadline__isnull', False), models.Q(('status', 'DONE'), _negated=True)), fields=['deadline', 'id'], name='task_open_deadline_idx'),
+        ),
+        migrations.AddField(
+            model_name='taskreminder',
+            name='task',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='reminders', to='tasks.task', verbose_name='Task'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskreminder',
+            constraint=models.UniqueConstraint(fields=('task', 'kind', 'deadline'), name='task_reminder_unique'),
+        ),
+    ]
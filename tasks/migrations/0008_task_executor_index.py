@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0002_task_counters'),
+        ('tasks', '0007_task_reminder'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['executor', 'status', 'deadline', 'priority', 'id'], name='task_executor_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:01
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models import Q
+from django.db.models import Sum
+from django.utils import timezone
+
+
+STATUS_FIELDS = {
+    'TO_DO': 'tasks_to_do',
+    'IN_PROGRESS': 'tasks_in_progress',
+    'DONE': 'tasks_done',
+}
+PRIORITY_FIELDS = {
+    1: 'tasks_urgent',
+    2: 'tasks_high',
+    3: 'tasks_medium',
+    4: 'tasks_low',
+}
+OVERDUE_FIELD = 'tasks_overdue'
+COUNTER_FIELDS = (*STATUS_FIELDS.values(), *PRIORITY_FIELDS.values(), OVERDUE_FIELD)
+
+
+def fill_blank_status(apps, schema_editor):
+    """
+    The blank status was accepted by the forms, but it has no counter, so the write of such task failed after the row
+    was saved. The tasks get the default status and the counters of their sections and projects are recounted.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    Section = apps.get_model('sections', 'Section')
+    Project = apps.get_model('projects', 'Project')
+
+    tasks = Task.objects.filter(status='')
+    section_ids = set(tasks.order_by().values_list('section_id', flat=True).distinct())
+    if not section_ids:
+        return
+    tasks.update(status='TO_DO')
+
+    aggregations = {field: Count('pk', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()}
+    aggregations.update({field: Count('pk', filter=Q(priority=priority)) for priority, field in PRIORITY_FIELDS.items()})
+    aggregations[OVERDUE_FIELD] = Count('pk', filter=~Q(status='DONE') & Q(deadline__lt=timezone.now()))
+    rows = Task.objects.filter(section__in=section_ids).order_by().values('section_id').annotate(**aggregations)
+    sections = [Section(pk=row.pop('section_id'), **row) for row in rows]
+    Section.objects.bulk_update(sections, fields=COUNTER_FIELDS, batch_size=1000)
+
+    # The counters of the project are the sums of its sections which are not deleted.
+    project_ids = Section.objects.filter(pk__in=section_ids).values('project_id')
+    totals = (
+        Section.objects.filter(project__in=project_ids, deleted_at__isnull=True)
+        .order_by().values('project_id').annotate(**{field: Sum(field) for field in COUNTER_FIELDS})
+    )
+    projects = [Project(pk=row.pop('project_id'), **row) for row in totals]
+    Project.objects.bulk_update(projects, fields=COUNTER_FIELDS, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_soft_delete'),
+        ('sections', '0003_soft_delete'),
+        ('tasks', '0009_task_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=fill_blank_status, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('TO_DO', 'To do'), ('IN_PROGRESS', 'In Progress'), ('DONE', 'Done')], default='TO_DO', verbose_name='Status'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:05
+
+import django.db.models.lookups
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0003_soft_delete'),
+        ('tasks', '0010_task_status_not_blank'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_section_board_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(models.F('section'), models.F('status'), models.F('priority'), django.db.models.lookups.IsNull(models.F('deadline'), True), models.F('deadline'), models.F('id'), name='task_section_board_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:06
+
+import django.db.models.lookups
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0003_soft_delete'),
+        ('tasks', '0011_task_board_null_flag_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_executor_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(models.F('executor'), models.F('status'), django.db.models.lookups.IsNull(models.F('deadline'), True), models.F('deadline'), models.F('priority'), models.F('id'), name='task_executor_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:16
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def fill_overdue_states(apps, schema_editor):
+    """
+    Stores the overdue state of the open tasks with the passed deadline and recounts the overdue counters from it,
+    the counters counted by the clock of the writes could miss the deadlines passed after the last write.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    Section = apps.get_model('sections', 'Section')
+    Project = apps.get_model('projects', 'Project')
+
+    Task.objects.filter(~Q(status='DONE'), deadline__lt=timezone.now()).update(is_overdue=True)
+    tasks = Task.objects.filter(section=OuterRef('pk'), is_overdue=True).order_by().values('section')
+    Section.objects.update(tasks_overdue=Coalesce(Subquery(tasks.annotate(amount=Count('pk')).values('amount')), 0))
+    # The counters of the project are the sums of its sections which are not deleted.
+    sections = Section.objects.filter(project=OuterRef('pk'), deleted_at__isnull=True).order_by().values('project')
+    Project.objects.update(
+        tasks_overdue=Coalesce(Subquery(sections.annotate(amount=Sum('tasks_overdue')).values('amount')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_title_prefix_index'),
+        ('sections', '0004_name_prefix_index'),
+        ('tasks', '0012_task_executor_null_flag_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='is_overdue',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Counted as overdue'),
+        ),
+        migrations.RunPython(code=fill_overdue_states, reverse_code=migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deadline__isnull', False), models.Q(('status', 'DONE'), _negated=True), ('is_overdue', False)), fields=['deadline', 'id'], name='task_pending_overdue_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:23
+
+import django.db.models.lookups
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0004_name_prefix_index'),
+        ('tasks', '0013_task_is_overdue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_section_deadline_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_section_executor_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(models.F('section'), django.db.models.lookups.IsNull(models.F('deadline'), True), models.F('deadline'), models.F('id'), name='task_section_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(models.F('section'), django.db.models.lookups.IsNull(models.F('executor'), True), models.F('executor'), models.F('id'), name='task_section_executor_idx'),
+        ),
+    ]
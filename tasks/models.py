@@ -1,9 +1,13 @@
 import datetime as dt
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F
+from django.db.models.lookups import IsNull
 
 from app_config.validators import datetime_not_past_validator
 from authentication.models import User
+from projects.models import Project
 from sections.models import Section
 
 
@@ -43,7 +47,7 @@ class Task(models.Model):
         verbose_name='Priority',
     )
     status = models.CharField(
-        blank=True,
+        blank=False,
         null=False,
         default=TaskStatus.TO_DO,
         choices=TaskStatus.choices,
@@ -81,6 +85,167 @@ class Task(models.Model):
         related_name='tasks',
         verbose_name='Section',
     )
+    # The overdue state counted by the `tasks_overdue` counters: set by the save and by the bulk update of the status,
+    # and by `count_passed_deadlines` when the deadline passes, so the counters don't depend on the clock of the write.
+    is_overdue = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Counted as overdue',
+    )
+
+    class Meta:
+        indexes = (
+            # Composite indexes for the keyset pagination of the section tasks: `(section, field, id)`, the nullable
+            # field is preceded by its NULL flag, the same expressions as the ordering of the `KeysetPaginator`.
+            models.Index(fields=('section', 'priority', 'id'), name='task_section_priority_idx'),
+            models.Index('section', IsNull(F('deadline'), True), 'deadline', 'id', name='task_section_deadline_idx'),
+            models.Index(fields=('section', 'status', 'id'), name='task_section_status_idx'),
+            models.Index('section', IsNull(F('executor'), True), 'executor', 'id', name='task_section_executor_idx'),
+            # The columns of the board: the tasks of the status ordered by `(priority, deadline, id)`, the deadline
+            # is preceded by its NULL flag, the same expressions as the ordering of the `CompositeKeysetPaginator`.
+            models.Index(
+                'section', 'status', 'priority', IsNull(F('deadline'), True), 'deadline', 'id',
+                name='task_section_board_idx',
+            ),
+            # The dashboard of the executor: the tasks of the status ordered by `(deadline, priority, id)`.
+            models.Index(
+                'executor', 'status', IsNull(F('deadline'), True), 'deadline', 'priority', 'id',
+                name='task_executor_idx',
+            ),
+            # The list filters of the admin changelist, ordered by the id (newest first).
+            models.Index(fields=('status', 'id'), name='task_status_idx'),
+            models.Index(fields=('priority', 'id'), name='task_priority_idx'),
+            # The deadlines of the reminders: only the tasks which are not done and have the deadline.
+            models.Index(
+                fields=('deadline', 'id'),
+                condition=models.Q(deadline__isnull=False) & ~models.Q(status=TaskStatus.DONE),
+                name='task_open_deadline_idx',
+            ),
+            # The open deadlines which are not counted as overdue yet, read by `count_passed_deadlines`.
+            models.Index(
+                fields=('deadline', 'id'),
+                condition=(
+                    models.Q(deadline__isnull=False) & ~models.Q(status=TaskStatus.DONE) & models.Q(is_overdue=False)
+                ),
+                name='task_pending_overdue_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title
+
+
+class TaskEventAction(models.TextChoices):
+    CREATED = 'CREATED', 'Created'
+    UPDATED = 'UPDATED', 'Updated'
+    DELETED = 'DELETED', 'Deleted'
+
+
+class TaskEvent(models.Model):
+    """
+    The append-only activity log of tasks, `changes` is the field-level diff `{field: [old, new]}` of the change.
+    The task, section, project and actor have no foreign key constraints, so the log outlives the deleted objects,
+    and the timelines are read by the `(task|section|project, id)` indexes.
+    """
+    task = models.ForeignKey(
+        to=Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='events',
+        verbose_name='Task',
+    )
+    section = models.ForeignKey(
+        to=Section,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='task_events',
+        verbose_name='Section',
+    )
+    project = models.ForeignKey(
+        null=True,
+        to=Project,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='task_events',
+        verbose_name='Project',
+    )
+    actor = models.ForeignKey(
+        blank=True,
+        null=True,
+        to=User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='task_events',
+        verbose_name='Actor',
+    )
+    action = models.CharField(
+        choices=TaskEventAction.choices,
+        verbose_name='Action',
+    )
+    changes = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        verbose_name='Changes',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Created at',
+    )
+
+    class Meta:
+        indexes = (
+            # The timelines are paginated by the keyset over the id (newest first) within the task, section or project.
+            models.Index(fields=('task', 'id'), name='task_event_task_idx'),
+            models.Index(fields=('section', 'id'), name='task_event_section_idx'),
+            models.Index(fields=('project', 'id'), name='task_event_project_idx'),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.get_action_display()} task {self.task_id}'  # pyright: ignore[reportAttributeAccessIssue]
+
+
+class TaskReminderKind(models.TextChoices):
+    UPCOMING = 'UPCOMING', 'Upcoming'
+    OVERDUE = 'OVERDUE', 'Overdue'
+
+
+class TaskReminder(models.Model):
+    """
+    The sent reminder of the task deadline. The unique `(task, kind, deadline)` makes every reminder sent once,
+    the changed deadline is reminded again. Like the activity log, the reminders outlive the deleted tasks.
+    """
+    task = models.ForeignKey(
+        to=Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='reminders',
+        verbose_name='Task',
+    )
+    kind = models.CharField(
+        choices=TaskReminderKind.choices,
+        verbose_name='Kind',
+    )
+    deadline = models.DateTimeField(
+        verbose_name='Deadline',
+    )
+    recipient = models.EmailField(
+        blank=True,
+        verbose_name='Recipient',
+    )
+    sent_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Sent at',
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=('task', 'kind', 'deadline'), name='task_reminder_unique'),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.get_kind_display()} reminder of task {self.task_id}'  # pyright: ignore[reportAttributeAccessIssue]
@@ -0,0 +1,168 @@
+import datetime as dt
+import heapq
+import logging
+from typing import NamedTuple
+
+from django.core.mail import send_mail
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models import QuerySet
+
+from tasks.deletion import exclude_deleted_sections
+from tasks.models import Task
+from tasks.models import TaskEvent
+from tasks.models import TaskReminder
+from tasks.models import TaskReminderKind
+from tasks.models import TaskStatus
+
+
+logger = logging.getLogger(__name__)
+
+# The upcoming reminder is sent this long before the deadline, the overdue reminder at the deadline.
+REMINDER_LEAD = dt.timedelta(hours=24)
+# The schedule holds the reminders due within the horizon, the later deadlines are loaded as the time moves.
+SCHEDULE_HORIZON = dt.timedelta(hours=1)
+# The overdue reminders missed while the worker was stopped are sent if the deadline passed within the window.
+CATCH_UP = dt.timedelta(days=1)
+# The failed reminder (the mail server is down) is retried after the delay.
+RETRY_DELAY = dt.timedelta(minutes=5)
+BATCH_SIZE = 1000
+# The same condition as the partial index `task_open_deadline_idx`, so the deadlines are read by its range scans.
+OPEN_DEADLINE = Q(deadline__isnull=False) & ~Q(status=TaskStatus.DONE)
+
+
+class ScheduledReminder(NamedTuple):
+    due_at: dt.datetime
+    task_id: int
+    kind: str
+    deadline: dt.datetime
+
+
+def get_open_deadlines() -> QuerySet[Task]:
+    # The tasks of the deleted sections wait for the purge, their executors are not reminded.
+    return exclude_deleted_sections(Task.objects.filter(OPEN_DEADLINE))
+
+
+def send_reminder(task: Task, kind: str) -> bool:
+    """
+    Sends the reminder of the task deadline to the executor (the creator of the unassigned task), unless it was sent.
+    The reminder is recorded in the transaction of the sending, so the concurrent worker waits on the unique
+    constraint and skips it, and the reminder which failed to send is not recorded and is retried.
+    """
+    user = task.executor or task.creator
+    try:
+        with transaction.atomic():
+            TaskReminder.objects.create(task=task, kind=kind, deadline=task.deadline, recipient=user.email)
+            if not user.email:
+                return False
+            if kind == TaskReminderKind.OVERDUE:
+                subject = f'The task "{task.title}" is overdue'
+            else:
+                subject = f'The deadline of the task "{task.title}" is close'
+            send_mail(
+                subject=subject,
+                message=f'The deadline of the task "{task.title}" is {task.deadline:%Y-%m-%d %H:%M %Z}.',
+                from_email=None,
+                recipient_list=[user.email],
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+class ReminderSchedule:
+    """
+    The in-memory time-ordered schedule of the deadline reminders, never a scan of the whole task table:
+
+    - the deadlines are loaded by the range scans of the partial index over the tasks which are not done,
+      the window `(loaded_until, now + lead + horizon]` moves with the time;
+    - the changed tasks (the deadline, the status) are picked from the activity log after the last seen event;
+    - the stale reminders (the task is done, deleted or its deadline changed) are dropped when they are due.
+    """
+
+    def __init__(self, lead: dt.timedelta = REMINDER_LEAD, horizon: dt.timedelta = SCHEDULE_HORIZON, catch_up: dt.timedelta = CATCH_UP):  # noqa E501
+        self.lead = lead
+        self.horizon = horizon
+        self.catch_up = catch_up
+        self.heap: list[ScheduledReminder] = list()
+        self.scheduled: set[tuple[int, str, dt.datetime]] = set()
+        self.loaded_until: dt.datetime | None = None
+        self.last_event_id = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def start(self, now: dt.datetime):
+        # The changes before the start are already in the task table.
+        self.last_event_id = TaskEvent.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        self.loaded_until = now - self.catch_up
+        self.refresh(now)
+
+    def refresh(self, now: dt.datetime):
+        if self.loaded_until is None:
+            raise RuntimeError('The schedule is not started.')
+        self.load_changed_tasks(now)
+        until = now + self.lead + self.horizon
+        self.add_tasks(get_open_deadlines().filter(deadline__gt=self.loaded_until, deadline__lte=until), now)
+        self.loaded_until = until
+
+    def load_changed_tasks(self, now: dt.datetime):
+        """Schedules the tasks changed after the last seen event, if their deadline is in the loaded window."""
+        while True:
+            events = TaskEvent.objects.filter(pk__gt=self.last_event_id).order_by('pk')
+            events = list(events.values_list('pk', 'task_id', 'changes')[:BATCH_SIZE])
+            if not events:
+                return
+            self.last_event_id = events[-1][0]
+            task_ids = {task_id for _, task_id, changes in events if 'deadline' in changes or 'status' in changes}
+            if task_ids:
+                tasks = get_open_deadlines().filter(
+                    pk__in=task_ids, deadline__gt=now - self.catch_up, deadline__lte=self.loaded_until,
+                )
+                self.add_tasks(tasks, now)
+
+    def add_tasks(self, queryset: QuerySet[Task], now: dt.datetime):
+        for task_id, deadline in queryset.order_by('deadline', 'pk').values_list('pk', 'deadline').iterator(BATCH_SIZE):
+            # The upcoming reminder of the passed deadline is replaced by the overdue one.
+            if deadline > now:
+                self.add(ScheduledReminder(deadline - self.lead, task_id, TaskReminderKind.UPCOMING, deadline))
+            self.add(ScheduledReminder(deadline, task_id, TaskReminderKind.OVERDUE, deadline))
+
+    def add(self, reminder: ScheduledReminder):
+        key = (reminder.task_id, reminder.kind, reminder.deadline)
+        if key not in self.scheduled:
+            self.scheduled.add(key)
+            heapq.heappush(self.heap, reminder)
+
+    def get_next_due_at(self) -> dt.datetime | None:
+        return self.heap[0].due_at if self.heap else None
+
+    def pop_due(self, now: dt.datetime) -> list[ScheduledReminder]:
+        due = list()
+        while self.heap and self.heap[0].due_at <= now and len(due) < BATCH_SIZE:
+            reminder = heapq.heappop(self.heap)
+            self.scheduled.discard((reminder.task_id, reminder.kind, reminder.deadline))
+            due.append(reminder)
+        return due
+
+    def send_due(self, now: dt.datetime) -> int:
+        """Sends the due reminders of the tasks which are still open with the same deadline, returns the amount sent."""
+        sent = 0
+        while due := self.pop_due(now):
+            task_ids = {reminder.task_id for reminder in due}
+            tasks = get_open_deadlines().select_related('executor', 'creator').in_bulk(task_ids)
+            # The reminders sent before the restart of the worker, the constraint is the last line of defence.
+            sent_before = set(TaskReminder.objects.filter(task__in=task_ids).values_list('task_id', 'kind', 'deadline'))
+            for reminder in due:
+                task = tasks.get(reminder.task_id)
+                if task is None or task.deadline != reminder.deadline:
+                    continue
+                if (reminder.task_id, reminder.kind, reminder.deadline) in sent_before:
+                    continue
+                try:
+                    sent += send_reminder(task, reminder.kind)
+                except Exception:
+                    logger.exception('The %s reminder of the task %s is not sent.', reminder.kind, task.pk)
+                    self.add(reminder._replace(due_at=now + RETRY_DELAY))
+        return sent
@@ -0,0 +1,154 @@
+import base64
+import binascii
+import json
+import re
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db import router
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import QuerySet
+from django.utils.module_loading import import_string
+
+from app_config.pagination import InvalidCursor
+from app_config.pagination import KeysetPage
+from projects.models import ProjectAccess
+from sections.models import Section
+from tasks.models import Task
+
+
+# The FTS5 table of the SQLite backend and the GIN index of the PostgreSQL backend are created by the migration
+# `tasks.0004_task_search`, the SQLite index is kept up to date by the triggers on the task table.
+SQLITE_SEARCH_TABLE = 'tasks_task_search'
+POSTGRESQL_SEARCH_VECTOR = "to_tsvector('simple'::regconfig, {table}.title || ' ' || {table}.description)"
+# The words of the search query, the longer queries are truncated.
+MAX_QUERY_TERMS = 16
+PER_PAGE = 50
+# The weights of the `title` and `description` columns in the rank.
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def parse_terms(text: str) -> list[str]:
+    return re.findall(r'\w+', text.lower())[:MAX_QUERY_TERMS]
+
+
+class TaskSearchBackend(ABC):
+    """
+    Ranked full-text search over the `Task.title` and `Task.description` by the index of the database.
+    The backend returns `(task_id, score)` ordered by the score descending and the id, the higher score is better.
+    """
+
+    def __init__(self, connection: BaseDatabaseWrapper):
+        self.connection = connection
+
+    @abstractmethod
+    def get_hits_sql(self, terms: list[str]) -> tuple[str, list[Any]]:
+        """The SQL of the `id`, `score` and `section_id` of all matched tasks."""
+
+    def search(self, terms: list[str], user: Any, after: tuple[float, int] | None, limit: int) -> list[tuple[int, float]]:  # noqa E501
+        hits_sql, params = self.get_hits_sql(terms)
+        sql = f'SELECT hits.id, hits.score FROM ({hits_sql}) hits'
+        section_table = self.connection.ops.quote_name(Section._meta.db_table)
+        # The tasks of the deleted sections stay in the index until the purge, the sections are read by the partial index.
+        conditions = [f'hits.section_id NOT IN (SELECT id FROM {section_table} WHERE deleted_at IS NOT NULL)']
+        if not user.is_superuser:
+            # The access is checked by the subquery of the access table, not by the list of ids of all user projects.
+            access_table = self.connection.ops.quote_name(ProjectAccess._meta.db_table)
+            conditions.append(
+                f'hits.section_id IN (SELECT id FROM {section_table} WHERE project_id IN '
+                f'(SELECT project_id FROM {access_table} WHERE user_id = %s))'
+            )
+            params.append(user.pk)
+        if after is not None:
+            conditions.append('(hits.score < %s OR (hits.score = %s AND hits.id > %s))')
+            params.extend((after[0], after[0], after[1]))
+        sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY hits.score DESC, hits.id ASC LIMIT %s'
+        params.append(limit)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(task_id, score) for task_id, score in cursor.fetchall()]
+
+
+class SqliteTaskSearchBackend(TaskSearchBackend):
+    """The FTS5 external content table over the task table, ranked by BM25."""
+
+    def get_hits_sql(self, terms: list[str]) -> tuple[str, list[Any]]:
+        # Every term is quoted, so the user input is never parsed as the FTS5 query syntax, the last term is a prefix.
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        table = self.connection.ops.quote_name(SQLITE_SEARCH_TABLE)
+        task_table = self.connection.ops.quote_name(Task._meta.db_table)
+        sql = (
+            f'SELECT {table}.rowid AS id, -bm25({table}, %s, %s) AS score, {task_table}.section_id AS section_id '
+            f'FROM {table} JOIN {task_table} ON {task_table}.id = {table}.rowid WHERE {table} MATCH %s'
+        )
+        return sql, [TITLE_WEIGHT, DESCRIPTION_WEIGHT, match]
+
+
+class PostgresqlTaskSearchBackend(TaskSearchBackend):
+    """The GIN index of the `tsvector` expression over the task table, ranked by `ts_rank`."""
+
+    def get_hits_sql(self, terms: list[str]) -> tuple[str, list[Any]]:
+        task_table = self.connection.ops.quote_name(Task._meta.db_table)
+        vector = POSTGRESQL_SEARCH_VECTOR.format(table=task_table)
+        query = ' & '.join(terms) + ':*'
+        sql = (
+            f'SELECT {task_table}.id AS id, ts_rank({vector}, to_tsquery(\'simple\', %s)) AS score, '
+            f'{task_table}.section_id AS section_id FROM {task_table} WHERE {vector} @@ to_tsquery(\'simple\', %s)'
+        )
+        return sql, [query, query]
+
+
+BACKENDS = {
+    'sqlite': SqliteTaskSearchBackend,
+    'postgresql': PostgresqlTaskSearchBackend,
+}
+
+
+def get_search_backend() -> TaskSearchBackend:
+    """The backend of the `TASK_SEARCH_BACKEND` setting or the backend of the database vendor, never a table scan."""
+    connection = connections[router.db_for_read(Task)]
+    backend_path = getattr(settings, 'TASK_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)(connection)
+    if connection.vendor not in BACKENDS:
+        raise ImproperlyConfigured(f'No task search backend for the "{connection.vendor}" database.')
+    return BACKENDS[connection.vendor](connection)
+
+
+def encode_cursor(task_id: int, score: float) -> str:
+    payload = json.dumps([score, task_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        score, task_id = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        return float(score), int(task_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError) as error:
+        raise InvalidCursor('The cursor is malformed.') from error
+
+
+def search_tasks(user: Any, text: str, queryset: QuerySet[Task], cursor: str | None = None, per_page: int = PER_PAGE) -> KeysetPage:  # noqa E501
+    """
+    Searches the tasks of projects where the user is an owner or a member (all tasks for superuser),
+    the page of the `queryset` objects is ordered by the rank, the next page is selected by the `(score, id)` cursor.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    terms = parse_terms(text)
+    if not terms:
+        return KeysetPage(object_list=[], next_cursor=None, is_first=not cursor)
+    hits = get_search_backend().search(terms=terms, user=user, after=after, limit=per_page + 1)
+    next_cursor = None
+    if len(hits) > per_page:
+        hits = hits[:per_page]
+        next_cursor = encode_cursor(*hits[-1])
+    tasks = queryset.in_bulk([task_id for task_id, _ in hits])
+    object_list = [tasks[task_id] for task_id, _ in hits if task_id in tasks]
+    return KeysetPage(object_list=object_list, next_cursor=next_cursor, is_first=not cursor)
@@ -0,0 +1,65 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from app_config.fragments import bump_fragment_versions
+from sections.models import Section
+from tasks.activity import get_task_values
+from tasks.activity import load_task_values
+from tasks.activity import record_task_change
+from tasks.activity import task_events_recorded
+from tasks.counters import CountedState
+from tasks.counters import count_task_change
+from tasks.counters import is_task_overdue
+from tasks.live import publish_task_events
+from tasks.models import Task
+from tasks.models import TaskEvent
+
+
+# The attribute of the task where the tracked values before the save are kept for the `post_save`.
+VALUES_BEFORE_SAVE_ATTRIBUTE = '_values_before_save'
+# The attribute of the task where the counted state before the save is kept for the `post_save`.
+COUNTED_BEFORE_SAVE_ATTRIBUTE = '_counted_before_save'
+
+
+@receiver(signal=pre_save, sender=Task)
+def remember_values(sender: type[Task], instance: Task, raw: bool, update_fields: frozenset[str] | None, **kwargs):
+    # One query for the counters and the activity log.
+    before = None
+    counted = None
+    if not raw and not instance._state.adding and instance.pk is not None:
+        before = load_task_values(instance.pk, 'is_overdue')
+    if before is not None:
+        counted = CountedState(before['section'], before['status'], before['priority'], before.pop('is_overdue'))
+    if not raw and (update_fields is None or 'is_overdue' in update_fields):
+        instance.is_overdue = is_task_overdue(instance.status, instance.deadline)
+    elif counted is not None:
+        # The overdue state which is not saved stays counted as it is stored.
+        instance.is_overdue = counted.is_overdue
+    setattr(instance, VALUES_BEFORE_SAVE_ATTRIBUTE, before)
+    setattr(instance, COUNTED_BEFORE_SAVE_ATTRIBUTE, counted)
+
+
+@receiver(signal=post_save, sender=Task)
+def count_saved_task(sender: type[Task], instance: Task, raw: bool, **kwargs):
+    if raw:
+        return
+    values = getattr(instance, VALUES_BEFORE_SAVE_ATTRIBUTE, None)
+    before = getattr(instance, COUNTED_BEFORE_SAVE_ATTRIBUTE, None)
+    count_task_change(before=before, after=CountedState.from_task(instance))
+    # The task is listed in the fragments of its section, the moved task in the fragments of the previous one too.
+    bump_fragment_versions(Section, (instance.section_id, before.section_id if before is not None else None))
+    record_task_change(task=instance, before=values, after=get_task_values(instance))
+
+
+@receiver(signal=post_delete, sender=Task)
+def count_deleted_task(sender: type[Task], instance: Task, **kwargs):
+    count_task_change(before=CountedState.from_task(instance), after=None)
+    bump_fragment_versions(Section, (instance.section_id,))
+    record_task_change(task=instance, before=get_task_values(instance), after=None)
+
+
+@receiver(signal=task_events_recorded, sender=TaskEvent)
+def publish_recorded_events(sender: type[TaskEvent], events: list[TaskEvent], **kwargs):
+    publish_task_events(events)
@@ -1,16 +1,31 @@
+from django.conf import settings
 from django.urls import path
 
+from tasks.views import AsyncTaskDetailView
+from tasks.views import AsyncTaskListView
+from tasks.views import TaskBoardColumnView
+from tasks.views import TaskBoardView
 from tasks.views import TaskCreateView
 from tasks.views import TaskDeleteView
 from tasks.views import TaskDetailView
+from tasks.views import TaskEventStreamView
 from tasks.views import TaskListView
 from tasks.views import TaskUpdateView
 
 
+# The async read views are enabled for the ASGI server by the `ASYNC_READ_VIEWS` setting.
+if settings.ASYNC_READ_VIEWS:
+    list_view, detail_view = AsyncTaskListView, AsyncTaskDetailView
+else:
+    list_view, detail_view = TaskListView, TaskDetailView
+
 urlpatterns = [
-    path(route='', view=TaskListView.as_view(), name='task_list'),
+    path(route='', view=list_view.as_view(), name='task_list'),
     path(route='create/', view=TaskCreateView.as_view(), name='task_create'),
-    path(route='<int:task_pk>/', view=TaskDetailView.as_view(), name='task_detail'),
+    path(route='board/', view=TaskBoardView.as_view(), name='task_board'),
+    path(route='board/<str:status>/', view=TaskBoardColumnView.as_view(), name='task_board_column'),
+    path(route='events/', view=TaskEventStreamView.as_view(), name='task_events'),
+    path(route='<int:task_pk>/', view=detail_view.as_view(), name='task_detail'),
     path(route='<int:task_pk>/update/', view=TaskUpdateView.as_view(), name='task_update'),
     path(route='<int:task_pk>/delete/', view=TaskDeleteView.as_view(), name='task_delete'),
 ]
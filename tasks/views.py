@@ -1,27 +1,63 @@
+from collections.abc import AsyncIterator
 from typing import Any
 from typing import cast
 
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.handlers.asgi import ASGIRequest
 from django.db.models import Q
 from django.db.models import QuerySet
 from django.forms import BaseModelForm
+from django.http import Http404
 from django.http import HttpRequest
 from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.urls import reverse_lazy
+from django.utils.safestring import mark_safe
 from django.views import View
 from django.views.generic import CreateView
 from django.views.generic import DeleteView
 from django.views.generic import DetailView
 from django.views.generic import ListView
+from django.views.generic import TemplateView
 from django.views.generic import UpdateView
 
+from app_config.broker import SubscriptionClosed
+from app_config.broker import get_broker
+from app_config.fragments import aget_fragment
+from app_config.fragments import aget_fragment_version
+from app_config.fragments import get_fragment
+from app_config.fragments import get_fragment_timeout
+from app_config.fragments import get_fragment_version
+from app_config.pagination import InvalidCursor
+from app_config.pagination import KeysetPage
+from app_config.pagination import KeysetPaginationMixin
+from app_config.pagination import build_cursor_query
 from authentication.models import User
+from projects.access import get_accessible_project_ids
+from projects.access import get_project_members
+from projects.models import ProjectAccess
+from projects.views import AsyncReadViewMixin
 from projects.views import ProjectViewMixin
+from sections.access import aget_scoped_section
+from sections.access import get_scoped_section
 from sections.models import Section
-from sections.views import SectionDetailView
 from sections.views import SectionViewMixin
+from tasks.board import DASHBOARD_ORDERING
+from tasks.board import get_board_pages
+from tasks.board import get_column_paginator
+from tasks.deletion import get_deleted_sections
 from tasks.forms import TaskCreateForm
+from tasks.forms import TaskFilterForm
+from tasks.forms import TaskSearchForm
+from tasks.live import format_event
+from tasks.live import get_event_message
+from tasks.live import get_section_channel
 from tasks.models import Task
+from tasks.models import TaskEvent
+from tasks.models import TaskStatus
+from tasks.search import search_tasks
 
 
 class TaskViewMixin(LoginRequiredMixin, View):
@@ -31,38 +67,130 @@ class TaskViewMixin(LoginRequiredMixin, View):
     def get_queryset(self) -> QuerySet[Task]:
         queryset = self.model.objects.all()
         queryset = queryset.select_related('executor', 'creator', 'section', 'section__project', 'section__project__owner')
-        queryset = queryset.distinct()
         user = self.request.user
         project_pk = self.kwargs[ProjectViewMixin.pk_url_kwarg]
         section_pk = self.kwargs[SectionViewMixin.pk_url_kwarg]
 
         if isinstance(self, (TaskListView, TaskDetailView)):
-            filters = Q(section__project__owner=user) | Q(section__project__members=user)
+            get_project_ids = get_accessible_project_ids
         else:
             raise Exception()
 
-        if user.is_superuser:
-            return queryset.filter(section__project__pk=project_pk, section__pk=section_pk)
+        if user.is_superuser or project_pk in get_project_ids(user):
+            # The tasks of the deleted section stay in the table until the `purge_deleted` worker removes them.
+            return queryset.filter(
+                section__project__pk=project_pk, section__pk=section_pk, section__deleted_at__isnull=True,
+            )
         else:
-            return queryset.filter(filters, section__project__pk=project_pk, section__pk=section_pk)
+            return queryset.none()
 
 
-class TaskListView(TaskViewMixin, ListView):
-    """User can get all tasks of section only if he is a member or owner of the section.project or superuser."""
+class TaskListView(TaskViewMixin, KeysetPaginationMixin, ListView):
+    """User can get all tasks of section only if he is a member or owner of the section.project or superuser.
+    The tasks are filtered by the `TaskFilterForm` and paginated by the cursor (keyset) pagination."""
     context_object_name = 'tasks'
     template_name = 'tasks/list.html'
+    tasks_template_name = 'tasks/list_tasks.html'
+    read_from_replica = True
+    default_ordering = 'priority'
 
     def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        section = SectionDetailView(request=request, kwargs=kwargs).get_object()
-        self.section = cast(Section, section)
+        # The anonymous user is redirected to the login page by the `LoginRequiredMixin`.
+        if request.user.is_authenticated:
+            self.section = get_scoped_section(
+                user=request.user,
+                project_pk=kwargs[ProjectViewMixin.pk_url_kwarg],
+                section_pk=kwargs[SectionViewMixin.pk_url_kwarg],
+            )
         return super().dispatch(request, *args, **kwargs)
 
+    def get_filter_form(self) -> TaskFilterForm:
+        if not hasattr(self, 'filter_form'):
+            accesses = ProjectAccess.objects.filter(project=self.section.project_id)
+            executors = User.objects.filter(pk__in=accesses.values('user_id'))
+            self.filter_form = TaskFilterForm(data=self.request.GET or None, executors=executors)
+        return self.filter_form
+
+    def get_queryset(self) -> QuerySet[Task]:
+        # The section is already loaded by the dispatch, the list shows only the titles and the keyset needs the ordering fields.
+        queryset = super().get_queryset().select_related(None)
+        queryset = queryset.only('id', 'title', 'section', 'priority', 'deadline', 'status', 'executor')
+        if self.has_invalid_filters():
+            # The invalid filters are shown with the errors of the form, not ignored for the unfiltered list.
+            return queryset.none()
+        return queryset.filter(**self.get_filter_form().get_filters())
+
+    def has_invalid_filters(self) -> bool:
+        filter_form = self.get_filter_form()
+        return filter_form.is_bound and not filter_form.is_valid()
+
+    def render_to_response(self, context: dict[str, Any], **response_kwargs) -> HttpResponse:
+        response_kwargs.setdefault('status', 400 if self.has_invalid_filters() else 200)
+        return super().render_to_response(context, **response_kwargs)
+
+    def get_keyset_ordering(self) -> str:
+        return self.get_filter_form().get_ordering(default=self.default_ordering)
+
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context['page_title'] = f'Tasks of section: {self.section.name}'
         context['section'] = self.section
+        context['filter_form'] = self.get_filter_form()
+        context['tasks_fragment'] = self.get_tasks_fragment(context)
         return context
 
+    def get_tasks_fragment(self, context: dict[str, Any]) -> str:
+        # The page is loaded only when the cached fragment of the list is missing or stale.
+        version = get_fragment_version(Section, self.section.pk)
+        return get_fragment(
+            name='task_list',
+            vary_on=[self.section.pk, version, self.request.GET.urlencode()],
+            timeout=get_fragment_timeout(version),
+            render=lambda: render_to_string(self.tasks_template_name, context),
+        )
+
+
+class AsyncTaskListView(AsyncReadViewMixin, TaskListView):
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        response = await super().get(request, *args, **kwargs)
+        if response.status_code == 200 and self.has_invalid_filters():
+            response.status_code = 400
+        return response
+
+    async def arender_tasks(self) -> str:
+        paginator, cursor = self.get_keyset_paginator(self.object_list, self.paginate_by)
+        page = await paginator.aget_page(cursor)
+        context = {
+            'section': self.section,
+            'tasks': page,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'first_page_query': self.get_cursor_query(None),
+            'next_page_query': self.get_cursor_query(page.next_cursor) if page.has_next() else None,
+        }
+        return render_to_string(self.tasks_template_name, context)
+
+    async def aget_context_data(self) -> dict[str, Any]:
+        self.section = await aget_scoped_section(
+            user=self.request.user,
+            project_pk=self.kwargs[ProjectViewMixin.pk_url_kwarg],
+            section_pk=self.kwargs[SectionViewMixin.pk_url_kwarg],
+        )
+        await self.get_filter_form().aload_executor_choices()
+        self.object_list = self.get_queryset()
+        version = await aget_fragment_version(Section, self.section.pk)
+        self.tasks_fragment = await aget_fragment(
+            name='task_list',
+            vary_on=[self.section.pk, version, self.request.GET.urlencode()],
+            timeout=get_fragment_timeout(version),
+            render=self.arender_tasks,
+        )
+        return self.get_context_data()
+
+    def get_tasks_fragment(self, context: dict[str, Any]) -> str:
+        # The fragment is already loaded by the `aget_context_data`, the lazy page of the context is never loaded.
+        return self.tasks_fragment
+
 
 class TaskCreateView(TaskViewMixin, CreateView):
     """User can create new task for section only if he is a member or owner of the section.project or superuser."""
@@ -70,10 +198,22 @@ class TaskCreateView(TaskViewMixin, CreateView):
     template_name = 'tasks/create.html'
 
     def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        section = SectionDetailView(request=request, kwargs=kwargs).get_object()
-        self.section = cast(Section, section)
+        # The anonymous user is redirected to the login page by the `LoginRequiredMixin`.
+        if request.user.is_authenticated:
+            self.section = get_scoped_section(
+                user=request.user,
+                project_pk=kwargs[ProjectViewMixin.pk_url_kwarg],
+                section_pk=kwargs[SectionViewMixin.pk_url_kwarg],
+            )
         return super().dispatch(request, *args, **kwargs)
 
+    def get_form_kwargs(self) -> dict[str, Any]:
+        kwargs = super().get_form_kwargs()
+        project_pk = self.section.project_id
+        kwargs['members'] = get_project_members(project_pk)
+        kwargs['members_url'] = reverse('project_member_search', kwargs={ProjectViewMixin.pk_url_kwarg: project_pk})
+        return kwargs
+
     def form_valid(self, form: BaseModelForm) -> HttpResponse:
         task = cast(Task, form.instance)
         user = cast(User, self.request.user)
@@ -99,6 +239,7 @@ class TaskCreateView(TaskViewMixin, CreateView):
 class TaskDetailView(TaskViewMixin, DetailView):
     context_object_name = 'task'
     template_name = 'tasks/detail.html'
+    read_from_replica = True
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         user = self.request.user
@@ -112,9 +253,273 @@ class TaskDetailView(TaskViewMixin, DetailView):
         return context
 
 
+class AsyncTaskDetailView(AsyncReadViewMixin, TaskDetailView):
+    async def aget_context_data(self) -> dict[str, Any]:
+        # The executor, the creator, the section and the project are loaded by the `select_related`.
+        self.object = await self.aget_object()
+        return self.get_context_data(object=self.object)
+
+
 class TaskUpdateView(TaskViewMixin, UpdateView):
     pass
 
 
 class TaskDeleteView(TaskViewMixin, DeleteView):
     pass
+
+
+class TaskBoardViewMixin(LoginRequiredMixin, View):
+    read_from_replica = True
+    column_template_name = 'tasks/board_column.html'
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        # The anonymous user is redirected to the login page by the `LoginRequiredMixin`.
+        if request.user.is_authenticated:
+            self.section = get_scoped_section(
+                user=request.user,
+                project_pk=kwargs[ProjectViewMixin.pk_url_kwarg],
+                section_pk=kwargs[SectionViewMixin.pk_url_kwarg],
+            )
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_board_queryset(self) -> QuerySet[Task]:
+        # The cards show the title, the priority and the deadline, the keyset needs the ordering fields.
+        return Task.objects.only('id', 'title', 'section', 'priority', 'deadline', 'status')
+
+    def get_board_filters(self) -> Q:
+        return Q(section=self.section.pk)
+
+    def render_column(self, status: str, page: KeysetPage) -> str:
+        return render_to_string(self.column_template_name, {'section': self.section, 'status': status, 'page': page})
+
+
+class TaskBoardView(TaskBoardViewMixin, TemplateView):
+    """User can see the tasks of section grouped by the status only if he is a member or owner of the section.project
+    or superuser. The first page of every column is loaded by one query, the next pages by the `TaskBoardColumnView`."""
+    template_name = 'tasks/board.html'
+    board_template_name = 'tasks/board_columns.html'
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context['page_title'] = f'Board of section: {self.section.name}'
+        context['section'] = self.section
+        context['board_fragment'] = self.get_board_fragment()
+        return context
+
+    def get_columns(self) -> list[dict[str, Any]]:
+        pages = get_board_pages(self.get_board_queryset(), self.get_board_filters())
+        return [
+            {'label': label, 'fragment': mark_safe(self.render_column(status, pages[status]))}
+            for status, label in TaskStatus.choices
+        ]
+
+    def get_board_fragment(self) -> str:
+        # The tasks are loaded only when the cached fragment of the board is missing or stale.
+        version = get_fragment_version(Section, self.section.pk)
+        return get_fragment(
+            name='task_board',
+            vary_on=[self.section.pk, version],
+            timeout=get_fragment_timeout(version),
+            render=lambda: render_to_string(self.board_template_name, {'columns': self.get_columns()}),
+        )
+
+
+class TaskBoardColumnView(TaskBoardViewMixin):
+    """The next page of the board column, the HTML fragment which is appended to the column by the board page."""
+    http_method_names = ['get']
+    status_url_kwarg = 'status'
+    cursor_kwarg = 'cursor'
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        status = self.kwargs[self.status_url_kwarg]
+        if status not in TaskStatus.values:
+            raise Http404(f'No {TaskStatus.__name__} matches the given query.')
+        cursor = request.GET.get(self.cursor_kwarg) or None
+        paginator = get_column_paginator(self.get_board_queryset().filter(self.get_board_filters()), status)
+        try:
+            if cursor:
+                paginator.decode_cursor(cursor)
+        except InvalidCursor as error:
+            raise Http404(str(error)) from error
+        version = get_fragment_version(Section, self.section.pk)
+        fragment = get_fragment(
+            name='task_board_column',
+            vary_on=[self.section.pk, version, status, cursor],
+            timeout=get_fragment_timeout(version),
+            render=lambda: self.render_column(status, paginator.get_page(cursor)),
+        )
+        return HttpResponse(fragment)
+
+
+class MyTasksViewMixin(LoginRequiredMixin, View):
+    read_from_replica = True
+    column_template_name = 'tasks/dashboard_column.html'
+
+    def get_dashboard_queryset(self) -> QuerySet[Task]:
+        # The cards link the task by its section and project, the keyset needs the ordering fields.
+        return Task.objects.select_related('section').only(
+            'id', 'title', 'priority', 'deadline', 'status', 'section__id', 'section__name', 'section__project_id',
+        )
+
+    def get_dashboard_filters(self) -> Q:
+        user = self.request.user
+        filters = Q(executor=user.pk)
+        if not user.is_superuser:
+            # The access is checked by the sections of the accessible projects, not by the join of every task.
+            sections = Section.objects.filter(project__in=get_accessible_project_ids(user))
+            filters &= Q(section__in=sections.values('pk'))
+        else:
+            filters &= ~Q(section__in=get_deleted_sections())
+        return filters
+
+    def render_column(self, status: str, page: KeysetPage) -> str:
+        return render_to_string(self.column_template_name, {'status': status, 'page': page})
+
+
+class MyTasksView(MyTasksViewMixin, TemplateView):
+    """User can see the tasks where he is the executor in all projects where he is a member or owner, grouped by
+    the status. The first page of every column is loaded by one query, the next pages by the `MyTasksColumnView`."""
+    template_name = 'tasks/dashboard.html'
+    board_template_name = 'tasks/board_columns.html'
+    extra_context = {'page_title': 'My tasks'}
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        pages = get_board_pages(self.get_dashboard_queryset(), self.get_dashboard_filters(), orderings=DASHBOARD_ORDERING)  # noqa E501
+        columns = [
+            {'label': label, 'fragment': mark_safe(self.render_column(status, pages[status]))}
+            for status, label in TaskStatus.choices
+        ]
+        context['board_fragment'] = mark_safe(render_to_string(self.board_template_name, {'columns': columns}))
+        return context
+
+
+class MyTasksColumnView(MyTasksViewMixin):
+    """The next page of the dashboard column, the HTML fragment which is appended to the column by the dashboard."""
+    http_method_names = ['get']
+    status_url_kwarg = 'status'
+    cursor_kwarg = 'cursor'
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        status = self.kwargs[self.status_url_kwarg]
+        if status not in TaskStatus.values:
+            raise Http404(f'No {TaskStatus.__name__} matches the given query.')
+        cursor = request.GET.get(self.cursor_kwarg) or None
+        queryset = self.get_dashboard_queryset().filter(self.get_dashboard_filters())
+        paginator = get_column_paginator(queryset, status, orderings=DASHBOARD_ORDERING)
+        try:
+            page = paginator.get_page(cursor)
+        except InvalidCursor as error:
+            raise Http404(str(error)) from error
+        return HttpResponse(self.render_column(status, page))
+
+
+class TaskSearchView(LoginRequiredMixin, TemplateView):
+    """Full-text search over the tasks of projects where user is a member or owner (all tasks for superuser).
+    The results are ranked by the search index of the database and paginated by the cursor."""
+    template_name = 'tasks/search.html'
+    read_from_replica = True
+    cursor_kwarg = 'cursor'
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        form = TaskSearchForm(data=self.request.GET or None)
+        cursor = self.request.GET.get(self.cursor_kwarg) or None
+        page = None
+        if form.is_valid() and form.cleaned_data['q']:
+            queryset = Task.objects.select_related('section', 'section__project')
+            queryset = queryset.only('id', 'title', 'section__id', 'section__name', 'section__project__id')
+            try:
+                page = search_tasks(
+                    user=self.request.user, text=form.cleaned_data['q'], queryset=queryset, cursor=cursor,
+                )
+            except InvalidCursor as error:
+                raise Http404(str(error)) from error
+        context['page_title'] = 'Search tasks'
+        context['form'] = form
+        context['page'] = page
+        context['first_page_query'] = build_cursor_query(
+            query=self.request.GET, cursor_kwarg=self.cursor_kwarg, cursor=None,
+        )
+        context['next_page_query'] = None
+        if page is not None and page.has_next():
+            context['next_page_query'] = build_cursor_query(
+                query=self.request.GET, cursor_kwarg=self.cursor_kwarg, cursor=page.next_cursor,
+            )
+        return context
+
+
+class TaskEventStreamView(View):
+    """
+    Server-Sent Events of the created, updated and deleted tasks of the section for the owner or member of project
+    (any project for superuser). Under ASGI the stream stays open and the events are pushed by the broker, under WSGI
+    the response ends after the missed events and the browser reconnects after the `retry` delay, like the polling.
+    The events missed by the reconnected browser (after its `Last-Event-ID`) are replayed from the activity log.
+    """
+    http_method_names = ['get']
+    # The comment line keeps the idle connection open through the proxies.
+    keepalive_seconds = 15
+    # The reconnect delay of the browser, the polling interval under WSGI.
+    retry_milliseconds = 5000
+    # The browser which missed more events reloads the page instead of the replay.
+    replay_limit = 100
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponse(status=401)
+        section = await aget_scoped_section(
+            user=user,
+            project_pk=self.kwargs[ProjectViewMixin.pk_url_kwarg],
+            section_pk=self.kwargs[SectionViewMixin.pk_url_kwarg],
+            fields=('id', 'project__id'),
+        )
+        last_event_id = self.get_last_event_id()
+        if isinstance(request, ASGIRequest):
+            response = StreamingHttpResponse(self.stream(section.pk, last_event_id), content_type='text/event-stream')
+        else:
+            replay, _ = await self.areplay(section.pk, last_event_id)
+            response = HttpResponse(replay, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # The proxy (nginx) would buffer the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def get_last_event_id(self) -> int | None:
+        value = self.request.headers.get('Last-Event-ID', '')
+        return int(value) if value.isdigit() else None
+
+    async def areplay(self, section_id: int, last_event_id: int | None) -> tuple[str, int | None]:
+        """The events after the `last_event_id` and the id of the last replayed one."""
+        queryset = TaskEvent.objects.filter(section=section_id).order_by('pk')
+        replay = f'retry: {self.retry_milliseconds}\n\n'
+        if last_event_id is None:
+            # The first connection only sets the `Last-Event-ID` of the browser, the page shows the current tasks.
+            latest_id = await queryset.reverse().values_list('pk', flat=True).afirst()
+            return replay + f'id: {latest_id or 0}\n\n', None
+        events = [event async for event in queryset.filter(pk__gt=last_event_id)[:self.replay_limit + 1]]
+        if len(events) > self.replay_limit:
+            return replay + 'event: reset\ndata: {}\n\n', None
+        for event in events:
+            replay += format_event(get_event_message(event))
+            last_event_id = event.pk
+        return replay, last_event_id
+
+    async def stream(self, section_id: int, last_event_id: int | None) -> AsyncIterator[str]:
+        # The subscription is opened before the replay, so no event is lost in between.
+        subscription = await get_broker().subscribe(get_section_channel(section_id))
+        try:
+            replay, last_event_id = await self.areplay(section_id, last_event_id)
+            yield replay
+            while True:
+                try:
+                    message = await subscription.get(timeout=self.keepalive_seconds)
+                except SubscriptionClosed:
+                    # The lagging browser reconnects and gets the missed events by the replay.
+                    return
+                if message is None:
+                    yield ': keep-alive\n\n'
+                elif last_event_id is None or message['id'] > last_event_id:
+                    yield format_event(message)
+        finally:
+            await subscription.close()